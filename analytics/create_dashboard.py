@@ -1,49 +1,249 @@
 """
 Movie Analytics Visualization Dashboard
 Simple dashboard showcasing insights from the movie analytics data mart
+
+Chart and summary queries run concurrently on a shared connection pool,
+so generating the dashboard takes about as long as its slowest query.
+Results are cached on disk until the marts are rebuilt or new data is
+loaded; set QUERY_CACHE=off to always query the database.
 """
 
-import psycopg2
+import argparse
+import base64
+import json
+import os
+import threading
+import time
+from functools import partial
+from pathlib import Path
+
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+from plotly.offline import get_plotlyjs, get_plotlyjs_version
 from plotly.subplots import make_subplots
+from plotly.utils import PlotlyJSONEncoder
+from psycopg2.pool import ThreadedConnectionPool
 
+from analytics.query_cache import QueryCache, warehouse_version
+from analytics.streaming import fetch_arrow
 from ingestion.config import DB_CONFIG
+from ingestion.engine import run_concurrently
+from ingestion import metrics as run_metrics
+
+# Upper bound on open connections, and on queries running at once
+POOL_SIZE = 6
+
+# Schema holding the marts the dashboard reads
+MARTS_SCHEMA = "staging_marts"
+
+CACHE_ENABLED = os.environ.get("QUERY_CACHE", "on").lower() != "off"
+
+_pool = None
+_pool_lock = threading.Lock()
+
+_cache = None
+_cache_lock = threading.Lock()
+
+# (query name, seconds, rows) of every query run through execute_query
+QUERY_TIMINGS = []
+
+DEFAULT_OUTPUT = "movie_analytics_dashboard.html"
+
+# Ways of loading plotly.js: from the CDN, inlined into the page, or from
+# a plotly.min.js written next to the page
+PLOTLYJS_MODES = ("cdn", "inline", "directory")
+
+# Numeric arrays at least this long are embedded as base64 typed arrays
+BINARY_MIN_LENGTH = 256
+
+# Floats with at most this many decimals are shorter as JSON text than as
+# 8-byte binary values, so they are left as text
+SHORT_DECIMALS = 4
+
+# Little-endian dtypes plotly.js decodes from base64. JavaScript has no
+# 64-bit integer typed array, so int64 columns are narrowed first.
+TYPED_ARRAY_DTYPES = {
+    "<f8": "f8",
+    "<f4": "f4",
+    "<i4": "i4",
+    "<u4": "u4",
+    "<i2": "i2",
+    "<u2": "u2",
+    "|i1": "i1",
+    "|u1": "u1",
+}
+
+CHART_CONFIG = {
+    "toImageButtonOptions": {"format": "png", "filename": "chart", "scale": 1}
+}
+
+PAGE_HEAD = """<!DOCTYPE html>
+<html>
+<head>
+    <title>Movie Analytics Dashboard</title>
+    <meta charset="utf-8">
+    {plotlyjs}
+    <style>
+        body {{ font-family: Arial, sans-serif; margin: 20px; }}
+        .header {{ text-align: center; margin-bottom: 30px; }}
+        .chart-container {{ margin: 30px 0; }}
+        .metrics {{ display: flex; justify-content: space-around; margin: 20px 0; }}
+        .metric {{ text-align: center; padding: 20px;
+                  background: #f0f0f0; border-radius: 10px; }}
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>[DASHBOARD] Movie Analytics Dashboard</h1>
+        <p>Insights from IMDb Dataset - Processed through dbt Data Mart</p>
+    </div>
+
+    <div class="metrics">
+        <div class="metric">
+            <h3>11.9M+</h3>
+            <p>Movies & TV Shows</p>
+        </div>
+        <div class="metric">
+            <h3>14.7M+</h3>
+            <p>People Analyzed</p>
+        </div>
+        <div class="metric">
+            <h3>1.6M+</h3>
+            <p>Rating Records</p>
+        </div>
+        <div class="metric">
+            <h3>100%</h3>
+            <p>Data Quality Tested</p>
+        </div>
+    </div>
+
+    <script>
+        var dashboardConfig = {config};
+        var dashboardTemplates = [];
+    </script>
+"""
+
+PAGE_FOOT = """
+    <div class="header" style="margin-top: 50px;">
+        <p><strong>Data Source:</strong> IMDb Non-Commercial Datasets</p>
+        <p><strong>Processing:</strong> PostgreSQL + dbt + Python</p>
+        <p><strong>Architecture:</strong>
+           Raw → Staging → Marts dimensional model</p>
+    </div>
+</body>
+</html>
+"""
+
+CHART_BLOCK = """
+    <div class="chart-container">
+        <h2>{title}</h2>
+        <div id="chart{chart_id}" style="width:100%;height:500px;"></div>
+        <script>
+            (function () {{
+                var figure = {figure};
+                figure.layout.template = dashboardTemplates[{template_id}];
+                Plotly.newPlot(
+                    'chart{chart_id}', figure.data, figure.layout, dashboardConfig
+                );
+            }})();
+        </script>
+    </div>
+"""
 
 
-def get_db_connection():
-    """Create database connection"""
-    return psycopg2.connect(**DB_CONFIG)
+def get_connection_pool():
+    """Return the shared connection pool, creating it on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadedConnectionPool(1, POOL_SIZE, **DB_CONFIG)
+        return _pool
+
+
+def close_connection_pool():
+    """Close every pooled connection"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
+
+
+def get_query_cache():
+    """Return the result cache checked against the warehouse, or None"""
+    global _cache
+    if not CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            pool = get_connection_pool()
+            conn = pool.getconn()
+            try:
+                conn.autocommit = True
+                with conn.cursor() as cursor:
+                    version = warehouse_version(cursor, MARTS_SCHEMA)
+            finally:
+                pool.putconn(conn)
+            _cache = QueryCache()
+            _cache.validate(version)
+        return _cache
+
+
+def execute_query(query, name="query"):
+    """Execute SQL query on a pooled connection and return DataFrame"""
+    start = time.perf_counter()
+    cache = get_query_cache()
+    if cache is not None:
+        df = cache.get(query)
+        if df is not None:
+            elapsed = time.perf_counter() - start
+            QUERY_TIMINGS.append((f"{name} (cached)", elapsed, len(df)))
+            return df
+
+    pool = get_connection_pool()
+    conn = pool.getconn()
+    try:
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            df = fetch_arrow(cursor, query).to_pandas()
+    finally:
+        pool.putconn(conn)
+    QUERY_TIMINGS.append((name, time.perf_counter() - start, len(df)))
+
+    if cache is not None:
+        cache.put(query, df)
+    return df
 
 
-def execute_query(query):
-    """Execute SQL query and return DataFrame"""
-    with get_db_connection() as conn:
-        return pd.read_sql_query(query, conn)
+def print_query_timings(elapsed):
+    """Print how long each query took against the end-to-end time"""
+    print("\n[TIMING] Query timings:")
+    for name, seconds, rows in sorted(QUERY_TIMINGS, key=lambda t: -t[1]):
+        print(f"- {name}: {seconds * 1000:.1f} ms ({rows:,} rows)")
+    total = sum(seconds for _, seconds, _ in QUERY_TIMINGS)
+    print(f"- Sum of queries: {total * 1000:.1f} ms")
+    print(f"- Wall time including chart building: {elapsed * 1000:.1f} ms")
 
 
 def create_movies_by_decade_chart():
     """Create chart showing movie production and ratings by decade"""
     query = """
     SELECT
-        dt.decade::int as decade,
-        COUNT(*) as movie_count,
-        AVG(CASE WHEN fr.average_rating IS NOT NULL THEN fr.average_rating END)
-            as avg_rating,
-        COUNT(CASE WHEN fr.is_highly_rated_popular THEN 1 END) as highly_rated_count
-    FROM staging_marts.dim_titles dt
-    LEFT JOIN staging_marts.fact_ratings fr ON dt.title_id = fr.title_id
+        decade,
+        title_count as movie_count,
+        avg_rating,
+        highly_rated_count
+    FROM staging_marts.agg_decade_category_ratings
     WHERE
-        dt.content_category = 'Movie'
-        AND dt.decade IS NOT NULL
-        AND dt.decade >= 1920
-        AND dt.decade <= 2020
-    GROUP BY dt.decade::int
-    ORDER BY dt.decade::int;
+        content_category = 'Movie'
+        AND decade >= 1920
+        AND decade <= 2020
+    ORDER BY decade;
     """
 
-    df = execute_query(query)
+    df = execute_query(query, "movies_by_decade")
     if df.empty:
         raise ValueError(
             "No rows returned. Verify content_category/decade filters and joins."
@@ -94,32 +294,20 @@ def create_movies_by_decade_chart():
 def create_genre_popularity_chart():
     """Create chart showing most popular genres"""
     query = """
-    WITH genre_stats AS (
-        SELECT
-            TRIM(unnest(string_to_array(genres_raw, ','))) as genre,
-            COUNT(*) as title_count,
-            AVG(fr.average_rating) as avg_rating,
-            SUM(fr.num_votes) as total_votes
-        FROM staging_marts.dim_titles dt
-        JOIN staging_marts.fact_ratings fr ON dt.title_id = fr.title_id
-        WHERE
-            dt.genres_raw IS NOT NULL
-            AND fr.num_votes IS NOT NULL
-            AND dt.content_category = 'Movie'
-        GROUP BY TRIM(unnest(string_to_array(genres_raw, ',')))
-    )
     SELECT
         genre,
-        title_count,
+        rated_title_count as title_count,
         ROUND(avg_rating, 2) as avg_rating,
         total_votes
-    FROM genre_stats
-    WHERE title_count >= 1000
+    FROM staging_marts.agg_genre_ratings
+    WHERE
+        content_category = 'Movie'
+        AND rated_title_count >= 1000
     ORDER BY total_votes DESC
     LIMIT 15;
     """
 
-    df = execute_query(query)
+    df = execute_query(query, "genre_popularity")
 
     fig = px.bar(
         df,
@@ -158,7 +346,7 @@ def create_quality_vs_popularity_chart():
     LIMIT 2000;  -- Limit for performance
     """
 
-    df = execute_query(query)
+    df = execute_query(query, "quality_vs_popularity")
     if df.empty:
         raise ValueError(
             "No rows returned. Verify content_category/decade filters and joins."
@@ -187,29 +375,18 @@ def create_runtime_evolution_chart():
     """Create chart showing how movie runtimes have evolved"""
     query = """
     SELECT
-        dt.decade::int as decade,
-        CASE
-            WHEN runtime_minutes <= 90 THEN 'Short (90 min or less)'
-            WHEN runtime_minutes <= 180 THEN 'Medium (91-180 min)'
-            ELSE 'Long (over 180 min)'
-        END as runtime_group,
-        COUNT(*) as movie_count
-    FROM staging_marts.dim_titles dt
+        decade,
+        runtime_group,
+        title_count as movie_count
+    FROM staging_marts.agg_decade_runtime
     WHERE
-        dt.content_category = 'Movie'
-        AND dt.decade IS NOT NULL
-        AND runtime_minutes IS NOT NULL
-        AND dt.decade >= 1960  -- Start from 1960 for better data
-        AND dt.decade <= 2020
-    GROUP BY dt.decade::int, CASE
-            WHEN runtime_minutes <= 90 THEN 'Short (90 min or less)'
-            WHEN runtime_minutes <= 180 THEN 'Medium (91-180 min)'
-            ELSE 'Long (over 180 min)'
-        END
-    ORDER BY dt.decade::int;
+        content_category = 'Movie'
+        AND decade >= 1960  -- Start from 1960 for better data
+        AND decade <= 2020
+    ORDER BY decade;
     """
 
-    df = execute_query(query)
+    df = execute_query(query, "runtime_evolution")
 
     fig = px.bar(
         df,
@@ -228,30 +405,16 @@ def create_people_generation_chart():
     query = """
     SELECT
         generation,
-        CASE
-            WHEN is_actor THEN 'Actor'
-            WHEN is_director THEN 'Director'
-            WHEN is_writer THEN 'Writer'
-            WHEN is_producer THEN 'Producer'
-            ELSE 'Other'
-        END as primary_role,
-        COUNT(*) as person_count
-    FROM staging_marts.dim_people
+        primary_role,
+        person_count
+    FROM staging_marts.agg_generation_roles
     WHERE
         generation != 'Unknown Generation'
-        AND (is_actor OR is_director OR is_writer OR is_producer)
-    GROUP BY generation,
-        CASE
-            WHEN is_actor THEN 'Actor'
-            WHEN is_director THEN 'Director'
-            WHEN is_writer THEN 'Writer'
-            WHEN is_producer THEN 'Producer'
-            ELSE 'Other'
-        END
+        AND primary_role != 'Other'
     ORDER BY generation, person_count DESC;
     """
 
-    df = execute_query(query)
+    df = execute_query(query, "people_by_generation")
 
     fig = px.bar(
         df,
@@ -266,188 +429,221 @@ def create_people_generation_chart():
     return fig
 
 
-def create_dashboard():
-    """Create complete dashboard with all visualizations"""
-    print("[DASHBOARD] Creating Movie Analytics Dashboard...")
-    print("===============================================")
+# Dashboard sections in page order, with the function building each chart
+CHARTS = {
+    "Movies by Decade": create_movies_by_decade_chart,
+    "Genre Popularity": create_genre_popularity_chart,
+    "Quality vs Popularity": create_quality_vs_popularity_chart,
+    "Runtime Evolution": create_runtime_evolution_chart,
+    "People by Generation": create_people_generation_chart,
+}
 
-    # Create all charts
-    charts = {}
 
+def capture(func):
+    """Run func and return (result, None), or (None, error) if it fails"""
     try:
-        charts["Movies by Decade"] = create_movies_by_decade_chart()
-        print("[SUCCESS] Created: Movies by Decade")
+        return func(), None
     except Exception as e:
-        print("[ERROR] Error creating Movies by Decade chart: " + str(e))
+        return None, e
+
+
+def encode_arrays(value):
+    """Replace large numeric arrays with base64 typed arrays for plotly.js"""
+    if isinstance(value, dict):
+        return {key: encode_arrays(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [encode_arrays(item) for item in value]
+    if (
+        not isinstance(value, np.ndarray)
+        or value.ndim > 2
+        or value.size < BINARY_MIN_LENGTH
+        or value.dtype.kind not in "iuf"
+    ):
+        return value
+    if value.dtype.kind == "f" and np.array_equal(
+        np.round(value, SHORT_DECIMALS), value, equal_nan=True
+    ):
+        return value
+
+    array = value
+    if array.dtype.itemsize == 8 and array.dtype.kind in "iu":
+        info = np.iinfo(np.int32)
+        fits = array.min() >= info.min and array.max() <= info.max
+        array = array.astype(np.int32 if fits else np.float64)
+    array = np.ascontiguousarray(array, dtype=array.dtype.newbyteorder("<"))
+    dtype = TYPED_ARRAY_DTYPES.get(array.dtype.str)
+    if dtype is None:
+        return value
+    spec = {"dtype": dtype, "bdata": base64.b64encode(array.tobytes()).decode()}
+    if array.ndim == 2:
+        spec["shape"] = ",".join(str(n) for n in array.shape)
+    return spec
+
+
+def to_script_json(value):
+    """Serialize value once as compact JSON that is safe inside <script>"""
+    text = json.dumps(
+        value,
+        default=PlotlyJSONEncoder().default,
+        separators=(",", ":"),
+    )
+    return text.replace("</", "<\\/")
+
+
+def plotlyjs_tag(mode, output):
+    """Return the tag loading plotly.js, writing a local bundle if needed"""
+    if mode == "cdn":
+        url = f"https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"
+        return f'<script src="{url}" charset="utf-8"></script>'
+    if mode == "inline":
+        return f"<script>{get_plotlyjs()}</script>"
+
+    bundle = Path(output).with_name("plotly.min.js")
+    source = get_plotlyjs()
+    if not bundle.exists() or bundle.stat().st_size != len(source.encode()):
+        bundle.write_text(source, encoding="utf-8")
+    return f'<script src="{bundle.name}" charset="utf-8"></script>'
+
+
+def write_dashboard(charts, output=DEFAULT_OUTPUT, plotlyjs="cdn"):
+    """Stream the dashboard page to output, serializing each figure once"""
+    templates = {}
+    with open(output, "w", encoding="utf-8") as f:
+        f.write(
+            PAGE_HEAD.format(
+                plotlyjs=plotlyjs_tag(plotlyjs, output),
+                config=to_script_json(CHART_CONFIG),
+            )
+        )
 
-    try:
-        charts["Genre Popularity"] = create_genre_popularity_chart()
-        print("[SUCCESS] Created: Genre Popularity")
-    except Exception as e:
-        print(f"[ERROR] Error creating Genre Popularity chart: {e}")
+        for chart_id, (title, fig) in enumerate(charts.items(), start=1):
+            figure = fig.to_plotly_json()
+            layout = dict(figure.get("layout", {}))
+
+            # Charts share the same template; write each distinct one once
+            template = to_script_json(layout.pop("template", {}))
+            if template not in templates:
+                templates[template] = len(templates)
+                f.write(f"    <script>dashboardTemplates.push({template});</script>\n")
+
+            f.write(
+                CHART_BLOCK.format(
+                    title=title,
+                    chart_id=chart_id,
+                    template_id=templates[template],
+                    figure=to_script_json(
+                        {
+                            "data": encode_arrays(figure["data"]),
+                            "layout": encode_arrays(layout),
+                        }
+                    ),
+                )
+            )
+
+        f.write(PAGE_FOOT)
+
+
+def create_dashboard(output=DEFAULT_OUTPUT, plotlyjs="cdn"):
+    """Create complete dashboard with all visualizations"""
+    print("[DASHBOARD] Creating Movie Analytics Dashboard...")
+    print("===============================================")
 
-    try:
-        charts["Quality vs Popularity"] = create_quality_vs_popularity_chart()
-        print("[SUCCESS] Created: Quality vs Popularity")
-    except Exception as e:
-        print(f"[ERROR] Error creating Quality vs Popularity chart: {e}")
+    # Build all charts and fetch the summary counts at the same time
+    tasks = [partial(capture, builder) for builder in CHARTS.values()]
+    tasks.append(partial(capture, fetch_summary_counts))
+    start = time.perf_counter()
+    *results, (counts, counts_error) = run_concurrently(
+        tasks, workers=POOL_SIZE, name="dashboard"
+    )
+    elapsed = time.perf_counter() - start
 
-    try:
-        charts["Runtime Evolution"] = create_runtime_evolution_chart()
-        print("[SUCCESS] Created: Runtime Evolution")
-    except Exception as e:
-        print(f"[ERROR] Error creating Runtime Evolution chart: {e}")
+    get_summary_stats(counts, counts_error)
 
-    try:
-        charts["People by Generation"] = create_people_generation_chart()
-        print("[SUCCESS] Created: People by Generation")
-    except Exception as e:
-        print(f"[ERROR] Error creating People by Generation chart: {e}")
+    charts = {}
+    for title, (fig, error) in zip(CHARTS, results):
+        if error is None:
+            charts[title] = fig
+            print(f"[SUCCESS] Created: {title}")
+        else:
+            print(f"[ERROR] Error creating {title} chart: {error}")
+
+    print_query_timings(elapsed)
+    # Part of the pipeline's run report when PIPELINE_RUN_ID is set
+    run_metrics.record_metrics(run_metrics.query_metrics(QUERY_TIMINGS))
 
     if not charts:
         print("[ERROR] No charts were successfully created!")
         return
 
-    # Create HTML file with all charts
-    html_content = """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Movie Analytics Dashboard</title>
-        <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
-        <style>
-            body { font-family: Arial, sans-serif; margin: 20px; }
-            .header { text-align: center; margin-bottom: 30px; }
-            .chart-container { margin: 30px 0; }
-            .metrics { display: flex; justify-content: space-around; margin: 20px 0; }
-            .metric { text-align: center; padding: 20px;
-                      background: #f0f0f0; border-radius: 10px; }
-        </style>
-    </head>
-    <body>
-        <div class="header">
-            <h1>[DASHBOARD] Movie Analytics Dashboard</h1>
-            <p>Insights from IMDb Dataset - Processed through dbt Data Mart</p>
-        </div>
-
-        <div class="metrics">
-            <div class="metric">
-                <h3>11.9M+</h3>
-                <p>Movies & TV Shows</p>
-            </div>
-            <div class="metric">
-                <h3>14.7M+</h3>
-                <p>People Analyzed</p>
-            </div>
-            <div class="metric">
-                <h3>1.6M+</h3>
-                <p>Rating Records</p>
-            </div>
-            <div class="metric">
-                <h3>100%</h3>
-                <p>Data Quality Tested</p>
-            </div>
-        </div>
-    """
-
-    # Add each chart to HTML
-    chart_id = 0
-    for title, fig in charts.items():
-        chart_id += 1
-
-        # Force Plotly to use JSON arrays instead of binary data
-        # by configuring the figure to use the HTML renderer
-        config = {
-            "toImageButtonOptions": {"format": "png", "filename": "chart", "scale": 1}
-        }
-
-        # Use to_html method with proper configuration to force JSON format
-        # Configure Plotly to use JSON arrays instead of binary data
-        import json
-
-        # Convert figure to JSON to force JSON format, then create HTML
-        fig_json = fig.to_json()
-        fig_dict = json.loads(fig_json)
-
-        # Create a div with the chart data embedded as JSON
-        chart_html = f"""
-        <div id="chart{chart_id}" style="width:100%;height:500px;"></div>
-        <script>
-            Plotly.newPlot('chart{chart_id}',
-                {json.dumps(fig_dict["data"])},
-                {json.dumps(fig_dict["layout"])},
-                {json.dumps(config)});
-        </script>
-        """
-
-        html_content += f"""
-        <div class="chart-container">
-            <h2>{title}</h2>
-            {chart_html}
-        </div>
-        """
-
-    html_content += """
-        <div class="header" style="margin-top: 50px;">
-            <p><strong>Data Source:</strong> IMDb Non-Commercial Datasets</p>
-            <p><strong>Processing:</strong> PostgreSQL + dbt + Python</p>
-            <p><strong>Architecture:</strong>
-               Raw → Staging → Marts dimensional model</p>
-        </div>
-    </body>
-    </html>
-    """
-
-    # Save dashboard
-    with open("movie_analytics_dashboard.html", "w", encoding="utf-8") as f:
-        f.write(html_content)
+    start = time.perf_counter()
+    write_dashboard(charts, output, plotlyjs)
+    elapsed = time.perf_counter() - start
+    run_metrics.record_metrics(
+        [run_metrics.metric("render", "dashboard", output, elapsed)]
+    )
 
     print("\n[COMPLETE] Dashboard created successfully!")
-    print("[FILE] Saved as: movie_analytics_dashboard.html")
+    print(f"[FILE] Saved as: {output} (rendered in {elapsed * 1000:.1f} ms)")
     print("[WEB] Open the file in your browser to view the interactive dashboard")
 
 
-def get_summary_stats():
+def fetch_summary_counts():
+    """Fetch all headline counts in a single query"""
+    # All headline counts come precomputed in one row of the rollup mart
+    result = execute_query(
+        "SELECT * FROM staging_marts.agg_summary_counts", "summary_counts"
+    )
+    return result.iloc[0].to_dict()
+
+
+def get_summary_stats(counts=None, error=None):
     """Print summary statistics about the data mart"""
-    queries = {
-        "Total Movies": (
-            "SELECT COUNT(*) FROM staging_marts.dim_titles "
-            "WHERE content_category = 'Movie'"
-        ),
-        "Total TV Series": (
-            "SELECT COUNT(*) FROM staging_marts.dim_titles "
-            "WHERE content_category = 'TV Series'"
-        ),
-        "Total People": "SELECT COUNT(*) FROM staging_marts.dim_people",
-        "Ratings with 1000+ votes": (
-            "SELECT COUNT(*) FROM staging_marts.fact_ratings "
-            "WHERE is_statistically_significant = true"
-        ),
-        "Highly Rated & Popular": (
-            "SELECT COUNT(*) FROM staging_marts.fact_ratings "
-            "WHERE is_highly_rated_popular = true"
-        ),
+    metrics = {
+        "Total Movies": "total_movies",
+        "Total TV Series": "total_tv_series",
+        "Total People": "total_people",
+        "Ratings with 1000+ votes": "significant_rating_count",
+        "Highly Rated & Popular": "highly_rated_count",
     }
 
     print("\n[DATA] Data Mart Summary:")
     print("==========================")
 
-    for metric, query in queries.items():
-        try:
-            result = execute_query(query)
-            count = result.iloc[0, 0]
-            print(f"- {metric}: {count:,}")
-        except Exception as e:
-            print(f"- {metric}: Error - {e}")
+    if counts is None and error is None:
+        counts, error = capture(fetch_summary_counts)
+    if error is not None:
+        print(f"- Summary counts: Error - {error}")
+        return
+
+    for metric, column in metrics.items():
+        print(f"- {metric}: {counts[column]:,}")
+
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Generate the analytics dashboard")
+    parser.add_argument(
+        "--output",
+        default=DEFAULT_OUTPUT,
+        help=f"HTML file to write (default: {DEFAULT_OUTPUT})",
+    )
+    parser.add_argument(
+        "--plotlyjs",
+        choices=PLOTLYJS_MODES,
+        default="cdn",
+        help=(
+            "Load plotly.js from the CDN (default), inline it into the page, "
+            "or write plotly.min.js next to the page (for offline use)"
+        ),
+    )
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
+    args = parse_args()
     try:
-        # Print summary stats first
-        get_summary_stats()
-
-        # Create dashboard
-        create_dashboard()
+        # Summary stats are fetched and printed along with the charts
+        create_dashboard(args.output, args.plotlyjs)
 
     except Exception as e:
         print(f"[ERROR] Error creating dashboard: {e}")
@@ -455,3 +651,6 @@ if __name__ == "__main__":
         print("1. docker compose up -d")
         print("2. ./run_pipeline.sh (or run_pipeline.bat)")
         print("3. python analytics/create_dashboard.py")
+
+    finally:
+        close_connection_pool()
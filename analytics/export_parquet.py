@@ -0,0 +1,402 @@
+"""
+Parquet Export of the Star Schema
+
+Streams the mart tables out of PostgreSQL with COPY ... TO STDOUT and
+writes them as Parquet datasets for offline analysis, one directory per
+table. bridge_cast_crew is partitioned by decade. Data passes through in
+Arrow record batches, so memory use stays bounded for any table size.
+A table whose contents are unchanged since its last export is skipped.
+"""
+
+import argparse
+import json
+import logging
+import shutil
+import sys
+import time
+from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+from psycopg2 import sql
+
+from analytics.streaming import describe_query, stream_query
+from ingestion.engine import (
+    positive_int,
+    run_concurrently,
+    table_identifier,
+    with_connection,
+)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler(sys.stdout)],
+)
+logger = logging.getLogger(__name__)
+
+MARTS_SCHEMA = "staging_marts"
+
+# Exported marts and the column each is partitioned by, if any
+EXPORT_TABLES: Dict[str, Optional[str]] = {
+    "dim_titles": None,
+    "dim_people": None,
+    "fact_ratings": None,
+    "bridge_cast_crew": "decade",
+}
+
+EXPORT_DIR = Path("data_lake/marts")
+
+# Records the fingerprint of each exported table, in EXPORT_DIR
+MANIFEST_FILE = "_export_manifest.json"
+
+DEFAULT_WORKERS = 2
+
+# Row group size of the Parquet files
+ROWS_PER_GROUP = 1024 * 1024
+
+# Identity and write counters of a table and any partitions under it
+TABLE_VERSION_SQL = """
+    SELECT
+        %s::regclass::oid::bigint,
+        COALESCE(SUM(s.n_tup_ins + s.n_tup_upd + s.n_tup_del), 0)::bigint
+    FROM pg_partition_tree(%s::regclass) p
+    LEFT JOIN pg_stat_user_tables s ON s.relid = p.relid
+"""
+
+
+def table_version(cursor, table_name: str) -> str:
+    """
+    Version a table from the system catalogs, without scanning it.
+
+    Like analytics/query_cache.py, this combines the relation OID with
+    the write counters of pg_stat_user_tables, summed over partitions.
+    An unchanged version proves the table was not written since it was
+    recorded. A changed one proves nothing about its contents: dbt
+    rebuilds every table-materialized mart with a new OID on each run.
+
+    Args:
+        cursor: Database cursor
+        table_name: Schema-qualified table name
+
+    Returns:
+        str: "<oid>:<rows written>"
+    """
+    cursor.execute(TABLE_VERSION_SQL, (table_name, table_name))
+    oid, rows_written = cursor.fetchone()
+    return f"{oid}:{rows_written}"
+
+
+def table_fingerprint(cursor, table_name: str) -> str:
+    """
+    Fingerprint a table's contents in one scan on the server.
+
+    The row count plus an order-independent sum of per-row hashes
+    changes with any inserted, deleted or modified row, without sorting
+    or sending the table, and is the same for a byte-identical rebuild.
+
+    Args:
+        cursor: Database cursor
+        table_name: Schema-qualified table name
+
+    Returns:
+        str: "<row count>:<hash sum>"
+    """
+    cursor.execute(
+        sql.SQL(
+            "SELECT COUNT(*), COALESCE(SUM(hashtextextended(t::text, 0)), 0) "
+            "FROM {table} t"
+        ).format(table=table_identifier(table_name))
+    )
+    row_count, hash_sum = cursor.fetchone()
+    return f"{row_count}:{hash_sum}"
+
+
+def integer_partitions(
+    batches: Iterator[pa.RecordBatch], column: str
+) -> Iterator[pa.RecordBatch]:
+    """
+    Store a whole-number partition column as int32.
+
+    Columns such as decade come out of PostgreSQL as numeric/float, which
+    would otherwise give directories like ``decade=1990.0``.
+    """
+    for batch in batches:
+        index = batch.schema.get_field_index(column)
+        values = pc.cast(batch.column(index), pa.int32())
+        yield batch.set_column(index, pa.field(column, pa.int32()), values)
+
+
+def write_parquet(
+    cursor, table_name: str, target: Path, partition_column: Optional[str]
+) -> int:
+    """
+    Stream a table into a Parquet dataset directory.
+
+    The dataset is written next to ``target`` and swapped in only once it
+    is complete, so readers never see a half-written export.
+
+    Args:
+        cursor: Database cursor
+        table_name: Schema-qualified table name
+        target: Dataset directory to create or replace
+        partition_column: Column to partition by (hive-style), or None
+
+    Returns:
+        int: Number of rows written
+    """
+    query = (
+        sql.SQL("SELECT * FROM {table}")
+        .format(table=table_identifier(table_name))
+        .as_string(cursor)
+    )
+    schema = describe_query(cursor, query)
+    batches = stream_query(cursor, query)
+
+    partitioning = None
+    if partition_column is not None:
+        batches = integer_partitions(batches, partition_column)
+        index = schema.get_field_index(partition_column)
+        schema = schema.set(index, pa.field(partition_column, pa.int32()))
+        partitioning = ds.partitioning(
+            pa.schema([schema.field(partition_column)]), flavor="hive"
+        )
+
+    row_count = 0
+
+    def counted(source):
+        nonlocal row_count
+        for batch in source:
+            row_count += batch.num_rows
+            yield batch
+
+    staging = target.with_name(f".{target.name}.tmp")
+    shutil.rmtree(staging, ignore_errors=True)
+    ds.write_dataset(
+        pa.RecordBatchReader.from_batches(schema, counted(batches)),
+        staging,
+        format="parquet",
+        partitioning=partitioning,
+        basename_template="part-{i}.parquet",
+        max_rows_per_group=ROWS_PER_GROUP,
+        min_rows_per_group=min(ROWS_PER_GROUP, 64 * 1024),
+    )
+
+    previous = target.with_name(f".{target.name}.old")
+    shutil.rmtree(previous, ignore_errors=True)
+    if target.exists():
+        target.rename(previous)
+    staging.rename(target)
+    shutil.rmtree(previous, ignore_errors=True)
+    return row_count
+
+
+def export_table(
+    cursor,
+    name: str,
+    output_dir: Path,
+    last_export: Dict[str, Any],
+    force: bool = False,
+) -> Dict[str, Any]:
+    """
+    Export one mart table unless it is unchanged since its last export.
+
+    A table whose catalog version matches the last export was not
+    written since, and is skipped without reading it. Otherwise, e.g.
+    after dbt rebuilt it, its contents are fingerprinted with one scan
+    and the export is skipped if they are identical.
+
+    Args:
+        cursor: Database cursor
+        name: Mart table name within MARTS_SCHEMA
+        output_dir: Directory holding one dataset per table
+        last_export: Manifest entry of the previous export, or {}
+        force: Export even if the table is unchanged
+
+    Returns:
+        dict: success, skipped, row_count, version, fingerprint and
+            duration
+    """
+    table_name = f"{MARTS_SCHEMA}.{name}"
+    target = output_dir / name
+    start = time.perf_counter()
+    result = {
+        "success": False,
+        "skipped": False,
+        "row_count": 0,
+        "version": last_export.get("version"),
+        "fingerprint": last_export.get("fingerprint"),
+        "duration": 0.0,
+    }
+
+    try:
+        version = table_version(cursor, table_name)
+        unchanged = not force and target.exists()
+        if unchanged and version == last_export.get("version"):
+            logger.info("Skipping %s: not written since last export", table_name)
+            fingerprint = last_export["fingerprint"]
+        else:
+            fingerprint = table_fingerprint(cursor, table_name)
+            unchanged = unchanged and fingerprint == last_export.get("fingerprint")
+            if unchanged:
+                logger.info("Skipping %s: contents unchanged", table_name)
+
+        if unchanged:
+            row_count = last_export["row_count"]
+        else:
+            row_count = write_parquet(cursor, table_name, target, EXPORT_TABLES[name])
+            logger.info("Exported %d rows from %s to %s", row_count, table_name, target)
+        result.update(
+            success=True,
+            skipped=unchanged,
+            row_count=row_count,
+            version=version,
+            fingerprint=fingerprint,
+        )
+    except Exception as e:
+        logger.error("Failed to export %s: %s", table_name, e)
+
+    result["duration"] = time.perf_counter() - start
+    return result
+
+
+def read_manifest(output_dir: Path) -> Dict[str, Dict[str, Any]]:
+    """
+    Read the export manifest, or an empty one if none exists.
+
+    Args:
+        output_dir: Export directory
+
+    Returns:
+        dict: Manifest entry per table name
+    """
+    path = output_dir / MANIFEST_FILE
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def export_all_tables(
+    tables, output_dir: Path = EXPORT_DIR, workers: int = DEFAULT_WORKERS, force=False
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Export mart tables concurrently, one connection per table.
+
+    Args:
+        tables: Names of the tables to export (keys of EXPORT_TABLES)
+        output_dir: Directory holding one dataset per table
+        workers: Number of tables exported at once
+        force: Export tables even if they are unchanged
+
+    Returns:
+        dict: Result of export_table per table name
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = read_manifest(output_dir)
+
+    tasks = [
+        partial(
+            with_connection,
+            export_table,
+            name,
+            output_dir,
+            manifest.get(name, {}),
+            force,
+        )
+        for name in tables
+    ]
+    results = dict(zip(tables, run_concurrently(tasks, workers, name="export")))
+
+    exported_at = datetime.now(timezone.utc).isoformat()
+    for name, result in results.items():
+        if not result["success"]:
+            continue
+        entry = manifest.setdefault(name, {})
+        # A skipped table keeps its export time but records the current
+        # version, so the next run can skip it without a scan
+        if not result["skipped"]:
+            entry["exported_at"] = exported_at
+        entry.update(
+            version=result["version"],
+            fingerprint=result["fingerprint"],
+            row_count=result["row_count"],
+        )
+    (output_dir / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2) + "\n")
+    return results
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    Parse command-line options for the export.
+
+    Args:
+        argv: Argument list (defaults to sys.argv[1:])
+
+    Returns:
+        argparse.Namespace: Parsed options
+    """
+    parser = argparse.ArgumentParser(
+        description="Export the mart tables to Parquet for offline analysis"
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=EXPORT_DIR,
+        help=f"directory to write one dataset per table to (default: {EXPORT_DIR})",
+    )
+    parser.add_argument(
+        "--tables",
+        nargs="+",
+        choices=list(EXPORT_TABLES),
+        default=list(EXPORT_TABLES),
+        help="tables to export (default: all)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=positive_int,
+        default=DEFAULT_WORKERS,
+        help=f"number of tables to export in parallel (default: {DEFAULT_WORKERS})",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="export every table even if it is unchanged since its last export",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Main execution function."""
+    args = parse_args(argv)
+    logger.info("Exporting marts to %s...", args.output)
+
+    start = time.perf_counter()
+    results = export_all_tables(args.tables, args.output, args.workers, args.force)
+    elapsed = time.perf_counter() - start
+
+    logger.info("\n=== EXPORT SUMMARY ===")
+    for name, result in results.items():
+        if result["skipped"]:
+            status = "SKIPPED"
+        else:
+            status = "SUCCESS" if result["success"] else "FAILED"
+        logger.info(
+            "%-20s %-8s %12d rows %9.1fs",
+            name,
+            status,
+            result["row_count"],
+            result["duration"],
+        )
+    logger.info("Wall time: %.1fs", elapsed)
+
+    if not all(result["success"] for result in results.values()):
+        logger.warning("Some tables failed to export. Check logs above.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
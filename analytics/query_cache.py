@@ -0,0 +1,176 @@
+"""
+On-disk cache of analytics query results.
+
+Results are stored as one Parquet file per query, keyed by a hash of the
+normalized SQL. The whole cache is tied to a warehouse version computed
+from the system catalogs: dbt recreates mart tables on every build and
+the loader records each load in raw._load_manifest, so any build or load
+changes the version and empties the cache. Entries are evicted least
+recently used first once the cache grows past its size limit.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = Path(os.environ.get("QUERY_CACHE_DIR", ".query_cache"))
+
+# Default size limit of the cache directory
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# File in the cache directory holding the warehouse version of its entries
+VERSION_FILE = "warehouse_version"
+
+# Identity and write counters of every table in a schema. The OID changes
+# whenever dbt rebuilds a table, the counters whenever rows are written
+# in place (incremental models).
+TABLE_VERSIONS_SQL = """
+    SELECT
+        c.relname,
+        c.oid::bigint,
+        COALESCE(s.n_tup_ins + s.n_tup_upd + s.n_tup_del, 0)
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+    WHERE n.nspname = %s AND c.relkind IN ('r', 'p')
+    ORDER BY c.relname
+"""
+
+MANIFEST_VERSION_SQL = """
+    SELECT COUNT(*), MAX(loaded_at)::text FROM raw._load_manifest
+"""
+
+
+def normalize_sql(query: str) -> str:
+    """
+    Normalize SQL text so formatting differences map to the same key.
+
+    Args:
+        query: SQL statement
+
+    Returns:
+        str: Statement with runs of whitespace collapsed and no trailing
+            semicolon
+    """
+    return re.sub(r"\s+", " ", query).strip().rstrip(";").rstrip()
+
+
+def warehouse_version(cursor, schema: str) -> str:
+    """
+    Compute a version string that changes whenever the warehouse does.
+
+    Args:
+        cursor: Database cursor
+        schema: Schema of the tables the cached queries read
+
+    Returns:
+        str: SHA-256 over the schema's table versions and the load manifest
+    """
+    digest = hashlib.sha256()
+    cursor.execute(TABLE_VERSIONS_SQL, (schema,))
+    for row in cursor.fetchall():
+        digest.update(repr(row).encode())
+
+    cursor.execute("SELECT to_regclass('raw._load_manifest') IS NOT NULL")
+    if cursor.fetchone()[0]:
+        cursor.execute(MANIFEST_VERSION_SQL)
+        digest.update(repr(cursor.fetchone()).encode())
+    return digest.hexdigest()
+
+
+class QueryCache:
+    """
+    Parquet-backed result cache for one warehouse version.
+
+    Call validate() with the current warehouse version before use; a
+    different version than the one the entries were written for clears
+    them. get() and put() are safe to call from several threads.
+    """
+
+    def __init__(self, directory: Path = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def validate(self, version: str) -> None:
+        """
+        Drop all entries unless they were written for ``version``.
+
+        Args:
+            version: Current warehouse version from warehouse_version()
+        """
+        version_file = self.directory / VERSION_FILE
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            if version_file.exists() and version_file.read_text() == version:
+                return
+            removed = 0
+            for entry in self.directory.glob("*.parquet"):
+                entry.unlink(missing_ok=True)
+                removed += 1
+            version_file.write_text(version)
+        if removed:
+            logger.info("Warehouse changed, dropped %d cached results", removed)
+
+    def _path(self, query: str) -> Path:
+        """Path of the entry for a query."""
+        key = hashlib.sha256(normalize_sql(query).encode()).hexdigest()
+        return self.directory / f"{key}.parquet"
+
+    def get(self, query: str) -> Optional[pd.DataFrame]:
+        """
+        Look up the cached result of a query.
+
+        Args:
+            query: SQL statement
+
+        Returns:
+            pandas.DataFrame: Cached result, or None on a miss
+        """
+        path = self._path(query)
+        try:
+            df = pd.read_parquet(path)
+        except FileNotFoundError:
+            return None
+        # The modification time orders entries for LRU eviction
+        path.touch()
+        return df
+
+    def put(self, query: str, df: pd.DataFrame) -> None:
+        """
+        Store the result of a query and evict old entries if needed.
+
+        Args:
+            query: SQL statement
+            df: Query result
+        """
+        path = self._path(query)
+        temp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        df.to_parquet(temp_path, index=False)
+        os.replace(temp_path, path)
+        self._evict()
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until under max_bytes."""
+        with self._lock:
+            entries = []
+            for entry in self.directory.glob("*.parquet"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry))
+            total = sum(size for _, size, _ in entries)
+            for _, size, entry in sorted(entries, key=lambda e: e[0]):
+                if total <= self.max_bytes:
+                    break
+                entry.unlink(missing_ok=True)
+                total -= size
@@ -0,0 +1,183 @@
+"""
+Streaming query results from PostgreSQL into Apache Arrow.
+
+A query runs as COPY (...) TO STDOUT in CSV format on a background
+thread, which writes into a pipe. pyarrow's streaming CSV reader decodes
+the other end of the pipe directly into typed Arrow column buffers, one
+record batch at a time. No Python object is created per value, and
+memory stays bounded by the batch size however large the result is.
+Column types come from the query's result description, so a batch never
+has to guess them.
+"""
+
+import logging
+import os
+import re
+import threading
+from typing import Iterator, List, Optional
+
+import pyarrow as pa
+from pyarrow import csv
+from psycopg2 import sql
+
+logger = logging.getLogger(__name__)
+
+# Bytes of CSV decoded per record batch
+BATCH_BYTES = 8 * 1024 * 1024
+
+# Write buffer of the COPY thread; COPY hands over one row per write
+PIPE_BUFFER = 1024 * 1024
+
+# Arrow types of PostgreSQL result columns, by type OID. numeric becomes
+# float64 for analytics; unlisted types are read as strings.
+ARROW_TYPES = {
+    16: pa.bool_(),  # bool
+    20: pa.int64(),  # int8
+    21: pa.int16(),  # int2
+    23: pa.int32(),  # int4
+    26: pa.int64(),  # oid
+    700: pa.float32(),  # float4
+    701: pa.float64(),  # float8
+    1700: pa.float64(),  # numeric
+    1082: pa.date32(),  # date
+    1114: pa.timestamp("us"),  # timestamp
+}
+
+
+def _strip_query(query: str) -> str:
+    """Remove a trailing semicolon, and any comments after it."""
+    return re.sub(r";\s*(--[^\n]*\s*)*$", "", query.strip())
+
+
+def describe_query(cursor, query: str) -> pa.Schema:
+    """
+    Work out the Arrow schema of a query's result without running it.
+
+    Args:
+        cursor: Database cursor
+        query: SELECT statement
+
+    Returns:
+        pyarrow.Schema: One field per result column
+    """
+    cursor.execute(
+        sql.SQL("SELECT * FROM (\n{query}\n) AS q LIMIT 0").format(
+            query=sql.SQL(_strip_query(query))
+        )
+    )
+    return pa.schema(
+        [
+            pa.field(column.name, ARROW_TYPES.get(column.type_code, pa.string()))
+            for column in cursor.description
+        ]
+    )
+
+
+class _CopyWriter(threading.Thread):
+    """Background thread running COPY TO STDOUT into a pipe."""
+
+    def __init__(self, cursor, copy_sql: sql.Composable, write_fd: int):
+        super().__init__(name="copy-out", daemon=True)
+        self._cursor = cursor
+        self._copy_sql = copy_sql
+        self._write_fd = write_fd
+        self.error: Optional[BaseException] = None
+
+    def run(self) -> None:
+        try:
+            with os.fdopen(self._write_fd, "wb", buffering=PIPE_BUFFER) as pipe:
+                self._cursor.copy_expert(self._copy_sql, pipe)
+        except BaseException as e:
+            self.error = e
+
+
+def stream_query(
+    cursor, query: str, batch_bytes: int = BATCH_BYTES
+) -> Iterator[pa.RecordBatch]:
+    """
+    Run a query and yield its result as Arrow record batches.
+
+    Stopping the iteration early cancels the query on the server.
+
+    Args:
+        cursor: Database cursor, used only by this stream until it ends
+        query: SELECT statement
+        batch_bytes: Approximate CSV bytes decoded per batch
+
+    Yields:
+        pyarrow.RecordBatch: Consecutive slices of the result
+
+    Raises:
+        psycopg2.Error: If the query fails
+    """
+    schema = describe_query(cursor, query)
+    copy_sql = sql.SQL("COPY (\n{query}\n) TO STDOUT WITH (FORMAT csv)").format(
+        query=sql.SQL(_strip_query(query))
+    )
+
+    read_fd, write_fd = os.pipe()
+    writer = _CopyWriter(cursor, copy_sql, write_fd)
+    writer.start()
+    pipe = os.fdopen(read_fd, "rb")
+    finished = False
+    try:
+        # An empty result, or a failed query, closes the pipe without data
+        if not pipe.peek(1):
+            finished = True
+            return
+        reader = csv.open_csv(
+            pipe,
+            read_options=csv.ReadOptions(
+                column_names=schema.names, block_size=batch_bytes
+            ),
+            parse_options=csv.ParseOptions(newlines_in_values=True),
+            convert_options=csv.ConvertOptions(
+                column_types=schema,
+                # COPY writes NULL unquoted and empty strings as ""
+                null_values=[""],
+                strings_can_be_null=True,
+                quoted_strings_can_be_null=False,
+                true_values=["t"],
+                false_values=["f"],
+            ),
+        )
+        for batch in reader:
+            yield batch
+        finished = True
+    finally:
+        if not finished:
+            # Stopped early or failed: cancel the COPY and drain what the
+            # server already sent, so COPY ends cleanly on the connection
+            cursor.connection.cancel()
+            while pipe.read(BATCH_BYTES):
+                pass
+        pipe.close()
+        writer.join()
+        if not finished and writer.error is not None:
+            logger.debug("COPY stopped early: %s", writer.error)
+            if not cursor.connection.autocommit:
+                cursor.connection.rollback()
+
+        if finished and writer.error is not None:
+            raise writer.error
+
+
+def fetch_arrow(cursor, query: str, batch_bytes: int = BATCH_BYTES) -> pa.Table:
+    """
+    Run a query and return its whole result as an Arrow table.
+
+    Args:
+        cursor: Database cursor
+        query: SELECT statement
+        batch_bytes: Approximate CSV bytes decoded per batch
+
+    Returns:
+        pyarrow.Table: Query result
+
+    Raises:
+        psycopg2.Error: If the query fails
+    """
+    batches: List[pa.RecordBatch] = list(stream_query(cursor, query, batch_bytes))
+    if not batches:
+        return describe_query(cursor, query).empty_table()
+    return pa.Table.from_batches(batches)
@@ -0,0 +1,484 @@
+"""
+End-to-end Pipeline Benchmark
+
+Generates a synthetic IMDb dataset (see ingestion/generate_data.py),
+then times each pipeline stage against the configured PostgreSQL
+database: the raw load, the dbt staging and marts builds, and the
+dashboard queries. Results, including per-file, per-model and per-query
+timings, are written as JSON so runs can be compared; with --compare
+the run is checked against an earlier result and the script exits
+non-zero if any timing regressed past the threshold.
+
+The benchmark truncates and reloads the raw tables and rebuilds the
+marts, so point POSTGRES_DB at a scratch database.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from analytics import create_dashboard as dashboard
+from ingestion.engine import positive_int, with_connection
+from ingestion.generate_data import (
+    DEFAULT_ROWS,
+    DEFAULT_SEED,
+    generate_dataset,
+    read_params,
+)
+from ingestion.load_raw import (
+    DEFAULT_CHUNKS,
+    DEFAULT_WORKERS,
+    DATA_LAKE_DIR,
+    create_raw_schema,
+    load_all_files,
+)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler(sys.stdout)],
+)
+logger = logging.getLogger(__name__)
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+DBT_DIR = PROJECT_DIR / "dbt" / "movie_analytics"
+
+RESULTS_DIR = Path("benchmarks/results")
+
+STAGES = ("load", "staging", "marts", "dashboard")
+
+# A timing regresses when it grows by more than this factor
+DEFAULT_THRESHOLD = 1.25
+
+# Timings shorter than this are too noisy to flag as regressions
+MIN_COMPARED_SECONDS = 0.05
+
+
+def dataset_dir(rows: int, seed: int, compress: bool) -> Path:
+    """Directory holding the synthetic dataset of one scale and seed."""
+    suffix = "-gz" if compress else ""
+    return DATA_LAKE_DIR / "landing" / "synthetic" / f"rows{rows}-seed{seed}{suffix}"
+
+
+def ensure_dataset(
+    rows: int, seed: int, compress: bool, regenerate: bool = False
+) -> Dict[str, Any]:
+    """
+    Generate the dataset unless an identical one already exists.
+
+    Args:
+        rows: Target row count over all five files
+        seed: Random seed
+        compress: Generate .tsv.gz files
+        regenerate: Generate even if the dataset exists
+
+    Returns:
+        dict: "data_dir", "generate_seconds" (None if reused) and
+            "row_counts" per file
+    """
+    data_dir = dataset_dir(rows, seed, compress)
+    recorded = read_params(data_dir)
+    if recorded is not None and not regenerate:
+        logger.info("Reusing dataset in %s", data_dir)
+        return {
+            "data_dir": data_dir,
+            "generate_seconds": None,
+            "row_counts": recorded["row_counts"],
+        }
+
+    logger.info("Generating ~%d rows into %s...", rows, data_dir)
+    start = time.perf_counter()
+    row_counts = generate_dataset(data_dir, rows, seed, compress)
+    return {
+        "data_dir": data_dir,
+        "generate_seconds": time.perf_counter() - start,
+        "row_counts": row_counts,
+    }
+
+
+def server_version(cursor) -> str:
+    """PostgreSQL server version string."""
+    cursor.execute("SHOW server_version")
+    return cursor.fetchone()[0]
+
+
+def benchmark_load(data_dir: Path, options: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Time a forced full reload of the five raw tables.
+
+    Returns:
+        dict: "seconds" and per-file "files" results with row rates
+    """
+    start = time.perf_counter()
+    results = load_all_files(
+        workers=options.workers,
+        chunks=options.chunks,
+        stream=options.stream,
+        force=True,
+        bulk=options.bulk,
+        typed=options.typed,
+        data_dir=data_dir,
+    )
+    seconds = time.perf_counter() - start
+
+    failed = [name for name, result in results.items() if not result["success"]]
+    if failed:
+        raise RuntimeError(f"Raw load failed for {', '.join(failed)}")
+
+    files = {}
+    for filename, result in results.items():
+        duration = result["duration"]
+        files[filename] = {
+            "rows": result["row_count"],
+            "seconds": duration,
+            "rows_per_second": result["row_count"] / duration if duration else None,
+        }
+    return {"seconds": seconds, "files": files}
+
+
+def run_dbt(dbt: str, args: List[str]) -> Dict[str, Any]:
+    """
+    Time one dbt invocation and collect its per-model timings.
+
+    Args:
+        dbt: dbt executable
+        args: dbt arguments, e.g. ["run", "--select", "staging"]
+
+    Returns:
+        dict: "seconds" and per-model "models" execution times
+
+    Raises:
+        RuntimeError: If dbt exits with an error
+    """
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [dbt, *args, "--profiles-dir", str(DBT_DIR)],
+        cwd=DBT_DIR,
+        capture_output=True,
+        text=True,
+    )
+    seconds = time.perf_counter() - start
+    if completed.returncode != 0:
+        logger.error("%s", completed.stdout[-4000:])
+        raise RuntimeError(f"dbt {' '.join(args)} failed")
+
+    run_results = json.loads((DBT_DIR / "target" / "run_results.json").read_text())
+    models = {
+        result["unique_id"].split(".")[-1]: result["execution_time"]
+        for result in run_results["results"]
+    }
+    return {"seconds": seconds, "models": models}
+
+
+def benchmark_dashboard() -> Dict[str, Any]:
+    """
+    Time every dashboard query, uncached, plus rendering the page.
+
+    Queries run one at a time so each timing reflects the query alone.
+
+    Returns:
+        dict: "seconds", per-query "queries" and "render_seconds"
+    """
+    dashboard.CACHE_ENABLED = False
+    dashboard.QUERY_TIMINGS.clear()
+
+    start = time.perf_counter()
+    charts = {}
+    # The chart builders print diagnostics; keep the benchmark log readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        for title, builder in dashboard.CHARTS.items():
+            charts[title] = builder()
+        dashboard.fetch_summary_counts()
+    seconds = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        render_start = time.perf_counter()
+        dashboard.write_dashboard(charts, str(Path(tmp) / "dashboard.html"))
+        render_seconds = time.perf_counter() - render_start
+    dashboard.close_connection_pool()
+
+    queries = {name: elapsed for name, elapsed, _ in dashboard.QUERY_TIMINGS}
+    return {"seconds": seconds, "queries": queries, "render_seconds": render_seconds}
+
+
+def git_commit() -> Optional[str]:
+    """Commit of the working tree, or None outside a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def flatten_timings(result: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Collect every timing of a result under a comparable metric name.
+
+    Args:
+        result: Benchmark result as written by run_benchmark
+
+    Returns:
+        dict: Seconds per metric, e.g. "stage.load" or "model.dim_titles"
+    """
+    timings = {}
+    for stage, seconds in result["stages"].items():
+        timings[f"stage.{stage}"] = seconds
+    for filename, file_result in result.get("load", {}).get("files", {}).items():
+        timings[f"load.{filename}"] = file_result["seconds"]
+    for stage in ("staging", "marts"):
+        for model, seconds in result.get(stage, {}).get("models", {}).items():
+            timings[f"model.{model}"] = seconds
+    for query, seconds in result.get("dashboard", {}).get("queries", {}).items():
+        timings[f"query.{query}"] = seconds
+    if "dashboard" in result:
+        timings["dashboard.render"] = result["dashboard"]["render_seconds"]
+    return timings
+
+
+def compare_results(
+    baseline: Dict[str, Any], current: Dict[str, Any], threshold: float
+) -> List[str]:
+    """
+    Print each timing next to the baseline and list the regressions.
+
+    Args:
+        baseline: Earlier benchmark result
+        current: This run's result
+        threshold: Slowdown factor above which a timing regressed
+
+    Returns:
+        list: Names of the metrics that regressed
+    """
+    if baseline["dataset"]["row_counts"] != current["dataset"]["row_counts"]:
+        logger.warning("Baseline used a different dataset; timings may not compare")
+
+    before = flatten_timings(baseline)
+    after = flatten_timings(current)
+    regressions = []
+
+    logger.info("\n=== COMPARISON WITH %s ===", baseline["started_at"])
+    for metric in after:
+        if metric not in before:
+            continue
+        old, new = before[metric], after[metric]
+        ratio = new / old if old else float("inf")
+        regressed = ratio > threshold and max(old, new) >= MIN_COMPARED_SECONDS
+        if regressed:
+            regressions.append(metric)
+        logger.info(
+            "%-40s %9.3fs %9.3fs %6.2fx%s",
+            metric,
+            old,
+            new,
+            ratio,
+            "  REGRESSION" if regressed else "",
+        )
+    return regressions
+
+
+def run_benchmark(options: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Run the selected stages and collect their timings.
+
+    Args:
+        options: Parsed command-line options
+
+    Returns:
+        dict: Benchmark result, ready to be written as JSON
+    """
+    result: Dict[str, Any] = {
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "options": {
+            "rows": options.rows,
+            "seed": options.seed,
+            "gzip": options.gzip,
+            "workers": options.workers,
+            "chunks": options.chunks,
+            "stream": options.stream,
+            "bulk": options.bulk,
+            "typed": options.typed,
+        },
+        "stages": {},
+    }
+
+    dataset = ensure_dataset(
+        options.rows, options.seed, options.gzip, options.regenerate
+    )
+    result["dataset"] = {
+        "data_dir": str(dataset["data_dir"]),
+        "row_counts": dataset["row_counts"],
+    }
+    if dataset["generate_seconds"] is not None:
+        result["stages"]["generate"] = dataset["generate_seconds"]
+
+    result["postgres"] = with_connection(server_version)
+
+    if "load" in options.stages:
+        with_connection(create_raw_schema, options.reset_raw)
+        logger.info("Benchmarking raw load...")
+        result["load"] = benchmark_load(dataset["data_dir"], options)
+        result["stages"]["load"] = result["load"]["seconds"]
+
+    if "staging" in options.stages:
+        logger.info("Benchmarking dbt staging models...")
+        result["staging"] = run_dbt(options.dbt, ["run", "--select", "staging"])
+        result["stages"]["staging"] = result["staging"]["seconds"]
+
+    if "marts" in options.stages:
+        logger.info("Benchmarking dbt marts models...")
+        result["marts"] = run_dbt(
+            options.dbt, ["run", "--select", "marts", "--full-refresh"]
+        )
+        result["stages"]["marts"] = result["marts"]["seconds"]
+
+    if "dashboard" in options.stages:
+        logger.info("Benchmarking dashboard queries...")
+        result["dashboard"] = benchmark_dashboard()
+        result["stages"]["dashboard"] = result["dashboard"]["seconds"]
+
+    return result
+
+
+def write_result(result: Dict[str, Any], results_dir: Path) -> Path:
+    """
+    Write a benchmark result as JSON, named by start time and scale.
+
+    Returns:
+        Path: The file written
+    """
+    results_dir.mkdir(parents=True, exist_ok=True)
+    stamp = result["started_at"][:19].replace(":", "").replace("-", "")
+    path = results_dir / f"{stamp}-rows{result['options']['rows']}.json"
+    path.write_text(json.dumps(result, indent=2) + "\n")
+    return path
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    Parse command-line options for the benchmark.
+
+    Args:
+        argv: Argument list (defaults to sys.argv[1:])
+
+    Returns:
+        argparse.Namespace: Parsed options
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark the pipeline on a synthetic IMDb dataset"
+    )
+    parser.add_argument(
+        "--rows",
+        type=positive_int,
+        default=DEFAULT_ROWS,
+        help=f"approximate total rows of the dataset (default: {DEFAULT_ROWS})",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=DEFAULT_SEED,
+        help=f"random seed of the dataset (default: {DEFAULT_SEED})",
+    )
+    parser.add_argument(
+        "--gzip",
+        action="store_true",
+        help="benchmark loading .tsv.gz files",
+    )
+    parser.add_argument(
+        "--regenerate",
+        action="store_true",
+        help="generate the dataset even if it already exists",
+    )
+    parser.add_argument(
+        "--stages",
+        nargs="+",
+        choices=STAGES,
+        default=list(STAGES),
+        help="stages to time (default: all)",
+    )
+    parser.add_argument(
+        "--reset-raw",
+        action="store_true",
+        help="drop and recreate the raw tables before loading",
+    )
+    parser.add_argument(
+        "--workers",
+        type=positive_int,
+        default=DEFAULT_WORKERS,
+        help=f"loader --workers (default: {DEFAULT_WORKERS})",
+    )
+    parser.add_argument(
+        "--chunks",
+        type=positive_int,
+        default=DEFAULT_CHUNKS,
+        help=f"loader --chunks (default: {DEFAULT_CHUNKS})",
+    )
+    parser.add_argument("--stream", action="store_true", help="loader --stream")
+    parser.add_argument("--bulk", action="store_true", help="loader --bulk")
+    parser.add_argument("--typed", action="store_true", help="loader --typed")
+    parser.add_argument(
+        "--dbt",
+        default="dbt",
+        help="dbt executable (default: dbt on PATH)",
+    )
+    parser.add_argument(
+        "--results-dir",
+        type=Path,
+        default=RESULTS_DIR,
+        help=f"directory to write the result JSON to (default: {RESULTS_DIR})",
+    )
+    parser.add_argument(
+        "--compare",
+        type=Path,
+        help="earlier result JSON to compare this run against",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=(
+            "slowdown factor versus --compare counted as a regression "
+            f"(default: {DEFAULT_THRESHOLD})"
+        ),
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Main execution function."""
+    args = parse_args(argv)
+    result = run_benchmark(args)
+    path = write_result(result, args.results_dir)
+
+    logger.info("\n=== BENCHMARK SUMMARY ===")
+    logger.info("Rows: %d", sum(result["dataset"]["row_counts"].values()))
+    for stage, seconds in result["stages"].items():
+        logger.info("%-12s %9.2fs", stage, seconds)
+    logger.info("Results written to %s", path)
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        regressions = compare_results(baseline, result, args.threshold)
+        if regressions:
+            logger.warning("%d timing(s) regressed: %s", len(regressions), regressions)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+{#
+    Post-hook adding a primary key to a model built as a table.
+
+    PostgreSQL names the constraint <table>_pkey, or <table>_pkey1 while
+    the previous build's backup table still holds that name, so the
+    hook is safe on every rebuild.
+#}
+{% macro add_primary_key(relation, columns) %}
+    alter table {{ relation }} add primary key ({{ columns | join(', ') }})
+{% endmacro %}
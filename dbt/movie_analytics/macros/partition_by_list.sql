@@ -0,0 +1,54 @@
+{#
+    Post-hook converting a freshly built table into a LIST-partitioned
+    table: one partition per value in `values`, plus a default
+    partition for anything else (including nulls). Queries filtering on
+    `column` then only scan the matching partitions.
+
+    dbt always creates tables unpartitioned, so the first build (and
+    every --full-refresh) is converted once; later incremental runs
+    find the table partitioned and insert into its partitions directly.
+    `index_columns` lists the btree indexes to create on the partitioned
+    table, each a list of columns. `unique_columns` adds a unique index
+    on those columns; Postgres requires a unique index on a partitioned
+    table to include the partition column, so `column` is appended.
+#}
+{% macro partition_by_list(relation, column, values, index_columns=[], unique_columns=[]) %}
+    {%- set unpartitioned = relation.incorporate(
+        path={"identifier": relation.identifier ~ "__unpartitioned"}) -%}
+    {%- set backup = make_backup_relation(relation, "table") -%}
+    do $$
+    begin
+        if exists (
+            select 1 from pg_partitioned_table
+            where partrelid = '{{ relation }}'::regclass
+        ) then
+            return;
+        end if;
+
+        -- A --full-refresh renames the old partitioned table to the
+        -- backup, whose partitions still hold the names used below;
+        -- dbt drops the backup right after the hooks anyway
+        drop table if exists {{ backup }} cascade;
+
+        alter table {{ relation }} rename to {{ unpartitioned.identifier }};
+        create table {{ relation }} (like {{ unpartitioned }} including defaults)
+            partition by list ({{ column }});
+        {% for value in values %}
+        create table {{ relation.incorporate(path={"identifier": relation.identifier ~ "_" ~ (value | lower | replace(" ", "_"))}) }}
+            partition of {{ relation }} for values in ('{{ value }}');
+        {% endfor %}
+        create table {{ relation.incorporate(path={"identifier": relation.identifier ~ "_default"}) }}
+            partition of {{ relation }} default;
+
+        insert into {{ relation }} select * from {{ unpartitioned }};
+        drop table {{ unpartitioned }};
+
+        {% if unique_columns %}
+        create unique index on {{ relation }} ({{ (unique_columns + [column]) | join(', ') }});
+        {% endif %}
+        {% for columns in index_columns %}
+        create index on {{ relation }} ({{ columns | join(', ') }});
+        {% endfor %}
+    end
+    $$
+{% endmacro %}
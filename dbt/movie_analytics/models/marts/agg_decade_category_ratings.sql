@@ -0,0 +1,36 @@
+{{ config(
+    materialized = 'table',
+    schema = 'marts',
+    post_hook = "{{ add_primary_key(this, ['content_category', 'decade']) }}"
+) }}
+
+-- Titles and rating statistics per decade and content category, rolled
+-- up once per build so the dashboard reads a few hundred rows instead
+-- of joining dim_titles to fact_ratings
+
+with titles as (
+    select
+        title_id,
+        content_category,
+        coalesce(decade, -1) :: integer as decade
+    from {{ ref('dim_titles') }}
+),
+
+rollup as (
+    select
+        t.content_category,
+        t.decade,
+        count(*) as title_count,
+        count(fr.average_rating) as rated_title_count,
+        avg(fr.average_rating) as avg_rating,
+        sum(fr.num_votes) as total_votes,
+        count(case when fr.is_statistically_significant then 1 end)
+            as significant_rating_count,
+        count(case when fr.is_highly_rated_popular then 1 end)
+            as highly_rated_count
+    from titles t
+    left join {{ ref('fact_ratings') }} fr on fr.title_id = t.title_id
+    group by t.content_category, t.decade
+)
+
+select * from rollup
@@ -0,0 +1,29 @@
+{{ config(
+    materialized = 'table',
+    schema = 'marts',
+    post_hook = "{{ add_primary_key(this, ['content_category', 'decade', 'runtime_group']) }}"
+) }}
+
+-- Titles with a known runtime per decade, content category and runtime
+-- group, feeding the dashboard's runtime evolution chart
+
+with titles as (
+    select
+        content_category,
+        coalesce(decade, -1) :: integer as decade,
+        case
+            when runtime_minutes <= 90 then 'Short (90 min or less)'
+            when runtime_minutes <= 180 then 'Medium (91-180 min)'
+            else 'Long (over 180 min)'
+        end as runtime_group
+    from {{ ref('dim_titles') }}
+    where runtime_minutes is not null
+)
+
+select
+    content_category,
+    decade,
+    runtime_group,
+    count(*) as title_count
+from titles
+group by content_category, decade, runtime_group
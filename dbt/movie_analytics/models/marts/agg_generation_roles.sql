@@ -0,0 +1,28 @@
+{{ config(
+    materialized = 'table',
+    schema = 'marts',
+    post_hook = "{{ add_primary_key(this, ['generation', 'primary_role']) }}"
+) }}
+
+-- People per generation and primary role. A person counts once, under
+-- the first of actor, director, writer and producer their flags match.
+
+with people as (
+    select
+        generation,
+        case
+            when is_actor then 'Actor'
+            when is_director then 'Director'
+            when is_writer then 'Writer'
+            when is_producer then 'Producer'
+            else 'Other'
+        end as primary_role
+    from {{ ref('dim_people') }}
+)
+
+select
+    generation,
+    primary_role,
+    count(*) as person_count
+from people
+group by generation, primary_role
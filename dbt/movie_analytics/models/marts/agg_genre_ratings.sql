@@ -0,0 +1,20 @@
+{{ config(
+    materialized = 'table',
+    schema = 'marts',
+    post_hook = "{{ add_primary_key(this, ['genre', 'content_category']) }}"
+) }}
+
+-- Vote volume and average rating per genre and content category, over
+-- titles that have votes
+
+select
+    g.genre,
+    dt.content_category,
+    count(*) as rated_title_count,
+    avg(fr.average_rating) as avg_rating,
+    sum(fr.num_votes) as total_votes
+from {{ ref('bridge_title_genres') }} g
+join {{ ref('dim_titles') }} dt on dt.title_id = g.title_id
+join {{ ref('fact_ratings') }} fr on fr.title_id = g.title_id
+where fr.num_votes is not null
+group by g.genre, dt.content_category
@@ -0,0 +1,35 @@
+{{ config(
+    materialized = 'table',
+    schema = 'marts'
+) }}
+
+-- Single-row headline counts for the dashboard, summed from the other
+-- rollups instead of scanning the dimensions again
+
+with titles as (
+    select
+        sum(title_count) filter (where content_category = 'Movie') as total_movies,
+        sum(title_count) filter (where content_category = 'TV Series')
+            as total_tv_series,
+        sum(title_count) as total_titles,
+        sum(rated_title_count) as total_ratings,
+        sum(significant_rating_count) as significant_rating_count,
+        sum(highly_rated_count) as highly_rated_count
+    from {{ ref('agg_decade_category_ratings') }}
+),
+
+people as (
+    select sum(person_count) as total_people
+    from {{ ref('agg_generation_roles') }}
+)
+
+select
+    coalesce(t.total_movies, 0) :: bigint as total_movies,
+    coalesce(t.total_tv_series, 0) :: bigint as total_tv_series,
+    coalesce(t.total_titles, 0) :: bigint as total_titles,
+    coalesce(t.total_ratings, 0) :: bigint as total_ratings,
+    coalesce(p.total_people, 0) :: bigint as total_people,
+    coalesce(t.significant_rating_count, 0) :: bigint as significant_rating_count,
+    coalesce(t.highly_rated_count, 0) :: bigint as highly_rated_count
+from titles t
+cross join people p
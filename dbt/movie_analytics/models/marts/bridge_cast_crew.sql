@@ -1,10 +1,104 @@
 {{ config(
-    materialized = 'table',
-    schema = 'marts'
+    materialized = 'incremental',
+    schema = 'marts',
+    unique_key = ['title_id', 'person_id', 'ordering'],
+    incremental_strategy = 'delete+insert',
+    on_schema_change = 'sync_all_columns',
+    pre_hook = "
+        {% if is_incremental() %}
+        drop table if exists bridge_cast_crew__changes;
+        -- Credits to rewrite or delete this run, found from the narrow
+        -- hash columns before anything is joined to the dims
+        create temporary table bridge_cast_crew__changes as
+        with credit_changes as (
+            select
+                coalesce(p.title_id, b.title_id) as title_id,
+                coalesce(p.person_id, b.person_id) as person_id,
+                coalesce(p.ordering, b.ordering) as ordering,
+                p.title_id is null as is_deleted
+            from {{ ref('stg_title_principals') }} p
+            full join {{ this }} b
+                on b.title_id = p.title_id
+                and b.person_id = p.person_id
+                and b.ordering = p.ordering
+            where p.principal_hash is distinct from b.principal_hash
+        ),
+
+        changed_titles as (
+            select t.title_id
+            from {{ ref('dim_titles') }} t
+            where exists (
+                select 1 from {{ this }} b
+                where b.title_id = t.title_id
+                  and b.title_hash <> t.row_hash
+            )
+        ),
+
+        changed_people as (
+            select pe.person_id
+            from {{ ref('dim_people') }} pe
+            where exists (
+                select 1 from {{ this }} b
+                where b.person_id = pe.person_id
+                  and b.person_hash <> pe.row_hash
+            )
+        )
+
+        select * from credit_changes
+        union
+        select p.title_id, p.person_id, p.ordering, false
+        from {{ ref('stg_title_principals') }} p
+        where p.title_id in (select title_id from changed_titles)
+           or p.person_id in (select person_id from changed_people);
+
+        analyze bridge_cast_crew__changes
+        {% endif %}
+    ",
+    post_hook = [
+        "
+        do $$
+        begin
+            if to_regclass('pg_temp.bridge_cast_crew__changes') is null then
+                return;
+            end if;
+            delete from {{ this }} b
+            using bridge_cast_crew__changes c
+            where c.is_deleted
+              and b.title_id = c.title_id
+              and b.person_id = c.person_id
+              and b.ordering = c.ordering;
+            drop table bridge_cast_crew__changes;
+        end
+        $$
+        ",
+        "{{ partition_by_list(
+            this,
+            'content_category',
+            ['Movie', 'TV Series', 'TV Episode', 'Short Film',
+             'TV Special', 'Video', 'Video Game', 'Other'],
+            unique_columns = ['title_id', 'person_id', 'ordering'],
+            index_columns = [['person_id']]
+        ) }}"
+    ]
 ) }}
 
+-- Incremental: the pre-hook compares principal_hash with the stored
+-- value, and the stored title_hash / person_hash with the dims'
+-- row_hash, and records the affected keys in a temporary table. Only
+-- those credits are joined and written; the first post-hook deletes the
+-- recorded keys that disappeared upstream. The second splits the table
+-- into one partition per content_category.
+-- Use --full-refresh after changing the logic below.
+
 with principals_base as (
-    select * from {{ ref('stg_title_principals') }}
+    select p.*
+    from {{ ref('stg_title_principals') }} p
+    {% if is_incremental() %}
+    join bridge_cast_crew__changes c
+        on c.title_id = p.title_id
+        and c.person_id = p.person_id
+        and c.ordering = p.ordering
+    {% endif %}
 ),
 
 title_context as (
@@ -14,7 +108,8 @@ title_context as (
         content_category,
         start_year,
         decade,
-        is_adult
+        is_adult,
+        row_hash
     from {{ ref('dim_titles') }}
 ),
 
@@ -27,7 +122,8 @@ person_context as (
         is_director,
         is_writer,
         is_producer,
-        generation
+        generation,
+        row_hash
     from {{ ref('dim_people') }}
 ),
 
@@ -99,7 +195,12 @@ bridge_enhanced as (
             when t.start_year < 1990 then 'Modern Era (1970-1989)'
             when t.start_year < 2010 then 'Digital Era (1990-2009)'
             else 'Streaming Era (2010+)'
-        end as industry_era
+        end as industry_era,
+
+        -- Change detection for incremental runs
+        p.principal_hash,
+        t.row_hash as title_hash,
+        pe.row_hash as person_hash
 
     from principals_base p
     left join title_context t on p.title_id = t.title_id
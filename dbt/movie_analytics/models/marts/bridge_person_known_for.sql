@@ -0,0 +1,37 @@
+{{ config(
+    materialized = 'table',
+    schema = 'marts',
+    indexes = [
+        {'columns': ['title_id']}
+    ],
+    post_hook = "{{ add_primary_key(this, ['person_id', 'known_for_position']) }}"
+) }}
+
+-- One row per person and title they are known for, split from the
+-- comma-separated knownForTitles once per build. Titles filtered out of
+-- dim_titles are dropped so title_id always joins.
+
+with people_base as (
+    select
+        person_id,
+        known_for_titles_raw
+    from {{ ref('stg_name_basics') }}
+    where known_for_titles_raw is not null
+),
+
+known_for as (
+    select
+        p.person_id,
+        trim(k.title_id) as title_id,
+        k.known_for_position :: integer as known_for_position
+    from people_base p
+    cross join lateral unnest(string_to_array(p.known_for_titles_raw, ','))
+        with ordinality as k(title_id, known_for_position)
+)
+
+select * from known_for kf
+where exists (
+    select 1
+    from {{ ref('stg_title_keys') }} t
+    where t.title_id = kf.title_id
+)
@@ -0,0 +1,33 @@
+{{ config(
+    materialized = 'table',
+    schema = 'marts',
+    indexes = [
+        {'columns': ['profession', 'person_id']}
+    ],
+    post_hook = "{{ add_primary_key(this, ['person_id', 'profession_position']) }}"
+) }}
+
+-- One row per person and profession, split from the comma-separated
+-- primaryProfession once per build; dim_people derives its role flags
+-- from this table
+
+with people_base as (
+    select
+        person_id,
+        professions_raw
+    from {{ ref('stg_name_basics') }}
+    where professions_raw is not null
+),
+
+person_professions as (
+    select
+        p.person_id,
+        trim(pr.profession) as profession,
+        pr.profession_position :: integer as profession_position
+    from people_base p
+    cross join lateral unnest(string_to_array(p.professions_raw, ','))
+        with ordinality as pr(profession, profession_position)
+)
+
+select * from person_professions
+where profession != ''
@@ -0,0 +1,32 @@
+{{ config(
+    materialized = 'table',
+    schema = 'marts',
+    indexes = [
+        {'columns': ['genre', 'title_id']}
+    ],
+    post_hook = "{{ add_primary_key(this, ['title_id', 'genre_position']) }}"
+) }}
+
+-- One row per title and genre, split from the comma-separated genres
+-- once per build so genre analytics can join instead of parsing strings
+
+with titles_base as (
+    select
+        title_id,
+        genres_raw
+    from {{ ref('stg_title_basics') }}
+    where genres_raw is not null
+),
+
+title_genres as (
+    select
+        t.title_id,
+        trim(g.genre) as genre,
+        g.genre_position :: integer as genre_position
+    from titles_base t
+    cross join lateral unnest(string_to_array(t.genres_raw, ','))
+        with ordinality as g(genre, genre_position)
+)
+
+select * from title_genres
+where genre != ''
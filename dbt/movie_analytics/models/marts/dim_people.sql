@@ -1,16 +1,31 @@
 {{ config(
     materialized = 'table',
-    schema = 'marts'
+    schema = 'marts',
+    post_hook = "{{ add_primary_key(this, ['person_id']) }}"
 ) }}
 
 with people_base as (
     select * from {{ ref('stg_name_basics') }}
 ),
 
+-- Role flags from the exploded professions, matched per profession
+-- with the same patterns as before instead of over the raw list
+profession_flags as (
+    select
+        person_id,
+        bool_or(profession ilike '%actor%' or profession ilike '%actress%') as is_actor,
+        bool_or(profession ilike '%director%') as is_director,
+        bool_or(profession ilike '%writer%') as is_writer,
+        bool_or(profession ilike '%producer%') as is_producer,
+        bool_or(profession ilike '%composer%') as is_composer
+    from {{ ref('bridge_person_professions') }}
+    group by person_id
+),
+
 people_enhanced as (
     select
         -- Primary key
-        person_id,
+        pb.person_id,
 
         -- Basic information
         primary_name,
@@ -65,30 +80,11 @@ people_enhanced as (
         end as primary_profession,
 
         -- Career flags
-        case
-            when professions_raw ilike '%actor%' or professions_raw ilike '%actress%'
-            then true else false
-        end as is_actor,
-
-        case
-            when professions_raw ilike '%director%'
-            then true else false
-        end as is_director,
-
-        case
-            when professions_raw ilike '%writer%'
-            then true else false
-        end as is_writer,
-
-        case
-            when professions_raw ilike '%producer%'
-            then true else false
-        end as is_producer,
-
-        case
-            when professions_raw ilike '%composer%'
-            then true else false
-        end as is_composer,
+        coalesce(pf.is_actor, false) as is_actor,
+        coalesce(pf.is_director, false) as is_director,
+        coalesce(pf.is_writer, false) as is_writer,
+        coalesce(pf.is_producer, false) as is_producer,
+        coalesce(pf.is_composer, false) as is_composer,
 
         -- Multi-role analysis
         case
@@ -138,7 +134,13 @@ people_enhanced as (
             else 'Pre-Silent Generation'
         end as generation
 
-    from people_base
+    from people_base pb
+    left join profession_flags pf on pf.person_id = pb.person_id
 )
 
-select * from people_enhanced
+-- row_hash lets bridge_cast_crew find people whose row changed since
+-- its last run
+select
+    p.*,
+    md5(p::text) as row_hash
+from people_enhanced p
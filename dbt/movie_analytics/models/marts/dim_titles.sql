@@ -1,6 +1,11 @@
 {{ config(
     materialized = 'table',
-    schema = 'marts'
+    schema = 'marts',
+    indexes = [
+        {'columns': ['content_category', 'decade']},
+        {'columns': ['start_year'], 'type': 'brin'}
+    ],
+    post_hook = "{{ add_primary_key(this, ['title_id']) }}"
 ) }}
 
 with titles_base as (
@@ -91,4 +96,11 @@ titles_enhanced as (
     from titles_base
 )
 
-select * from titles_enhanced
+-- Written in start_year order so the BRIN index on start_year can skip
+-- whole block ranges for year and decade filters. row_hash lets
+-- bridge_cast_crew find titles whose row changed since its last run.
+select
+    t.*,
+    md5(t::text) as row_hash
+from titles_enhanced t
+order by start_year
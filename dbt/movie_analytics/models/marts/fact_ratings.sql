@@ -1,6 +1,10 @@
 {{ config(
     materialized = 'table',
-    schema = 'marts'
+    schema = 'marts',
+    indexes = [
+        {'columns': ['num_votes']}
+    ],
+    post_hook = "{{ add_primary_key(this, ['title_id']) }}"
 ) }}
 
 with ratings_base as (
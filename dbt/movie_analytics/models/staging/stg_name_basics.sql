@@ -13,15 +13,10 @@ cleaned as (
         nconst as person_id,
         -- Basic person information
         primaryname as primary_name,
-        -- Years - convert \N to null and cast to integer
-        case
-            when birthyear = '\\N' then null
-            else birthyear :: integer
-        end as birth_year,
-        case
-            when deathyear = '\\N' then null
-            else deathyear :: integer
-        end as death_year,
+        -- Years - COPY already loads \N as null, so a plain cast works for
+        -- both text and typed (load_raw.py --typed) columns
+        birthyear :: integer as birth_year,
+        deathyear :: integer as death_year,
         -- Comma-separated fields - keep as text for now, will split in marts
         case
             when primaryprofession = '\\N' then null
@@ -0,0 +1,15 @@
+{{ config(
+    materialized = 'table',
+    schema = 'staging',
+    indexes = [
+        {'columns': ['person_id'], 'unique': True}
+    ],
+    post_hook = "analyze {{ this }}"
+) }}
+-- People that pass stg_name_basics' filters, built once per run so
+-- stg_title_principals semi-joins against a small indexed key set
+-- instead of re-filtering raw.name_basics on every reference
+select
+    person_id
+from
+    {{ ref('stg_name_basics') }}
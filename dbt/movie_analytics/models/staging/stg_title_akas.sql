@@ -1,6 +1,7 @@
 {{ config(
-    materialized = 'view',
-    schema = 'staging'
+    materialized = 'table',
+    schema = 'staging',
+    post_hook = "analyze {{ this }}"
 ) }} with source as (
     select
         *
@@ -11,11 +12,9 @@ cleaned as (
     select
         -- Foreign key
         titleid as title_id,
-        -- Ordering and title information
-        case
-            when ordering = '\\N' then null
-            else ordering :: integer
-        end as ordering,
+        -- Ordering and title information (COPY already loads \N as null,
+        -- so a plain cast works for text and typed raw columns)
+        ordering :: integer as ordering,
         case
             when title = '\\N' then null
             else title
@@ -46,15 +45,14 @@ cleaned as (
         end as is_original_title
     from
         source
-    -- Only include alternative titles for titles that exist in title_basics
+    -- Only include alternative titles for titles that exist in title_basics.
+    -- Materialized as a table so this filter runs once per build rather
+    -- than on every reference by the marts and tests.
     where
-        titleid in (
-            select tconst
-            from {{ source('raw', 'title_basics') }}
-            where titletype in (
-                'movie', 'short', 'tvEpisode', 'tvMiniSeries', 'tvMovie',
-                'tvSeries', 'tvShort', 'tvSpecial', 'video', 'videoGame'
-            )
+        exists (
+            select 1
+            from {{ ref('stg_title_keys') }} k
+            where k.title_id = source.titleid
         )
 )
 select
@@ -21,20 +21,11 @@ cleaned as (
             when isadult = '0' then false
             else null
         end as is_adult,
-        -- Years - convert \N to null and cast to integer
-        case
-            when startyear = '\\N' then null
-            else startyear :: integer
-        end as start_year,
-        case
-            when endyear = '\\N' then null
-            else endyear :: integer
-        end as end_year,
-        -- Runtime - convert \N to null and cast to integer
-        case
-            when runtimeminutes = '\\N' then null
-            else runtimeminutes :: integer
-        end as runtime_minutes,
+        -- Years and runtime - COPY already loads \N as null, so a plain
+        -- cast works for both text and typed (load_raw.py --typed) columns
+        startyear :: integer as start_year,
+        endyear :: integer as end_year,
+        runtimeminutes :: integer as runtime_minutes,
         -- Genres - keep as text for now, will split later
         case
             when genres = '\\N' then null
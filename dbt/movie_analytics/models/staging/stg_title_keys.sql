@@ -0,0 +1,15 @@
+{{ config(
+    materialized = 'table',
+    schema = 'staging',
+    indexes = [
+        {'columns': ['title_id'], 'unique': True}
+    ],
+    post_hook = "analyze {{ this }}"
+) }}
+-- Titles that pass stg_title_basics' filters, built once per run so the
+-- child staging models semi-join against a small indexed key set
+-- instead of re-filtering raw.title_basics on every reference
+select
+    title_id
+from
+    {{ ref('stg_title_basics') }}
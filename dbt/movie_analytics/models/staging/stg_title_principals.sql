@@ -1,6 +1,7 @@
 {{ config(
-    materialized = 'view',
-    schema = 'staging'
+    materialized = 'table',
+    schema = 'staging',
+    post_hook = "analyze {{ this }}"
 ) }} with source as (
     select
         *
@@ -12,11 +13,9 @@ cleaned as (
         -- Foreign keys
         tconst as title_id,
         nconst as person_id,
-        -- Ordering and role information
-        case
-            when ordering = '\\N' then null
-            else ordering :: integer
-        end as ordering,
+        -- Ordering and role information (COPY already loads \N as null,
+        -- so a plain cast works for text and typed raw columns)
+        ordering :: integer as ordering,
         category as job_category,
         case
             when job = '\\N' then null
@@ -25,25 +24,26 @@ cleaned as (
         case
             when characters = '\\N' then null
             else characters
-        end as character_names
+        end as character_names,
+        -- Fingerprint of the source row; bridge_cast_crew compares it
+        -- with the stored value to find changed credits
+        md5(row(tconst, nconst, ordering, category, job, characters)::text)
+            as principal_hash
     from
         source
-    -- Only include records for titles and names that exist in their respective tables
+    -- Only include records for titles and names that exist in their respective tables.
+    -- Materialized as a table so these filters run once per build rather
+    -- than on every reference by the marts and tests.
     where
-        tconst in (
-            select tconst
-            from {{ source('raw', 'title_basics') }}
-            where titletype in (
-                'movie', 'short', 'tvEpisode', 'tvMiniSeries', 'tvMovie',
-                'tvSeries', 'tvShort', 'tvSpecial', 'video', 'videoGame'
-            )
+        exists (
+            select 1
+            from {{ ref('stg_title_keys') }} k
+            where k.title_id = source.tconst
         )
-        and nconst in (
-            select nconst
-            from {{ source('raw', 'name_basics') }}
-            where primaryname is not null
-            and primaryname != '\\N'
-            and trim(primaryname) != ''
+        and exists (
+            select 1
+            from {{ ref('stg_person_keys') }} k
+            where k.person_id = source.nconst
         )
 )
 select
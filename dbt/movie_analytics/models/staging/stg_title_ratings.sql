@@ -7,14 +7,10 @@
 cleaned AS (
     SELECT
         tconst AS title_id,
-        CASE
-            WHEN averagerating = '\\N' THEN NULL
-            ELSE averagerating :: decimal(3, 1)
-        END AS average_rating,
-        CASE
-            WHEN numvotes = '\\N' THEN NULL
-            ELSE numvotes :: integer
-        END AS num_votes
+        -- COPY already loads \N as null, so a plain cast works for both
+        -- text and typed (load_raw.py --typed) columns
+        averagerating :: decimal(3, 1) AS average_rating,
+        numvotes :: integer AS num_votes
     FROM
         source
 )
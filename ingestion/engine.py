@@ -0,0 +1,287 @@
+"""
+Shared ingestion engine for the IMDb loaders.
+
+Connection handling, COPY and TRUNCATE helpers, and a small
+concurrency primitive used by both load_raw.py and load_test_data.py,
+plus the positive_int argument type shared by the command-line scripts.
+Streamed COPY reads its source on a background thread into a bounded
+queue, so disk reads, gzip decompression and validation of the next
+blocks overlap with sending the current block to PostgreSQL.
+"""
+
+import argparse
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Sequence, TypeVar
+
+import psycopg2
+from psycopg2 import sql
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+from ingestion.config import DB_CONFIG
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Block size used when streaming file contents to COPY FROM STDIN
+COPY_BUFFER_SIZE = 8 * 1024 * 1024
+
+# Blocks read ahead of COPY per stream; bounds memory to roughly
+# (PREFETCH_BLOCKS + 1) * COPY_BUFFER_SIZE per stream
+PREFETCH_BLOCKS = 4
+
+
+def table_identifier(table_name: str) -> sql.Identifier:
+    """
+    Convert a schema-qualified table name into a safely quoted identifier.
+
+    Args:
+        table_name: Table name, optionally schema-qualified (e.g. "raw.title_basics")
+
+    Returns:
+        sql.Identifier: Composable identifier for use in SQL statements
+
+    Raises:
+        ValueError: If the name is not "table" or "schema.table" with
+            non-empty parts
+    """
+    parts = table_name.split(".")
+    if len(parts) > 2 or not all(parts):
+        raise ValueError(f"Invalid table name: {table_name!r}")
+    return sql.Identifier(*parts)
+
+
+def get_database_connection():
+    """
+    Establish connection to PostgreSQL database.
+
+    Returns:
+        psycopg2.connection: Database connection object in autocommit mode
+
+    Raises:
+        psycopg2.Error: If connection fails
+    """
+    try:
+        conn = psycopg2.connect(**DB_CONFIG)
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        logger.info("Successfully connected to database")
+        return conn
+    except psycopg2.Error as e:
+        logger.error("Failed to connect to database: %s", e)
+        raise
+
+
+def with_connection(func: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Call ``func(cursor, *args, **kwargs)`` on a dedicated connection.
+
+    Lets any cursor-based helper run as an independent task, e.g. from
+    run_concurrently. The connection is closed afterwards.
+
+    Args:
+        func: Function taking a cursor as its first argument
+        *args: Further positional arguments for ``func``
+        **kwargs: Keyword arguments for ``func``
+
+    Returns:
+        Whatever ``func`` returns
+
+    Raises:
+        psycopg2.Error: If the connection or ``func`` fails
+    """
+    conn = get_database_connection()
+    try:
+        with conn.cursor() as cursor:
+            return func(cursor, *args, **kwargs)
+    finally:
+        conn.close()
+
+
+def run_concurrently(
+    tasks: Sequence[Callable[[], T]], workers: int, name: str = "task"
+) -> List[T]:
+    """
+    Run independent tasks on up to ``workers`` threads.
+
+    psycopg2 releases the GIL while it waits on the server, so COPY,
+    TRUNCATE and queries on separate connections proceed in parallel.
+    All tasks run to completion even if one fails.
+
+    Args:
+        tasks: Zero-argument callables, started in the given order
+        workers: Maximum number of tasks running at once
+        name: Thread name prefix, shown in tracebacks
+
+    Returns:
+        list: Result of each task, in the order of ``tasks``
+
+    Raises:
+        Exception: The first failing task's exception, in task order
+    """
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name) as pool:
+        futures = [pool.submit(task) for task in tasks]
+    return [future.result() for future in futures]
+
+
+def clear_table(cursor, table_name: str) -> None:
+    """
+    Clear existing data from table before loading.
+
+    Args:
+        cursor: Database cursor
+        table_name: Name of table to clear
+    """
+    try:
+        cursor.execute(
+            sql.SQL("TRUNCATE TABLE {table}").format(table=table_identifier(table_name))
+        )
+        logger.info("Cleared existing data from %s", table_name)
+    except psycopg2.Error as e:
+        logger.error("Failed to clear table %s: %s", table_name, e)
+        raise
+
+
+def copy_server_file(cursor, server_path: str, table_name: str) -> int:
+    """
+    Load a TSV file the database server can read itself.
+
+    Args:
+        cursor: Database cursor
+        server_path: Absolute path of the file on the database host
+        table_name: Target database table
+
+    Returns:
+        int: Number of rows loaded by COPY
+
+    Raises:
+        psycopg2.Error: If COPY command fails
+    """
+    copy_sql = sql.SQL(
+        "COPY {table} FROM {path} "
+        "WITH (FORMAT text, DELIMITER E'\\t', NULL '\\N', HEADER true)"
+    ).format(
+        table=table_identifier(table_name),
+        path=sql.Literal(server_path),
+    )
+    cursor.execute(copy_sql)
+    return cursor.rowcount
+
+
+class PrefetchReader:
+    """
+    Read-ahead wrapper handed to COPY FROM STDIN.
+
+    A background thread reads COPY_BUFFER_SIZE blocks from ``reader``
+    into a queue of at most ``depth`` blocks while COPY sends earlier
+    blocks, so the two overlap instead of alternating. An exception
+    raised by ``reader`` is re-raised from read(). Closing the wrapper
+    stops the thread, even if COPY gave up half-way.
+    """
+
+    def __init__(self, reader, depth: int = PREFETCH_BLOCKS):
+        self._queue: queue.Queue = queue.Queue(maxsize=depth)
+        self._stop = threading.Event()
+        self._finished = False
+        self._thread = threading.Thread(
+            target=self._produce, args=(reader,), name="prefetch", daemon=True
+        )
+        self._thread.start()
+
+    def _produce(self, reader) -> None:
+        """Fill the queue until the reader is exhausted or fails."""
+        try:
+            while not self._stop.is_set():
+                data = reader.read(COPY_BUFFER_SIZE)
+                self._put(data)
+                if not data:
+                    return
+        except Exception as e:
+            self._put(e)
+
+    def _put(self, item) -> None:
+        """Queue an item, giving up once the consumer has stopped."""
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def read(self, size: int = -1) -> bytes:
+        """Return the next prefetched block, or b"" at the end."""
+        if self._finished:
+            return b""
+        item = self._queue.get()
+        if isinstance(item, Exception):
+            self._finished = True
+            raise item
+        if not item:
+            self._finished = True
+        return item
+
+    def close(self) -> None:
+        """Stop the read-ahead thread and wait for it to exit."""
+        self._stop.set()
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def copy_stream(cursor, reader, table_name: str, header: bool) -> int:
+    """
+    Send a TSV stream to a table with COPY FROM STDIN.
+
+    Data is pushed in COPY_BUFFER_SIZE blocks read ahead by a
+    PrefetchReader, so memory use stays bounded regardless of file size.
+
+    Args:
+        cursor: Database cursor
+        reader: File-like object positioned at a line start
+        table_name: Target database table
+        header: Whether the stream starts with the header line
+
+    Returns:
+        int: Number of rows loaded by COPY
+    """
+    copy_sql = sql.SQL(
+        "COPY {table} FROM STDIN "
+        "WITH (FORMAT text, DELIMITER E'\\t', NULL '\\N', HEADER {header})"
+    ).format(
+        table=table_identifier(table_name),
+        header=sql.SQL("true" if header else "false"),
+    )
+
+    with PrefetchReader(reader) as prefetched:
+        cursor.copy_expert(copy_sql, prefetched, size=COPY_BUFFER_SIZE)
+    return cursor.rowcount
+
+
+def positive_int(value: str) -> int:
+    """
+    Parse a strictly positive integer command-line argument.
+
+    Args:
+        value: Raw argument string
+
+    Returns:
+        int: Parsed value
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is not an integer >= 1
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"expected an integer, got {value!r}"
+        ) from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
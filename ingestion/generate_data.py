@@ -0,0 +1,816 @@
+"""
+Synthetic IMDb Dataset Generator
+
+Writes the five IMDb TSV files at any scale, from a few thousand rows to
+the size of the real dump, so the loader and the dbt models can be
+benchmarked without downloading it. Rows follow the shape of the real
+data: file proportions, title type mix, \\N rates, comma-list lengths
+and principals per title. Every tconst and nconst referenced by
+ratings, akas, principals and knownForTitles exists in title.basics or
+name.basics.
+
+Output is deterministic for a given seed and scale: each block of
+titles or people draws from its own random stream, so the files are
+identical on every run and on every machine.
+"""
+
+import argparse
+import csv
+import gzip
+import json
+import logging
+import sys
+import time
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from ingestion.engine import positive_int
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler(sys.stdout)],
+)
+logger = logging.getLogger(__name__)
+
+OUTPUT_DIR = Path("data_lake/landing/synthetic")
+
+# Written next to the files, recording the parameters and row counts
+PARAMS_FILE = "_generator.json"
+
+DEFAULT_ROWS = 1_000_000
+DEFAULT_SEED = 42
+
+# Titles or people generated per block, and per random stream
+BLOCK_SIZE = 100_000
+
+# Rows per title of each file in the real dump (~10M titles, 1.4M
+# ratings, 94M akas, 57M principals, 13M people)
+FILE_RATIOS = {
+    "title.basics.tsv": 1.0,
+    "title.ratings.tsv": 0.14,
+    "title.akas.tsv": 9.4,
+    "title.principals.tsv": 5.7,
+    "name.basics.tsv": 1.3,
+}
+
+HEADERS = {
+    "title.basics.tsv": [
+        "tconst",
+        "titleType",
+        "primaryTitle",
+        "originalTitle",
+        "isAdult",
+        "startYear",
+        "endYear",
+        "runtimeMinutes",
+        "genres",
+    ],
+    "title.ratings.tsv": ["tconst", "averageRating", "numVotes"],
+    "title.akas.tsv": [
+        "titleId",
+        "ordering",
+        "title",
+        "region",
+        "language",
+        "types",
+        "attributes",
+        "isOriginalTitle",
+    ],
+    "title.principals.tsv": [
+        "tconst",
+        "ordering",
+        "nconst",
+        "category",
+        "job",
+        "characters",
+    ],
+    "name.basics.tsv": [
+        "nconst",
+        "primaryName",
+        "birthYear",
+        "deathYear",
+        "primaryProfession",
+        "knownForTitles",
+    ],
+}
+
+# Random stream of each file within a seed
+STREAM_IDS = {filename: index for index, filename in enumerate(FILE_RATIOS)}
+
+# Years are drawn relative to a fixed year so output never depends on
+# the date it is generated
+LATEST_YEAR = 2025
+EARLIEST_YEAR = 1874
+
+# titleType: share of titles, and (mean, sd, min, max) runtime in minutes
+TITLE_TYPES = {
+    "tvEpisode": (0.72, (35, 15, 5, 120)),
+    "short": (0.09, (12, 6, 1, 45)),
+    "movie": (0.07, (95, 20, 40, 300)),
+    "video": (0.03, (60, 30, 1, 240)),
+    "tvSeries": (0.025, (40, 15, 5, 120)),
+    "tvMovie": (0.015, (85, 15, 40, 200)),
+    "tvSpecial": (0.005, (60, 25, 5, 200)),
+    "tvMiniSeries": (0.005, (50, 15, 10, 120)),
+    "videoGame": (0.004, (60, 30, 1, 240)),
+    "tvShort": (0.001, (8, 4, 1, 30)),
+}
+
+# Title types with an end year
+SERIES_TYPES = ("tvSeries", "tvMiniSeries")
+
+GENRES = {
+    "Drama": 0.18,
+    "Comedy": 0.14,
+    "Documentary": 0.09,
+    "Talk-Show": 0.06,
+    "Reality-TV": 0.05,
+    "Romance": 0.05,
+    "Family": 0.04,
+    "Short": 0.04,
+    "Animation": 0.04,
+    "News": 0.04,
+    "Action": 0.035,
+    "Crime": 0.035,
+    "Adventure": 0.03,
+    "Music": 0.025,
+    "Game-Show": 0.02,
+    "Adult": 0.015,
+    "Sport": 0.015,
+    "Fantasy": 0.015,
+    "Mystery": 0.015,
+    "Horror": 0.015,
+    "Thriller": 0.014,
+    "History": 0.012,
+    "Biography": 0.01,
+    "Sci-Fi": 0.01,
+    "Musical": 0.005,
+    "War": 0.004,
+    "Western": 0.003,
+    "Film-Noir": 0.001,
+}
+
+PROFESSIONS = {
+    "actor": 0.24,
+    "actress": 0.16,
+    "miscellaneous": 0.1,
+    "producer": 0.08,
+    "writer": 0.07,
+    "camera_department": 0.05,
+    "director": 0.05,
+    "editor": 0.03,
+    "cinematographer": 0.03,
+    "composer": 0.03,
+    "music_department": 0.03,
+    "sound_department": 0.03,
+    "art_department": 0.02,
+    "visual_effects": 0.02,
+    "editorial_department": 0.02,
+    "animation_department": 0.01,
+    "make_up_department": 0.01,
+    "assistant_director": 0.01,
+    "stunts": 0.005,
+    "casting_director": 0.005,
+}
+
+# Principal categories, and the jobs credited for them (if any)
+CATEGORIES = {
+    "actor": (0.27, ()),
+    "actress": (0.2, ()),
+    "self": (0.12, ()),
+    "writer": (0.11, ("screenplay", "story", "novel", "written by", "creator")),
+    "director": (0.09, ("director", "co-director")),
+    "producer": (0.07, ("producer", "executive producer", "co-producer")),
+    "cinematographer": (0.04, ("director of photography",)),
+    "composer": (0.04, ("composer", "music by")),
+    "editor": (0.04, ("editor", "film editor")),
+    "production_designer": (0.01, ("production designer",)),
+    "casting_director": (0.006, ("casting director",)),
+    "archive_footage": (0.004, ()),
+}
+
+# Categories credited with character names
+ACTING_CATEGORIES = ("actor", "actress", "self", "archive_footage")
+
+REGIONS = {
+    "US": 0.14,
+    "JP": 0.08,
+    "FR": 0.08,
+    "IN": 0.07,
+    "DE": 0.07,
+    "ES": 0.07,
+    "IT": 0.07,
+    "GB": 0.06,
+    "BR": 0.06,
+    "CA": 0.05,
+    "MX": 0.04,
+    "RU": 0.04,
+    "PT": 0.04,
+    "GR": 0.03,
+    "PL": 0.03,
+    "XWW": 0.03,
+    "TR": 0.02,
+    "SE": 0.02,
+}
+
+LANGUAGES = ("en", "ja", "fr", "hi", "es", "de", "it", "pt", "ru", "tr", "ta", "sv")
+
+AKA_TYPES = (
+    "imdbDisplay",
+    "alternative",
+    "working",
+    "festival",
+    "dvd",
+    "tv",
+    "video",
+)
+
+AKA_ATTRIBUTES = (
+    "literal title",
+    "new title",
+    "short title",
+    "complete title",
+    "literal English title",
+)
+
+TITLE_WORDS = (
+    "Last",
+    "Lost",
+    "Dark",
+    "Silent",
+    "Broken",
+    "Golden",
+    "Hidden",
+    "Wild",
+    "Final",
+    "Secret",
+    "Eternal",
+    "Midnight",
+    "Crimson",
+    "Frozen",
+    "Little",
+    "Great",
+)
+
+TITLE_NOUNS = (
+    "Road",
+    "Garden",
+    "Kingdom",
+    "River",
+    "Storm",
+    "Promise",
+    "Stranger",
+    "Journey",
+    "House",
+    "Summer",
+    "Empire",
+    "Letter",
+    "Mountain",
+    "Voyage",
+    "Shadow",
+    "Heart",
+    "Island",
+    "Night",
+    "Machine",
+    "Station",
+)
+
+FIRST_NAMES = (
+    "Alice",
+    "Ben",
+    "Carmen",
+    "David",
+    "Elena",
+    "Farid",
+    "Grace",
+    "Hiro",
+    "Ines",
+    "Jack",
+    "Kemal",
+    "Lena",
+    "Marco",
+    "Nadia",
+    "Oscar",
+    "Priya",
+    "Quentin",
+    "Rosa",
+    "Sven",
+    "Tomoko",
+    "Umar",
+    "Vera",
+    "Wei",
+    "Yusuf",
+)
+
+LAST_NAMES = (
+    "Anderson",
+    "Becker",
+    "Costa",
+    "Dubois",
+    "Evans",
+    "Fischer",
+    "Garcia",
+    "Hansen",
+    "Ivanova",
+    "Jensen",
+    "Kim",
+    "Lopez",
+    "Moreau",
+    "Nakamura",
+    "Okafor",
+    "Patel",
+    "Rossi",
+    "Silva",
+    "Tanaka",
+    "Weber",
+)
+
+
+def scale_counts(rows: int) -> Dict[str, int]:
+    """
+    Number of titles and people needed for about ``rows`` rows in total.
+
+    Args:
+        rows: Target row count over all five files
+
+    Returns:
+        dict: "titles" and "people" counts
+    """
+    titles = max(1, round(rows / sum(FILE_RATIOS.values())))
+    people = max(1, round(titles * FILE_RATIOS["name.basics.tsv"]))
+    return {"titles": titles, "people": people}
+
+
+def block_rng(seed: int, filename: str, block: int) -> np.random.Generator:
+    """Random stream of one block of a file."""
+    return np.random.default_rng([seed, STREAM_IDS[filename], block])
+
+
+def format_ids(prefix: str, numbers: np.ndarray) -> np.ndarray:
+    """Format numbers as IMDb identifiers, e.g. 42 -> tt0000042."""
+    return np.char.add(prefix, np.char.zfill(numbers.astype(str), 7)).astype(object)
+
+
+def weighted_choice(
+    rng: np.random.Generator, weights: Dict[str, float], size: int
+) -> np.ndarray:
+    """Indexes into ``weights`` drawn with the given relative weights."""
+    p = np.fromiter(weights.values(), dtype=float)
+    return rng.choice(len(p), size=size, p=p / p.sum())
+
+
+def pick(values: Sequence[str], indexes: np.ndarray) -> np.ndarray:
+    """Look up strings by index, as an object array."""
+    return np.asarray(values, dtype=object)[indexes]
+
+
+def with_nulls(
+    rng: np.random.Generator, values: np.ndarray, null_rate: float
+) -> np.ndarray:
+    """Replace a random share of values with None (written as \\N)."""
+    values = values.astype(object)
+    values[rng.random(len(values)) < null_rate] = None
+    return values
+
+
+def nullable_int(values: np.ndarray, null_mask: np.ndarray) -> pd.array:
+    """Integer column with missing values where ``null_mask`` is set."""
+    return pd.arrays.IntegerArray(values.astype(np.int64), null_mask)
+
+
+def join_lists(columns: List[np.ndarray], lengths: np.ndarray) -> np.ndarray:
+    """
+    Join the first ``lengths[i]`` of ``columns`` into comma lists.
+
+    Args:
+        columns: Equal-length string arrays, one per list position
+        lengths: Number of items in each row's list (at least 1)
+
+    Returns:
+        numpy.ndarray: Comma-separated lists, as an object array
+    """
+    joined = pd.Series(columns[0], dtype=object)
+    for position, column in enumerate(columns[1:], start=1):
+        longer = lengths > position
+        joined[longer] = joined[longer] + "," + pd.Series(column, dtype=object)[longer]
+    return joined.to_numpy()
+
+
+def distinct_choices(
+    rng: np.random.Generator, weights: Dict[str, float], size: int, count: int
+) -> List[np.ndarray]:
+    """
+    Draw ``count`` distinct indexes into ``weights`` per row.
+
+    The first index follows the weights; the others are distinct
+    offsets from it.
+    """
+    n = len(weights)
+    first = weighted_choice(rng, weights, size)
+    columns = [first]
+    offsets: List[np.ndarray] = []
+    for _ in range(count - 1):
+        offset = rng.integers(1, n - len(offsets), size)
+        if offsets:
+            # Step over the offsets already taken, smallest first, which
+            # keeps the draw uniform over the remaining ones
+            for taken in np.sort(np.column_stack(offsets), axis=1).T:
+                offset += offset >= taken
+        offsets.append(offset)
+        columns.append((first + offset) % n)
+    return columns
+
+
+def random_titles(rng: np.random.Generator, size: int) -> np.ndarray:
+    """Two-word titles such as "Silent Harbor"."""
+    words = pick(TITLE_WORDS, rng.integers(len(TITLE_WORDS), size=size))
+    nouns = pick(TITLE_NOUNS, rng.integers(len(TITLE_NOUNS), size=size))
+    return words + " " + nouns
+
+
+def expand(ids: np.ndarray, counts: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Repeat each id ``counts`` times and number the copies from 1.
+
+    Returns:
+        dict: "ids" and "ordering" arrays of length counts.sum()
+    """
+    repeated = np.repeat(ids, counts)
+    starts = np.cumsum(counts) - counts
+    ordering = np.arange(len(repeated)) - np.repeat(starts, counts) + 1
+    return {"ids": repeated, "ordering": ordering}
+
+
+def title_basics(
+    rng: np.random.Generator, numbers: np.ndarray
+) -> Dict[str, pd.DataFrame]:
+    """
+    Generate one block of title.basics plus the types needed downstream.
+
+    Args:
+        rng: Random stream of the block
+        numbers: Numeric part of the block's tconsts
+
+    Returns:
+        dict: "frame" (title.basics rows) and "types" (titleType per row)
+    """
+    size = len(numbers)
+    types = np.array(list(TITLE_TYPES), dtype=object)[
+        weighted_choice(rng, {t: w for t, (w, _) in TITLE_TYPES.items()}, size)
+    ]
+
+    start_year = LATEST_YEAR - np.floor(rng.exponential(18, size)).astype(int)
+    start_year = np.maximum(start_year, EARLIEST_YEAR)
+    start_missing = rng.random(size) < 0.12
+
+    is_series = np.isin(types, SERIES_TYPES)
+    end_year = np.minimum(start_year + rng.geometric(0.25, size) - 1, LATEST_YEAR)
+    end_missing = ~is_series | start_missing | (rng.random(size) < 0.5)
+
+    runtime = np.zeros(size, dtype=int)
+    for title_type, (_, (mean, sd, low, high)) in TITLE_TYPES.items():
+        of_type = types == title_type
+        drawn = rng.normal(mean, sd, of_type.sum())
+        runtime[of_type] = np.clip(np.round(drawn), low, high)
+    runtime_missing = rng.random(size) < 0.65
+
+    primary = random_titles(rng, size)
+    original = primary.copy()
+    translated = rng.random(size) < 0.1
+    original[translated] = random_titles(rng, translated.sum())
+
+    genre_count = rng.choice([1, 2, 3], size=size, p=[0.55, 0.25, 0.2])
+    # IMDb lists each title's genres alphabetically
+    names = np.array(sorted(GENRES), dtype=object)
+    rank = np.argsort(np.argsort(list(GENRES)))
+    ranked = np.sort(
+        rank[np.column_stack(distinct_choices(rng, GENRES, size, 3))], axis=1
+    )
+    genres = join_lists([names[ranked[:, i]] for i in range(3)], genre_count)
+
+    frame = pd.DataFrame(
+        {
+            "tconst": format_ids("tt", numbers),
+            "titleType": types,
+            "primaryTitle": primary,
+            "originalTitle": original,
+            "isAdult": (rng.random(size) < 0.015).astype(int),
+            "startYear": nullable_int(start_year, start_missing),
+            "endYear": nullable_int(end_year, end_missing),
+            "runtimeMinutes": nullable_int(runtime, runtime_missing),
+            "genres": with_nulls(rng, genres, 0.045),
+        }
+    )
+    return {"frame": frame, "types": types}
+
+
+def title_ratings(rng: np.random.Generator, tconsts: np.ndarray) -> pd.DataFrame:
+    """Generate ratings for a random ~14% of a block's titles."""
+    rated = tconsts[rng.random(len(tconsts)) < FILE_RATIOS["title.ratings.tsv"]]
+    size = len(rated)
+    rating = np.clip(np.round(rng.normal(6.9, 1.3, size), 1), 1.0, 10.0)
+    # Heavy-tailed vote counts: most titles have a handful, a few millions
+    votes = np.floor(5 * (1 - rng.random(size)) ** (-1 / 1.1))
+    votes = np.minimum(votes, 3_000_000).astype(int)
+    return pd.DataFrame({"tconst": rated, "averageRating": rating, "numVotes": votes})
+
+
+def title_akas(rng: np.random.Generator, tconsts: np.ndarray) -> pd.DataFrame:
+    """Generate alternative titles, on average 9.4 per title."""
+    counts = rng.geometric(1 / FILE_RATIOS["title.akas.tsv"], len(tconsts))
+    rows = expand(tconsts, counts)
+    size = len(rows["ids"])
+    is_original = rows["ordering"] == 1
+
+    region = pick(list(REGIONS), weighted_choice(rng, REGIONS, size))
+    region = with_nulls(rng, region, 0.05)
+    region[is_original] = None
+    language = with_nulls(
+        rng, pick(LANGUAGES, rng.integers(len(LANGUAGES), size=size)), 0.7
+    )
+    language[is_original] = None
+    types = pick(AKA_TYPES, rng.integers(len(AKA_TYPES), size=size))
+    types = with_nulls(rng, types, 0.55)
+    types[is_original] = "original"
+    attributes = pick(AKA_ATTRIBUTES, rng.integers(len(AKA_ATTRIBUTES), size=size))
+
+    return pd.DataFrame(
+        {
+            "titleId": rows["ids"],
+            "ordering": rows["ordering"],
+            "title": random_titles(rng, size),
+            "region": region,
+            "language": language,
+            "types": types,
+            "attributes": with_nulls(rng, attributes, 0.99),
+            "isOriginalTitle": is_original.astype(int),
+        }
+    )
+
+
+def title_principals(
+    rng: np.random.Generator, tconsts: np.ndarray, people: int
+) -> pd.DataFrame:
+    """
+    Generate cast and crew credits, on average 5.7 per title and at most 10.
+
+    People are drawn with a skew towards low nconsts, so some work on
+    many titles and most on few, as in the real data.
+    """
+    counts = np.minimum(rng.poisson(4.8, len(tconsts)) + 1, 10)
+    rows = expand(tconsts, counts)
+    size = len(rows["ids"])
+
+    person = np.floor(people * rng.random(size) ** 2).astype(np.int64) + 1
+    category_index = weighted_choice(
+        rng, {c: w for c, (w, _) in CATEGORIES.items()}, size
+    )
+    category = pick(list(CATEGORIES), category_index)
+
+    job = np.full(size, None, dtype=object)
+    credited = rng.random(size) < 0.45
+    for index, (_, jobs) in enumerate(CATEGORIES.values()):
+        of_category = credited & (category_index == index)
+        if jobs and of_category.any():
+            drawn = rng.integers(len(jobs), size=of_category.sum())
+            job[of_category] = pick(jobs, drawn)
+
+    characters = np.full(size, None, dtype=object)
+    acting = np.isin(category, ACTING_CATEGORIES) & (rng.random(size) < 0.9)
+    names = pick(FIRST_NAMES, rng.integers(len(FIRST_NAMES), size=acting.sum()))
+    names[category[acting] == "self"] = "Self"
+    characters[acting] = '["' + names + '"]'
+
+    return pd.DataFrame(
+        {
+            "tconst": rows["ids"],
+            "ordering": rows["ordering"],
+            "nconst": format_ids("nm", person),
+            "category": category,
+            "job": job,
+            "characters": characters,
+        }
+    )
+
+
+def name_basics(
+    rng: np.random.Generator, numbers: np.ndarray, titles: int
+) -> pd.DataFrame:
+    """Generate one block of people, with knownForTitles among ``titles``."""
+    size = len(numbers)
+    first = pick(FIRST_NAMES, rng.integers(len(FIRST_NAMES), size=size))
+    last = pick(LAST_NAMES, rng.integers(len(LAST_NAMES), size=size))
+
+    birth_year = np.clip(np.round(rng.normal(1965, 25, size)), 1850, LATEST_YEAR - 5)
+    birth_missing = rng.random(size) < 0.95
+    lifespan = np.clip(np.round(rng.normal(75, 12, size)), 20, 105)
+    death_year = np.minimum(birth_year + lifespan, LATEST_YEAR)
+    death_missing = (
+        birth_missing | (birth_year + lifespan > LATEST_YEAR) | (rng.random(size) < 0.6)
+    )
+
+    profession_count = rng.choice([1, 2, 3], size=size, p=[0.6, 0.25, 0.15])
+    professions = join_lists(
+        [
+            pick(list(PROFESSIONS), column)
+            for column in distinct_choices(rng, PROFESSIONS, size, 3)
+        ],
+        profession_count,
+    )
+
+    known_count = rng.choice([1, 2, 3, 4], size=size, p=[0.3, 0.15, 0.15, 0.4])
+    known_for = join_lists(
+        [format_ids("tt", rng.integers(1, titles + 1, size)) for _ in range(4)],
+        known_count,
+    )
+
+    return pd.DataFrame(
+        {
+            "nconst": format_ids("nm", numbers),
+            "primaryName": first + " " + last,
+            "birthYear": nullable_int(birth_year.astype(int), birth_missing),
+            "deathYear": nullable_int(death_year.astype(int), death_missing),
+            "primaryProfession": with_nulls(rng, professions, 0.2),
+            "knownForTitles": with_nulls(rng, known_for, 0.1),
+        }
+    )
+
+
+def write_frame(frame: pd.DataFrame, out) -> None:
+    """Append rows in IMDb's TSV dialect: no quoting, \\N for nulls."""
+    frame.to_csv(
+        out,
+        sep="\t",
+        header=False,
+        index=False,
+        na_rep="\\N",
+        quoting=csv.QUOTE_NONE,
+        float_format="%.1f",
+        lineterminator="\n",
+    )
+
+
+def open_output(path: Path, compress: bool):
+    """Open an output file for text writing, gzip-compressed if requested."""
+    if compress:
+        return gzip.open(path, "wt", compresslevel=1, encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def generate_dataset(
+    output_dir: Path = OUTPUT_DIR,
+    rows: int = DEFAULT_ROWS,
+    seed: int = DEFAULT_SEED,
+    compress: bool = False,
+) -> Dict[str, int]:
+    """
+    Write the five IMDb files at the scale of about ``rows`` rows.
+
+    Titles are generated in blocks of BLOCK_SIZE together with their
+    ratings, akas and principals, so each file is written in one pass
+    with memory bounded by the block size.
+
+    Args:
+        output_dir: Directory to write the files to
+        rows: Target row count over all five files
+        seed: Random seed; the same seed and rows give identical files
+        compress: Write ``.tsv.gz`` files instead of ``.tsv``
+
+    Returns:
+        dict: Number of data rows written per file name
+    """
+    counts = scale_counts(rows)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    suffix = ".gz" if compress else ""
+    row_counts = {filename: 0 for filename in FILE_RATIOS}
+
+    with ExitStack() as stack:
+        outputs = {
+            filename: stack.enter_context(
+                open_output(output_dir / f"{filename}{suffix}", compress)
+            )
+            for filename in FILE_RATIOS
+        }
+        for filename, out in outputs.items():
+            out.write("\t".join(HEADERS[filename]) + "\n")
+
+        for block, start in enumerate(range(1, counts["titles"] + 1, BLOCK_SIZE)):
+            numbers = np.arange(start, min(start + BLOCK_SIZE, counts["titles"] + 1))
+            basics = title_basics(block_rng(seed, "title.basics.tsv", block), numbers)
+            tconsts = basics["frame"]["tconst"].to_numpy()
+            frames = {
+                "title.basics.tsv": basics["frame"],
+                "title.ratings.tsv": title_ratings(
+                    block_rng(seed, "title.ratings.tsv", block), tconsts
+                ),
+                "title.akas.tsv": title_akas(
+                    block_rng(seed, "title.akas.tsv", block), tconsts
+                ),
+                "title.principals.tsv": title_principals(
+                    block_rng(seed, "title.principals.tsv", block),
+                    tconsts,
+                    counts["people"],
+                ),
+            }
+            for filename, frame in frames.items():
+                write_frame(frame, outputs[filename])
+                row_counts[filename] += len(frame)
+            logger.info("Generated %d of %d titles", numbers[-1], counts["titles"])
+
+        for block, start in enumerate(range(1, counts["people"] + 1, BLOCK_SIZE)):
+            numbers = np.arange(start, min(start + BLOCK_SIZE, counts["people"] + 1))
+            frame = name_basics(
+                block_rng(seed, "name.basics.tsv", block), numbers, counts["titles"]
+            )
+            write_frame(frame, outputs["name.basics.tsv"])
+            row_counts["name.basics.tsv"] += len(frame)
+
+    params = {"rows": rows, "seed": seed, "compress": compress, **counts}
+    (output_dir / PARAMS_FILE).write_text(
+        json.dumps({"params": params, "row_counts": row_counts}, indent=2) + "\n"
+    )
+    return row_counts
+
+
+def read_params(output_dir: Path) -> Optional[Dict[str, int]]:
+    """
+    Parameters a directory was generated with, or None if unknown.
+
+    Args:
+        output_dir: Directory written by generate_dataset
+
+    Returns:
+        dict: "params" and "row_counts" as recorded in PARAMS_FILE
+    """
+    path = output_dir / PARAMS_FILE
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    Parse command-line options for the generator.
+
+    Args:
+        argv: Argument list (defaults to sys.argv[1:])
+
+    Returns:
+        argparse.Namespace: Parsed options
+    """
+    parser = argparse.ArgumentParser(
+        description="Generate a synthetic IMDb dataset for benchmarks"
+    )
+    parser.add_argument(
+        "--rows",
+        type=positive_int,
+        default=DEFAULT_ROWS,
+        help=(
+            "approximate total rows over all five files, e.g. 1000 to "
+            f"100000000 (default: {DEFAULT_ROWS})"
+        ),
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=DEFAULT_SEED,
+        help=f"random seed (default: {DEFAULT_SEED})",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=OUTPUT_DIR,
+        help=f"directory to write the TSV files to (default: {OUTPUT_DIR})",
+    )
+    parser.add_argument(
+        "--gzip",
+        action="store_true",
+        help="write .tsv.gz files, as downloaded from datasets.imdbws.com",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Main execution function."""
+    args = parse_args(argv)
+    logger.info(
+        "Generating ~%d rows (seed %d) into %s...", args.rows, args.seed, args.output
+    )
+
+    start = time.perf_counter()
+    row_counts = generate_dataset(args.output, args.rows, args.seed, args.gzip)
+    elapsed = time.perf_counter() - start
+
+    logger.info("\n=== GENERATED FILES ===")
+    for filename, row_count in row_counts.items():
+        logger.info("%-25s %12d rows", filename, row_count)
+    logger.info("Total: %d rows in %.1fs", sum(row_counts.values()), elapsed)
+
+
+if __name__ == "__main__":
+    main()
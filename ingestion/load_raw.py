@@ -5,17 +5,44 @@ Loads IMDb TSV files into PostgreSQL raw schema using COPY commands.
 Follows PEP8 standards and includes robust error handling.
 """
 
+import argparse
+import gzip
+import hashlib
+import io
 import logging
 import os
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import psycopg2
 from psycopg2 import sql
-from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
 
-from ingestion.config import DB_CONFIG
+from ingestion.engine import (
+    COPY_BUFFER_SIZE,
+    clear_table,
+    copy_server_file,
+    copy_stream,
+    get_database_connection,
+    positive_int,
+    run_concurrently,
+    table_identifier,
+    with_connection,
+)
+from ingestion.metrics import load_metrics, record_metrics
+from ingestion.validation import (
+    QUARANTINE_DIR,
+    QuarantineWriter,
+    ValidatingReader,
+    quarantine_path,
+    rules_for_file,
+)
 
 # Configure logging
 logging.basicConfig(
@@ -36,45 +63,70 @@ FILE_TABLE_MAPPING = {
 
 DATA_DIR = Path("data_lake/landing/archive")
 
+# Mounted into the database container at /data (see docker-compose.yml)
+DATA_LAKE_DIR = Path("data_lake")
 
-def table_identifier(table_name: str) -> sql.Identifier:
-    """
-    Convert a schema-qualified table name into a safely quoted identifier.
+# Natural key of each raw table, used to merge incremental loads
+TABLE_KEYS = {
+    "raw.title_basics": ("tconst",),
+    "raw.title_ratings": ("tconst",),
+    "raw.title_akas": ("titleid", "ordering"),
+    "raw.title_principals": ("tconst", "ordering"),
+    "raw.name_basics": ("nconst",),
+}
 
-    Args:
-        table_name: Table name, optionally schema-qualified (e.g. "raw.title_basics")
+# Compact column types applied by --typed. COPY then parses and casts
+# these columns itself; IMDb's \N is already read as NULL. Columns not
+# listed stay text.
+TYPED_COLUMNS = {
+    "raw.title_basics": {
+        "isadult": "boolean",
+        "startyear": "smallint",
+        "endyear": "smallint",
+        "runtimeminutes": "integer",
+    },
+    "raw.title_ratings": {"averagerating": "numeric(3,1)", "numvotes": "integer"},
+    "raw.title_akas": {"ordering": "smallint", "isoriginaltitle": "boolean"},
+    "raw.title_principals": {"ordering": "smallint"},
+    "raw.name_basics": {"birthyear": "smallint", "deathyear": "smallint"},
+}
 
-    Returns:
-        sql.Identifier: Composable identifier for use in SQL statements
+# Files are loaded serially unless --workers asks for more connections
+DEFAULT_WORKERS = 1
 
-    Raises:
-        ValueError: If the name is not "table" or "schema.table" with
-            non-empty parts
-    """
-    parts = table_name.split(".")
-    if len(parts) > 2 or not all(parts):
-        raise ValueError(f"Invalid table name: {table_name!r}")
-    return sql.Identifier(*parts)
+# Each file is a single COPY unless --chunks asks for more connections
+DEFAULT_CHUNKS = 1
 
+# Files smaller than this are always loaded with a single COPY
+CHUNK_MIN_BYTES = 256 * 1024 * 1024
 
-def get_database_connection():
-    """
-    Establish connection to PostgreSQL database.
+# Parallel workers and memory for rebuilding indexes after a bulk load
+BULK_MAINTENANCE_WORKERS = 4
+BULK_MAINTENANCE_WORK_MEM = "1GB"
 
-    Returns:
-        psycopg2.connection: Database connection object
+# Relative gap between COPY's row count and the planner's estimate
+# above which verification logs a warning
+VERIFY_ESTIMATE_TOLERANCE = 0.1
 
-    Raises:
-        psycopg2.Error: If connection fails
-    """
-    try:
-        conn = psycopg2.connect(**DB_CONFIG)
-        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
-        logger.info("Successfully connected to database")
-        return conn
-    except psycopg2.Error as e:
-        logger.error("Failed to connect to database: %s", e)
-        raise
+# Fingerprint of the last successful load of each raw table; also
+# created by sql/raw_schema.sql so a schema reset forgets every load
+MANIFEST_TABLE = "raw._load_manifest"
+
+# Byte ranges of a file committed so far by a checkpointed load
+# (--resume); also created by sql/raw_schema.sql
+PROGRESS_TABLE = "raw._load_progress"
+
+# Constraints and indexes a bulk load has dropped and not yet rebuilt,
+# restored by the next run if the loader dies in between; also created
+# by sql/raw_schema.sql
+DROPPED_INDEXES_TABLE = "raw._dropped_indexes"
+
+# Data per checkpoint of a checkpointed load, which commits each chunk
+# with its progress entry; a crash loses at most the chunks in flight
+CHECKPOINT_BYTES = 64 * 1024 * 1024
+
+# Definitions of the raw tables, applied by create_raw_schema
+RAW_SCHEMA_SQL = Path(__file__).resolve().parent.parent / "sql" / "raw_schema.sql"
 
 
 def check_file_exists(file_path: Path) -> bool:
@@ -98,39 +150,76 @@ def check_file_exists(file_path: Path) -> bool:
     return True
 
 
-def clear_table(cursor, table_name: str) -> None:
+def file_size(file_path: Path) -> int:
     """
-    Clear existing data from table before loading.
+    Return the size of a file in bytes, or 0 if it cannot be read.
 
     Args:
-        cursor: Database cursor
-        table_name: Name of table to clear
+        file_path: Path to the file
+
+    Returns:
+        int: File size in bytes
     """
     try:
-        cursor.execute(
-            sql.SQL("TRUNCATE TABLE {table}").format(table=table_identifier(table_name))
-        )
-        logger.info("Cleared existing data from %s", table_name)
-    except psycopg2.Error as e:
-        logger.error("Failed to clear table %s: %s", table_name, e)
-        raise
-
-
-def load_tsv_file(cursor, file_path: Path, table_name: str) -> int:
+        return file_path.stat().st_size
+    except OSError:
+        return 0
+
+
+def load_tsv_file(
+    cursor,
+    file_path: Path,
+    table_name: str,
+    chunks: int = DEFAULT_CHUNKS,
+    stream: bool = False,
+    validate: bool = False,
+    scan: Optional[Dict[str, Any]] = None,
+) -> int:
     """
     Load TSV file into database table using COPY command.
 
+    By default the server reads the file itself (server-side COPY),
+    which requires the file to be visible on the database host. With
+    ``stream`` the file is read locally and sent with COPY FROM STDIN
+    instead, so no shared filesystem is needed; gzip-compressed
+    ``.tsv.gz`` files are always streamed and decompressed on the fly.
+    Uncompressed files of at least CHUNK_MIN_BYTES are split into
+    ``chunks`` parallel COPY streams when ``chunks`` is greater than one
+    (see load_tsv_file_chunked). With ``validate`` every line is checked
+    on the client before it is sent, malformed lines are written to the
+    quarantine instead of failing the COPY, and the file is streamed.
+    streams_whole_file tells which loads go through a single stream.
+
     Args:
         cursor: Database cursor
         file_path: Path to TSV file
         table_name: Target database table
+        chunks: Number of parallel COPY streams for large files
+        stream: Send the file from the client instead of a server-side COPY
+        validate: Quarantine malformed lines instead of loading them
+        scan: Receives the file's "content_hash" and "line_count" (see
+            scan_file), computed from the bytes COPY read, when the
+            whole file is streamed
 
     Returns:
         int: Number of rows loaded
 
     Raises:
         psycopg2.Error: If COPY command fails
+        ValueError: If a streamed load does not match the file's line count
     """
+    if streams_whole_file(file_path, chunks, stream, validate):
+        if chunks > 1 and file_size(file_path) >= CHUNK_MIN_BYTES:
+            logger.info("%s is compressed; loading as a single stream", file_path.name)
+        return stream_tsv_file(
+            cursor, file_path, table_name, validate=validate, scan=scan
+        )
+
+    if chunks > 1 and file_size(file_path) >= CHUNK_MIN_BYTES:
+        return load_tsv_file_chunked(
+            cursor, file_path, table_name, chunks, validate=validate
+        )
+
     # Detect if running in CI or Docker environment
     is_ci = os.environ.get("GITHUB_ACTIONS") == "true"
 
@@ -140,19 +229,10 @@ def load_tsv_file(cursor, file_path: Path, table_name: str) -> int:
         container_path = str(file_path.resolve())
     else:
         # Docker environment: use mounted volume path
-        container_path = f"/data/landing/archive/{file_path.name}"
-
-    copy_sql = sql.SQL(
-        "COPY {table} FROM {path} "
-        "WITH (FORMAT text, DELIMITER E'\\t', NULL '\\N', HEADER true)"
-    ).format(
-        table=table_identifier(table_name),
-        path=sql.Literal(container_path),
-    )
+        container_path = container_file_path(file_path)
 
     try:
-        cursor.execute(copy_sql)
-        row_count = cursor.rowcount
+        row_count = copy_server_file(cursor, container_path, table_name)
         logger.info("Loaded %d rows into %s", row_count, table_name)
         return row_count
     except psycopg2.Error as e:
@@ -160,123 +240,2046 @@ def load_tsv_file(cursor, file_path: Path, table_name: str) -> int:
         raise
 
 
-def verify_data_load(cursor, table_name: str) -> Dict[str, int]:
+def streams_whole_file(
+    file_path: Path, chunks: int, stream: bool, validate: bool
+) -> bool:
     """
-    Verify data was loaded correctly by checking row count.
+    Whether load_tsv_file sends a file to COPY through a single stream.
+
+    Uncompressed files large enough to be split into chunks are not;
+    otherwise streaming, validation and compression all stream the file.
 
     Args:
-        cursor: Database cursor
-        table_name: Table to verify
+        file_path: Path to TSV file
+        chunks: Number of parallel COPY streams for large files
+        stream: Send the file from the client instead of a server-side COPY
+        validate: Quarantine malformed lines instead of loading them
+
+    Returns:
+        bool: True if the client reads the whole file in one stream
+    """
+    is_gzip = file_path.suffix == ".gz"
+    if chunks > 1 and not is_gzip and file_size(file_path) >= CHUNK_MIN_BYTES:
+        return False
+    return stream or is_gzip or validate
+
+
+class HashingReader:
+    """
+    File wrapper that feeds every byte read into a hash object.
+
+    Placed below the gzip decompressor, so a compressed file is hashed
+    as stored on disk, like scan_file does.
+    """
+
+    def __init__(self, fileobj, digest):
+        self._file = fileobj
+        self.digest = digest
+
+    def read(self, size: int = -1) -> bytes:
+        """Read up to ``size`` bytes and add them to the hash."""
+        data = self._file.read(size)
+        self.digest.update(data)
+        return data
+
+    def close(self) -> None:
+        """Close the underlying file."""
+        self._file.close()
+
+
+class TsvStreamReader:
+    """
+    Read-only file wrapper handed to COPY FROM STDIN.
+
+    Optionally stops after ``limit`` bytes so a byte range of a file
+    can be streamed, and counts newlines while streaming so the number
+    of lines sent can be compared with the number of rows COPY reports
+    without a second pass over the file.
+    """
+
+    def __init__(self, fileobj, limit: Optional[int] = None, raw=None):
+        self._file = fileobj
+        self._raw = raw
+        self._remaining = limit
+        self._last_byte = b"\n"
+        self.newline_count = 0
+
+    def read(self, size: int = -1) -> bytes:
+        """Read up to ``size`` bytes without crossing the byte limit."""
+        if self._remaining is not None:
+            if self._remaining <= 0:
+                return b""
+            if size < 0 or size > self._remaining:
+                size = self._remaining
+        data = self._file.read(size)
+        if self._remaining is not None:
+            self._remaining -= len(data)
+        if data:
+            self.newline_count += data.count(b"\n")
+            self._last_byte = data[-1:]
+        return data
+
+    @property
+    def line_count(self) -> int:
+        """Number of lines read so far, counting an unterminated last line."""
+        return self.newline_count + (self._last_byte != b"\n")
+
+    def close(self) -> None:
+        """Close the underlying file, and the file a decompressor reads."""
+        self._file.close()
+        if self._raw is not None:
+            self._raw.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def open_tsv_stream(
+    file_path: Path, start: int = 0, end: Optional[int] = None, digest=None
+) -> TsvStreamReader:
+    """
+    Open a TSV file, or a byte range of it, for COPY FROM STDIN.
+
+    Files ending in ``.gz`` are decompressed while they are read, so
+    compressed IMDb dumps never need to be extracted to disk.
+
+    Args:
+        file_path: Path to a ``.tsv`` or ``.tsv.gz`` file
+        start: First byte to read; for ``.gz`` files an offset into the
+            decompressed data, which is decompressed up to it
+        end: Byte offset to stop at, or None to read to EOF (uncompressed
+            files only)
+        digest: hashlib object updated with the bytes read from disk;
+            only meaningful when the whole file is read from offset 0
+
+    Returns:
+        TsvStreamReader: Reader positioned at ``start``
+    """
+    raw = open(file_path, "rb")
+    source = raw if digest is None else HashingReader(raw, digest)
+    if file_path.suffix == ".gz":
+        f = gzip.GzipFile(fileobj=source, mode="rb")
+        f.seek(start)
+        return TsvStreamReader(f, raw=raw)
+
+    raw.seek(start)
+    return TsvStreamReader(source, None if end is None else end - start)
+
+
+def container_file_path(file_path: Path) -> str:
+    """
+    Map a file under DATA_LAKE_DIR to its path inside the database container.
+
+    Args:
+        file_path: Local path of a file in the data lake
 
     Returns:
-        dict: Table statistics
+        str: Path of the same file below the container's /data mount
+
+    Raises:
+        ValueError: If the file is outside DATA_LAKE_DIR, so the server
+            cannot see it (load it with --stream instead)
     """
     try:
-        cursor.execute(
-            sql.SQL("SELECT COUNT(*) FROM {table}").format(
-                table=table_identifier(table_name)
-            )
+        relative = file_path.resolve().relative_to(DATA_LAKE_DIR.resolve())
+    except ValueError:
+        raise ValueError(
+            f"{file_path} is outside {DATA_LAKE_DIR}; load it with --stream"
+        ) from None
+    return f"/data/{relative.as_posix()}"
+
+
+def resolve_source_file(filename: str, data_dir: Path = DATA_DIR) -> Path:
+    """
+    Locate the file to load for a FILE_TABLE_MAPPING entry.
+
+    Prefers the extracted ``.tsv`` and falls back to the ``.tsv.gz``
+    archive as downloaded from datasets.imdbws.com.
+
+    Args:
+        filename: TSV file name inside ``data_dir``
+        data_dir: Directory holding the IMDb files
+
+    Returns:
+        Path: Existing source file, or the ``.tsv`` path if neither exists
+    """
+    file_path = data_dir / filename
+    compressed_path = data_dir / f"{filename}.gz"
+
+    if not file_path.exists() and compressed_path.exists():
+        return compressed_path
+    return file_path
+
+
+def chunk_ranges(file_path: Path, chunks: int) -> List[Tuple[int, int]]:
+    """
+    Split a file into roughly equal byte ranges aligned to line starts.
+
+    Args:
+        file_path: Path to the TSV file
+        chunks: Desired number of ranges
+
+    Returns:
+        list: (start, end) byte offsets; fewer than ``chunks`` ranges
+            are returned when the file has too few lines
+    """
+    size = file_size(file_path)
+    bounds = [0]
+
+    with open(file_path, "rb") as f:
+        for index in range(1, chunks):
+            f.seek(max(size * index // chunks, bounds[-1]))
+            # Skip to the start of the next line
+            f.readline()
+            offset = f.tell()
+            if offset >= size:
+                break
+            if offset > bounds[-1]:
+                bounds.append(offset)
+
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def data_line_count(line_count: int) -> int:
+    """
+    Number of data lines in a file with a header line.
+
+    Args:
+        line_count: Lines in the file, including the header
+
+    Returns:
+        int: Lines after the header; 0 for an empty file, which has none
+    """
+    return max(line_count - 1, 0)
+
+
+def check_row_count(file_path: Path, row_count: int, data_lines: int) -> None:
+    """
+    Ensure COPY loaded one row per data line of the file.
+
+    Args:
+        file_path: Path to the loaded file
+        row_count: Rows reported by COPY
+        data_lines: Lines streamed from the file, excluding the header
+
+    Raises:
+        ValueError: If the counts differ
+    """
+    if row_count != data_lines:
+        raise ValueError(
+            f"{file_path.name}: loaded {row_count} rows but the file has "
+            f"{data_lines} data lines"
         )
-        row_count = cursor.fetchone()[0]
 
-        # Get a sample record to verify structure
-        cursor.execute(
-            sql.SQL("SELECT * FROM {table} LIMIT 1").format(
-                table=table_identifier(table_name)
-            )
+
+def open_quarantine(file_path: Path, validate: bool) -> Optional[QuarantineWriter]:
+    """
+    Start the quarantine of a file when validation is enabled.
+
+    Args:
+        file_path: Path to the file being loaded
+        validate: Whether lines are validated before loading
+
+    Returns:
+        QuarantineWriter or None: Writer for rejected lines, if validating
+    """
+    return QuarantineWriter(quarantine_path(file_path)) if validate else None
+
+
+def rejected_count(file_path: Path, quarantine: Optional[QuarantineWriter]) -> int:
+    """
+    Close a file's quarantine and report how many lines it rejected.
+
+    Args:
+        file_path: Path to the loaded file
+        quarantine: Writer returned by open_quarantine
+
+    Returns:
+        int: Number of rejected lines, 0 without validation
+    """
+    if quarantine is None:
+        return 0
+    quarantine.close()
+    if quarantine.count:
+        logger.warning(
+            "Quarantined %d malformed lines of %s in %s",
+            quarantine.count,
+            file_path.name,
+            quarantine.path,
         )
-        sample_row = cursor.fetchone()
+    return quarantine.count
+
+
+def stream_tsv_file(
+    cursor,
+    file_path: Path,
+    table_name: str,
+    validate: bool = False,
+    scan: Optional[Dict[str, Any]] = None,
+) -> int:
+    """
+    Load a whole TSV or TSV.GZ file with a single COPY FROM STDIN.
+
+    Args:
+        cursor: Database cursor
+        file_path: Path to TSV file
+        table_name: Target database table
+        validate: Quarantine malformed lines instead of loading them
+        scan: Receives the file's "content_hash" and "line_count",
+            computed from the bytes COPY read, so scan_file is not needed
 
-        return {
-            "row_count": row_count,
-            "has_data": sample_row is not None,
-        }
+    Returns:
+        int: Number of rows loaded
+
+    Raises:
+        ValueError: If the rows loaded do not match the data lines in the file
+        psycopg2.Error: If COPY command fails
+    """
+    quarantine = open_quarantine(file_path, validate)
+    digest = None if scan is None else hashlib.sha256()
+    try:
+        with open_tsv_stream(file_path, digest=digest) as reader:
+            source = reader
+            if quarantine is not None:
+                source = ValidatingReader(
+                    reader, rules_for_file(file_path), quarantine, header=True
+                )
+            row_count = copy_stream(cursor, source, table_name, header=True)
     except psycopg2.Error as e:
-        logger.error("Failed to verify %s: %s", table_name, e)
-        return {"row_count": 0, "has_data": False}
+        logger.error("Failed to load %s into %s: %s", file_path.name, table_name, e)
+        raise
+    finally:
+        rejected = rejected_count(file_path, quarantine)
+
+    check_row_count(file_path, row_count, data_line_count(reader.line_count) - rejected)
+    if scan is not None:
+        scan["content_hash"] = digest.hexdigest()
+        scan["line_count"] = reader.line_count
+    logger.info("Streamed %d rows into %s", row_count, table_name)
+    return row_count
 
 
-def load_all_files() -> Dict[str, bool]:
+def load_tsv_file_chunked(
+    cursor, file_path: Path, table_name: str, chunks: int, validate: bool = False
+) -> int:
     """
-    Load all IMDb TSV files into the database.
+    Load one TSV file as several concurrent COPY streams.
+
+    The file is split into newline-aligned byte ranges. The first range
+    is copied on ``cursor``; every other range gets its own connection,
+    so the chunks are parsed by separate server backends in parallel.
+    Only the range at offset 0 contains the header line, so only that
+    range is copied with HEADER true. With ``validate`` each chunk is
+    validated by its own thread into a shared quarantine; line numbers
+    are only known for the first chunk, the rest record byte offsets.
+
+    Args:
+        cursor: Database cursor, used for the first chunk
+        file_path: Path to an uncompressed TSV file
+        table_name: Target database table
+        chunks: Number of chunks to split the file into
+        validate: Quarantine malformed lines instead of loading them
 
     Returns:
-        dict: Results of each file load attempt
+        int: Number of rows loaded
+
+    Raises:
+        ValueError: If the rows loaded do not match the data lines in the file
+        psycopg2.Error: If any chunk's COPY fails
     """
-    results = {}
+    ranges = chunk_ranges(file_path, chunks)
+    quarantine = open_quarantine(file_path, validate)
+
+    def copy_chunk(chunk_cursor, start: int, end: int) -> Tuple[int, int]:
+        with open_tsv_stream(file_path, start, end) as reader:
+            source = reader
+            if quarantine is not None:
+                source = ValidatingReader(
+                    reader,
+                    rules_for_file(file_path),
+                    quarantine,
+                    header=start == 0,
+                    start_offset=start,
+                    first_line=1 if start == 0 else None,
+                )
+            rows = copy_stream(chunk_cursor, source, table_name, header=start == 0)
+            return rows, reader.line_count
+
+    (first_start, first_end), *other_ranges = ranges
+    tasks = [partial(copy_chunk, cursor, first_start, first_end)] + [
+        partial(with_connection, copy_chunk, start, end) for start, end in other_ranges
+    ]
 
     try:
-        conn = get_database_connection()
-        cursor = conn.cursor()
+        counts = run_concurrently(tasks, workers=len(tasks), name="chunk")
+    except psycopg2.Error as e:
+        logger.error("Failed to load %s into %s: %s", file_path.name, table_name, e)
+        raise
+    finally:
+        rejected = rejected_count(file_path, quarantine)
 
-        for filename, table_name in FILE_TABLE_MAPPING.items():
-            file_path = DATA_DIR / filename
+    row_count = sum(rows for rows, _ in counts)
+    # One line of the first chunk is the header
+    data_lines = data_line_count(sum(lines for _, lines in counts)) - rejected
+    check_row_count(file_path, row_count, data_lines)
 
-            logger.info("Processing %s -> %s", filename, table_name)
+    logger.info(
+        "Loaded %d rows into %s in %d chunks", row_count, table_name, len(ranges)
+    )
+    return row_count
 
-            # Check if file exists
-            if not check_file_exists(file_path):
-                results[filename] = False
-                continue
 
-            try:
-                # Clear existing data
-                clear_table(cursor, table_name)
+def line_chunks(reader, chunk_bytes: int) -> Iterator[bytes]:
+    """
+    Split a stream into consecutive blocks of whole lines.
 
-                # Load new data
-                load_tsv_file(cursor, file_path, table_name)
+    Each block ends at the last line end within its first
+    ``chunk_bytes`` bytes, or extends to the end of a line that is
+    longer than that.
 
-                # Verify load
-                stats = verify_data_load(cursor, table_name)
+    Args:
+        reader: File-like object positioned at a line start
+        chunk_bytes: Target block size
 
-                if stats["row_count"] > 0:
-                    logger.info(
-                        "Successfully loaded %s: %d rows",
-                        filename,
-                        stats["row_count"],
-                    )
-                    results[filename] = True
-                else:
-                    logger.warning("No data found in %s after load", table_name)
-                    results[filename] = False
+    Yields:
+        bytes: Blocks that together make up the rest of the stream
+    """
+    buffer = b""
+    target = chunk_bytes
+    eof = False
+    while buffer or not eof:
+        while not eof and len(buffer) < target:
+            data = reader.read(target - len(buffer))
+            eof = not data
+            buffer += data
+        cut = len(buffer) if eof else buffer.rfind(b"\n") + 1
+        if cut == 0:
+            # A single line longer than a chunk
+            target += chunk_bytes
+            continue
+        yield buffer[:cut]
+        buffer = buffer[cut:]
+        target = chunk_bytes
+
+
+def copy_checkpoint(
+    cursor,
+    reader: TsvStreamReader,
+    file_path: Path,
+    table_name: str,
+    fingerprint: Dict[str, Any],
+    start: int,
+    end: int,
+) -> int:
+    """
+    Copy one byte range of a file and record it in PROGRESS_TABLE.
 
-            except Exception as e:
-                logger.error("Failed to load %s: %s", filename, e)
-                results[filename] = False
+    The rows and the progress entry are committed in one transaction, so
+    a range is either loaded and recorded or neither, and a resumed load
+    never copies a committed range twice.
 
-        cursor.close()
-        conn.close()
+    Args:
+        cursor: Database cursor
+        reader: Stream of exactly the bytes from ``start`` to ``end``
+        file_path: Path to the source file
+        table_name: Target database table
+        fingerprint: Metadata fingerprint of the file (see file_fingerprint)
+        start: Offset of the range in the (uncompressed) file
+        end: Offset just past the range
 
-    except Exception as e:
-        logger.error("Database operation failed: %s", e)
-        return {filename: False for filename in FILE_TABLE_MAPPING.keys()}
+    Returns:
+        int: Number of rows loaded
 
-    return results
+    Raises:
+        ValueError: If the rows loaded do not match the lines of the range
+        psycopg2.Error: If COPY fails
+    """
+    header = start == 0
+    cursor.execute("BEGIN")
+    try:
+        with reader:
+            row_count = copy_stream(cursor, reader, table_name, header=header)
+        check_row_count(file_path, row_count, reader.line_count - header)
+        cursor.execute(
+            sql.SQL(
+                "INSERT INTO {progress} (table_name, file_name, file_size, "
+                "file_mtime, start_offset, end_offset, row_count) "
+                "VALUES (%s, %s, %s, %s, %s, %s, %s)"
+            ).format(progress=table_identifier(PROGRESS_TABLE)),
+            (
+                table_name,
+                fingerprint["file_name"],
+                fingerprint["file_size"],
+                fingerprint["file_mtime"],
+                start,
+                end,
+                row_count,
+            ),
+        )
+        cursor.execute("COMMIT")
+    except Exception:
+        cursor.execute("ROLLBACK")
+        raise
+    return row_count
 
 
-def main():
-    """Main execution function."""
-    logger.info("Starting IMDb data loading process...")
+def load_tsv_file_checkpointed(
+    cursor,
+    file_path: Path,
+    table_name: str,
+    fingerprint: Dict[str, Any],
+    chunks: int = DEFAULT_CHUNKS,
+    typed: bool = False,
+) -> int:
+    """
+    Load a file in checkpointed chunks, resuming an interrupted load.
 
-    # Check if data directory exists
-    if not DATA_DIR.exists():
-        logger.error("Data directory not found: %s", DATA_DIR)
-        sys.exit(1)
+    The file is streamed in chunks of about CHECKPOINT_BYTES, each
+    committed together with its entry in PROGRESS_TABLE (see
+    copy_checkpoint). Ranges committed by an earlier, interrupted load
+    of the same file are kept and skipped; otherwise, or if the file
+    has changed since, the table is truncated and loaded from the start.
 
-    # Load all files
-    results = load_all_files()
+    Uncompressed files are split into fixed, newline-aligned ranges
+    that are copied on up to ``chunks`` connections at once, and any
+    ranges still missing are loaded on resume. ``.tsv.gz`` files are
+    loaded sequentially on ``cursor`` and resume after the last
+    committed range, decompressing up to it.
 
-    # Print summary
-    logger.info("\n=== LOADING SUMMARY ===")
-    successful_loads = sum(results.values())
-    total_files = len(results)
+    Args:
+        cursor: Database cursor
+        file_path: Path to TSV file
+        table_name: Target database table
+        fingerprint: Metadata fingerprint of the file (see file_fingerprint)
+        chunks: Number of ranges copied concurrently (uncompressed files)
+        typed: Convert the table to TYPED_COLUMNS when starting afresh
+
+    Returns:
+        int: Rows in the table, including those of earlier attempts
+
+    Raises:
+        ValueError: If the rows of a range do not match its lines
+        psycopg2.Error: If a COPY fails
+    """
+    is_gzip = file_path.suffix == ".gz"
+    committed = committed_ranges(cursor, table_name, fingerprint)
+
+    # Committed ranges are usable if they continue the load of this file
+    if is_gzip:
+        # Sequential loads commit their ranges back to back from offset 0
+        ends = [0] + [end for _, end in committed]
+        resumable = all(start == ends[i] for i, (start, _) in enumerate(committed))
+    else:
+        checkpoints = -(-file_size(file_path) // CHECKPOINT_BYTES)
+        ranges = chunk_ranges(file_path, max(checkpoints, 1))
+        resumable = set(committed).issubset(ranges)
+
+    if committed and resumable:
+        logger.info(
+            "Resuming %s: %d chunk(s) already loaded into %s",
+            file_path.name,
+            len(committed),
+            table_name,
+        )
+    else:
+        if committed:
+            logger.warning(
+                "Progress of %s does not match its chunks; starting over",
+                file_path.name,
+            )
+        forget_progress(cursor, table_name)
+        clear_table(cursor, table_name)
+        if typed:
+            apply_typed_columns(cursor, table_name)
+        committed = []
+
+    if is_gzip:
+        offset = committed[-1][1] if committed else 0
+        with open_tsv_stream(file_path, offset) as reader:
+            for chunk in line_chunks(reader, CHECKPOINT_BYTES):
+                end = offset + len(chunk)
+                copy_checkpoint(
+                    cursor,
+                    TsvStreamReader(io.BytesIO(chunk)),
+                    file_path,
+                    table_name,
+                    fingerprint,
+                    offset,
+                    end,
+                )
+                offset = end
+    else:
+
+        def copy_range(range_cursor, start: int, end: int) -> int:
+            return copy_checkpoint(
+                range_cursor,
+                open_tsv_stream(file_path, start, end),
+                file_path,
+                table_name,
+                fingerprint,
+                start,
+                end,
+            )
 
-    for filename, success in results.items():
-        status = "SUCCESS" if success else "FAILED"
-        logger.info("%-25s %s", filename, status)
+        done = set(committed)
+        pending = [bounds for bounds in ranges if bounds not in done]
+        run_concurrently(
+            [partial(with_connection, copy_range, *bounds) for bounds in pending],
+            workers=chunks,
+            name="checkpoint",
+        )
 
+    row_count = committed_row_count(cursor, table_name)
     logger.info(
-        "Completed: %d/%d files loaded successfully", successful_loads, total_files
+        "Loaded %d rows into %s (%d chunk(s) kept from an earlier attempt)",
+        row_count,
+        table_name,
+        len(committed),
+    )
+    return row_count
+
+
+def apply_typed_columns(cursor, table_name: str) -> None:
+    """
+    Convert a raw table's columns to the compact types in TYPED_COLUMNS.
+
+    Columns that already have their target type are left alone, so this
+    is a no-op after the first typed load. Converting an empty table is
+    instant; a table holding data is rewritten once.
+
+    Args:
+        cursor: Database cursor
+        table_name: Raw table to convert
+    """
+    cursor.execute(
+        "SELECT attname, format_type(atttypid, atttypmod) FROM pg_attribute "
+        "WHERE attrelid = %s::regclass AND attnum > 0 AND NOT attisdropped",
+        (table_name,),
+    )
+    current = dict(cursor.fetchall())
+    changes = [
+        sql.SQL("ALTER COLUMN {column} TYPE {type} USING {column}::{type}").format(
+            column=sql.Identifier(column), type=sql.SQL(column_type)
+        )
+        for column, column_type in TYPED_COLUMNS[table_name].items()
+        if current.get(column) != column_type
+    ]
+    if not changes:
+        return
+
+    cursor.execute(
+        sql.SQL("ALTER TABLE {table} ").format(table=table_identifier(table_name))
+        + sql.SQL(", ").join(changes)
+    )
+    logger.info("Converted %d columns of %s to typed columns", len(changes), table_name)
+
+
+def staging_table_name(table_name: str) -> str:
+    """
+    Name of the staging table used for incremental loads of a raw table.
+
+    Args:
+        table_name: Schema-qualified raw table (e.g. "raw.title_akas")
+
+    Returns:
+        str: Staging table in the same schema (e.g. "raw._stage_title_akas")
+    """
+    schema, table = table_name.split(".")
+    return f"{schema}._stage_{table}"
+
+
+def create_staging_table(cursor, table_name: str) -> str:
+    """
+    Create an empty UNLOGGED copy of a raw table to COPY a new file into.
+
+    The staging table has the same columns but no indexes or WAL, so
+    loading it is as cheap as possible. Any leftover staging table from
+    an interrupted run is replaced.
+
+    Args:
+        cursor: Database cursor
+        table_name: Raw table to mirror
+
+    Returns:
+        str: Name of the staging table
+    """
+    staging = staging_table_name(table_name)
+    cursor.execute(
+        sql.SQL(
+            "DROP TABLE IF EXISTS {staging}; "
+            "CREATE UNLOGGED TABLE {staging} (LIKE {table} INCLUDING DEFAULTS)"
+        ).format(
+            staging=table_identifier(staging),
+            table=table_identifier(table_name),
+        )
+    )
+    return staging
+
+
+def drop_table(cursor, table_name: str) -> None:
+    """
+    Drop a table if it exists.
+
+    Args:
+        cursor: Database cursor
+        table_name: Table to drop
+    """
+    cursor.execute(
+        sql.SQL("DROP TABLE IF EXISTS {table}").format(
+            table=table_identifier(table_name)
+        )
+    )
+
+
+def table_columns(cursor, table_name: str) -> List[str]:
+    """
+    List a table's column names in ordinal order.
+
+    Args:
+        cursor: Database cursor
+        table_name: Schema-qualified table name
+
+    Returns:
+        list: Column names
+    """
+    cursor.execute(
+        "SELECT attname FROM pg_attribute "
+        "WHERE attrelid = %s::regclass AND attnum > 0 AND NOT attisdropped "
+        "ORDER BY attnum",
+        (table_name,),
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+def merge_staging_table(cursor, staging: str, table_name: str) -> Dict[str, int]:
+    """
+    Apply the differences between a staging table and its raw table.
+
+    Rows are matched on TABLE_KEYS. Keys missing from the new file are
+    deleted, keys whose row hash (md5 of the whole row) differs are
+    updated, and new keys are inserted; unchanged rows are not written.
+    All three statements run in one transaction so readers never see a
+    half-merged table.
+
+    Args:
+        cursor: Database cursor (autocommit connection)
+        staging: Staging table holding the freshly loaded file
+        table_name: Raw table to bring up to date
+
+    Returns:
+        dict: Number of rows "inserted", "updated" and "deleted"
+    """
+    keys = TABLE_KEYS[table_name]
+    columns = table_columns(cursor, table_name)
+    target = table_identifier(table_name)
+    source = table_identifier(staging)
+    key_match = sql.SQL(" AND ").join(
+        sql.SQL("s.{key} = t.{key}").format(key=sql.Identifier(key)) for key in keys
+    )
+
+    statements = {
+        "deleted": sql.SQL(
+            "DELETE FROM {target} t "
+            "WHERE NOT EXISTS (SELECT 1 FROM {source} s WHERE {key_match})"
+        ),
+        "updated": sql.SQL(
+            "UPDATE {target} t SET {assignments} FROM {source} s "
+            "WHERE {key_match} AND md5(s::text) <> md5(t::text)"
+        ),
+        "inserted": sql.SQL(
+            "INSERT INTO {target} SELECT s.* FROM {source} s "
+            "WHERE NOT EXISTS (SELECT 1 FROM {target} t WHERE {key_match})"
+        ),
+    }
+    assignments = sql.SQL(", ").join(
+        sql.SQL("{column} = s.{column}").format(column=sql.Identifier(column))
+        for column in columns
+        if column not in keys
+    )
+
+    # Planner statistics for the freshly loaded staging table
+    cursor.execute(sql.SQL("ANALYZE {source}").format(source=source))
+
+    changes = {}
+    cursor.execute("BEGIN")
+    try:
+        for action, statement in statements.items():
+            cursor.execute(
+                statement.format(
+                    target=target,
+                    source=source,
+                    key_match=key_match,
+                    assignments=assignments,
+                )
+            )
+            changes[action] = cursor.rowcount
+        cursor.execute("COMMIT")
+    except psycopg2.Error as e:
+        cursor.execute("ROLLBACK")
+        logger.error("Failed to merge %s into %s: %s", staging, table_name, e)
+        raise
+
+    logger.info(
+        "Merged %s: %d inserted, %d updated, %d deleted",
+        table_name,
+        changes["inserted"],
+        changes["updated"],
+        changes["deleted"],
+    )
+    return changes
+
+
+def create_raw_schema(cursor, reset: bool = False) -> None:
+    """
+    Create the raw tables from sql/raw_schema.sql if needed.
+
+    The script drops and recreates every raw table, so it runs when any
+    of them is missing; the manifest is recreated with the tables, so
+    every file is then reloaded.
+
+    Args:
+        cursor: Database cursor
+        reset: Drop and recreate the tables even if they exist, undoing
+            earlier --typed or --bulk loads
+    """
+    tables = [
+        *FILE_TABLE_MAPPING.values(),
+        MANIFEST_TABLE,
+        PROGRESS_TABLE,
+        DROPPED_INDEXES_TABLE,
+    ]
+    cursor.execute(
+        "SELECT table_name FROM unnest(%s::text[]) AS t(table_name) "
+        "WHERE to_regclass(table_name) IS NULL",
+        (tables,),
+    )
+    missing = [row[0] for row in cursor.fetchall()]
+    if missing:
+        logger.info("Missing raw tables: %s", ", ".join(missing))
+    if reset or missing:
+        logger.info("Creating raw tables from %s", RAW_SCHEMA_SQL.name)
+        cursor.execute(RAW_SCHEMA_SQL.read_text())
+        cursor.connection.commit()
+
+
+def ensure_manifest_table(cursor) -> None:
+    """
+    Create the load manifest table if it does not exist yet.
+
+    Args:
+        cursor: Database cursor
+    """
+    cursor.execute(
+        sql.SQL(
+            "CREATE TABLE IF NOT EXISTS {manifest} ("
+            "table_name text PRIMARY KEY, "
+            "file_name text NOT NULL, "
+            "file_size bigint NOT NULL, "
+            "file_mtime timestamptz NOT NULL, "
+            "content_hash text NOT NULL, "
+            "row_count bigint NOT NULL, "
+            "load_seconds double precision NOT NULL, "
+            "loaded_at timestamptz NOT NULL DEFAULT now())"
+        ).format(manifest=table_identifier(MANIFEST_TABLE))
+    )
+
+
+def file_fingerprint(file_path: Path) -> Dict[str, Any]:
+    """
+    Cheap fingerprint of a file from its metadata.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        dict: "file_name", "file_size" and "file_mtime" (aware datetime)
+    """
+    stat = file_path.stat()
+    return {
+        "file_name": file_path.name,
+        "file_size": stat.st_size,
+        "file_mtime": datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc),
+    }
+
+
+def hash_file(file_path: Path) -> str:
+    """
+    Compute the SHA-256 of a file's contents, reading it in blocks.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        str: Hex digest
+    """
+    with open(file_path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def scan_file(
+    file_path: Path, stop: Optional[threading.Event] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Hash a file and count its lines in a single read.
+
+    Args:
+        file_path: Path to the file
+        stop: Event that abandons the scan when set, e.g. once the load
+            it runs alongside has failed
+
+    Returns:
+        dict: "content_hash" (SHA-256 hex digest) and "line_count"
+            (lines of an uncompressed file including the header,
+            counting an unterminated last line; None for ``.gz`` files),
+            or None if the scan was stopped
+    """
+    digest = hashlib.sha256()
+    newlines = 0
+    last_byte = b"\n"
+    with open(file_path, "rb") as f:
+        while block := f.read(COPY_BUFFER_SIZE):
+            if stop is not None and stop.is_set():
+                return None
+            digest.update(block)
+            newlines += block.count(b"\n")
+            last_byte = block[-1:]
+
+    if file_path.suffix == ".gz":
+        line_count = None
+    else:
+        line_count = newlines + (last_byte != b"\n")
+    return {"content_hash": digest.hexdigest(), "line_count": line_count}
+
+
+def get_manifest_entry(cursor, table_name: str) -> Optional[Dict[str, Any]]:
+    """
+    Fetch the manifest entry of the last successful load of a table.
+
+    Args:
+        cursor: Database cursor
+        table_name: Raw table name
+
+    Returns:
+        dict: Manifest columns, or None if the table was never recorded
+    """
+    cursor.execute(
+        sql.SQL(
+            "SELECT file_name, file_size, file_mtime, content_hash "
+            "FROM {manifest} WHERE table_name = %s"
+        ).format(manifest=table_identifier(MANIFEST_TABLE)),
+        (table_name,),
+    )
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    return dict(zip(("file_name", "file_size", "file_mtime", "content_hash"), row))
+
+
+def table_has_rows(cursor, table_name: str) -> bool:
+    """
+    Check whether a table contains at least one row.
+
+    Args:
+        cursor: Database cursor
+        table_name: Table to check
+
+    Returns:
+        bool: True if the table is not empty
+    """
+    cursor.execute(
+        sql.SQL("SELECT EXISTS (SELECT 1 FROM {table})").format(
+            table=table_identifier(table_name)
+        )
+    )
+    return cursor.fetchone()[0]
+
+
+def file_unchanged(
+    cursor, file_path: Path, table_name: str, fingerprint: Dict[str, Any]
+) -> bool:
+    """
+    Decide whether a file matches the last successful load of its table.
+
+    Name and size must match, and the table must still hold data (a
+    crash can empty UNLOGGED tables, for example). A matching mtime is
+    then trusted; otherwise the file is hashed and compared, and on a
+    match the new mtime is recorded so the next run skips the hash.
+
+    Args:
+        cursor: Database cursor
+        file_path: Path to the source file
+        table_name: Raw table the file loads into
+        fingerprint: Current metadata fingerprint (see file_fingerprint)
+
+    Returns:
+        bool: True if the file does not need to be loaded again
+    """
+    previous = get_manifest_entry(cursor, table_name)
+    if (
+        previous is None
+        or previous["file_name"] != fingerprint["file_name"]
+        or previous["file_size"] != fingerprint["file_size"]
+        or not table_has_rows(cursor, table_name)
+    ):
+        return False
+
+    if previous["file_mtime"] == fingerprint["file_mtime"]:
+        return True
+
+    if hash_file(file_path) != previous["content_hash"]:
+        return False
+
+    cursor.execute(
+        sql.SQL("UPDATE {manifest} SET file_mtime = %s WHERE table_name = %s").format(
+            manifest=table_identifier(MANIFEST_TABLE)
+        ),
+        (fingerprint["file_mtime"], table_name),
+    )
+    return True
+
+
+def record_manifest_entry(
+    cursor,
+    table_name: str,
+    fingerprint: Dict[str, Any],
+    content_hash: str,
+    row_count: int,
+    load_seconds: float,
+) -> None:
+    """
+    Record a successful load in the manifest, replacing any earlier entry.
+
+    Args:
+        cursor: Database cursor
+        table_name: Raw table that was loaded
+        fingerprint: Metadata fingerprint taken before the load
+        content_hash: SHA-256 of the loaded file
+        row_count: Rows in the table after the load
+        load_seconds: Load duration in seconds
+    """
+    cursor.execute(
+        sql.SQL(
+            "INSERT INTO {manifest} (table_name, file_name, file_size, "
+            "file_mtime, content_hash, row_count, load_seconds) "
+            "VALUES (%s, %s, %s, %s, %s, %s, %s) "
+            "ON CONFLICT (table_name) DO UPDATE SET "
+            "file_name = EXCLUDED.file_name, file_size = EXCLUDED.file_size, "
+            "file_mtime = EXCLUDED.file_mtime, "
+            "content_hash = EXCLUDED.content_hash, "
+            "row_count = EXCLUDED.row_count, "
+            "load_seconds = EXCLUDED.load_seconds, loaded_at = now()"
+        ).format(manifest=table_identifier(MANIFEST_TABLE)),
+        (
+            table_name,
+            fingerprint["file_name"],
+            fingerprint["file_size"],
+            fingerprint["file_mtime"],
+            content_hash,
+            row_count,
+            load_seconds,
+        ),
+    )
+
+
+def forget_manifest_entry(cursor, table_name: str) -> None:
+    """
+    Remove a table's manifest entry before it is reloaded.
+
+    A load that fails part-way, or fails verification after COPY, then
+    leaves no entry behind, so the next run loads the file again.
+
+    Args:
+        cursor: Database cursor
+        table_name: Raw table about to be loaded
+    """
+    cursor.execute(
+        sql.SQL("DELETE FROM {manifest} WHERE table_name = %s").format(
+            manifest=table_identifier(MANIFEST_TABLE)
+        ),
+        (table_name,),
+    )
+
+
+def ensure_progress_table(cursor) -> None:
+    """
+    Create the load progress table if it does not exist yet.
+
+    Args:
+        cursor: Database cursor
+    """
+    cursor.execute(
+        sql.SQL(
+            "CREATE TABLE IF NOT EXISTS {progress} ("
+            "table_name text NOT NULL, "
+            "file_name text NOT NULL, "
+            "file_size bigint NOT NULL, "
+            "file_mtime timestamptz NOT NULL, "
+            "start_offset bigint NOT NULL, "
+            "end_offset bigint NOT NULL, "
+            "row_count bigint NOT NULL, "
+            "committed_at timestamptz NOT NULL DEFAULT now(), "
+            "PRIMARY KEY (table_name, start_offset))"
+        ).format(progress=table_identifier(PROGRESS_TABLE))
+    )
+
+
+def committed_ranges(
+    cursor, table_name: str, fingerprint: Dict[str, Any]
+) -> List[Tuple[int, int]]:
+    """
+    Byte ranges of a file already committed by a checkpointed load.
+
+    Args:
+        cursor: Database cursor
+        table_name: Raw table being loaded
+        fingerprint: Metadata fingerprint of the file (see file_fingerprint)
+
+    Returns:
+        list: (start, end) offsets in file order; empty if nothing was
+            committed or the entries belong to a different file
+    """
+    cursor.execute(
+        sql.SQL(
+            "SELECT file_name, file_size, file_mtime, start_offset, end_offset "
+            "FROM {progress} WHERE table_name = %s ORDER BY start_offset"
+        ).format(progress=table_identifier(PROGRESS_TABLE)),
+        (table_name,),
+    )
+    rows = cursor.fetchall()
+    current = (
+        fingerprint["file_name"],
+        fingerprint["file_size"],
+        fingerprint["file_mtime"],
+    )
+    if any(row[:3] != current for row in rows):
+        return []
+    return [(start, end) for *_, start, end in rows]
+
+
+def committed_row_count(cursor, table_name: str) -> int:
+    """
+    Rows loaded by the committed ranges of a checkpointed load.
+
+    Args:
+        cursor: Database cursor
+        table_name: Raw table being loaded
+
+    Returns:
+        int: Sum of the row counts recorded in PROGRESS_TABLE
+    """
+    cursor.execute(
+        sql.SQL(
+            "SELECT COALESCE(SUM(row_count), 0)::bigint FROM {progress} "
+            "WHERE table_name = %s"
+        ).format(progress=table_identifier(PROGRESS_TABLE)),
+        (table_name,),
+    )
+    return cursor.fetchone()[0]
+
+
+def forget_progress(cursor, table_name: str) -> None:
+    """
+    Remove the progress entries of a table.
+
+    Called when a load starts without --resume, since its rows no longer
+    match the recorded ranges, and once a checkpointed load completes.
+
+    Args:
+        cursor: Database cursor
+        table_name: Raw table being loaded
+    """
+    cursor.execute(
+        sql.SQL("DELETE FROM {progress} WHERE table_name = %s").format(
+            progress=table_identifier(PROGRESS_TABLE)
+        ),
+        (table_name,),
+    )
+
+
+@contextmanager
+def timed_phase(phases: Dict[str, float], name: str) -> Iterator[None]:
+    """
+    Record the wall-clock duration of a block under ``phases[name]``.
+
+    Args:
+        phases: Mapping of phase name to seconds, updated in place
+        name: Phase name
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        phases[name] = time.perf_counter() - start
+
+
+def index_definitions(cursor, table_name: str) -> List[Dict[str, Any]]:
+    """
+    Capture a table's primary key, unique constraints and indexes.
+
+    Args:
+        cursor: Database cursor
+        table_name: Schema-qualified table name
+
+    Returns:
+        list: One dict per object with "name", "constraint" (True for
+            constraints, False for plain indexes) and "definition" (the
+            constraint or CREATE INDEX definition)
+    """
+    cursor.execute(
+        "SELECT conname, true, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = %(table)s::regclass AND contype IN ('p', 'u') "
+        "UNION ALL "
+        "SELECT i.relname, false, pg_get_indexdef(i.oid) "
+        "FROM pg_index x JOIN pg_class i ON i.oid = x.indexrelid "
+        "WHERE x.indrelid = %(table)s::regclass AND NOT EXISTS "
+        "(SELECT 1 FROM pg_constraint c WHERE c.conindid = x.indexrelid)",
+        {"table": table_name},
+    )
+    return [
+        {"name": name, "constraint": constraint, "definition": definition}
+        for name, constraint, definition in cursor.fetchall()
+    ]
+
+
+def ensure_dropped_indexes_table(cursor) -> None:
+    """
+    Create the table of dropped index definitions if it does not exist yet.
+
+    Args:
+        cursor: Database cursor
+    """
+    cursor.execute(
+        sql.SQL(
+            "CREATE TABLE IF NOT EXISTS {dropped} ("
+            "table_name text NOT NULL, "
+            "name text NOT NULL, "
+            "is_constraint boolean NOT NULL, "
+            "definition text NOT NULL, "
+            "dropped_at timestamptz NOT NULL DEFAULT now(), "
+            "PRIMARY KEY (table_name, name))"
+        ).format(dropped=table_identifier(DROPPED_INDEXES_TABLE))
+    )
+
+
+def dropped_index_definitions(cursor, table_name: str) -> List[Dict[str, Any]]:
+    """
+    Constraints and indexes of a table dropped by an unfinished bulk load.
+
+    Args:
+        cursor: Database cursor
+        table_name: Schema-qualified table name
+
+    Returns:
+        list: Definitions in the format of index_definitions
+    """
+    cursor.execute(
+        sql.SQL(
+            "SELECT name, is_constraint, definition FROM {dropped} "
+            "WHERE table_name = %s ORDER BY dropped_at, name"
+        ).format(dropped=table_identifier(DROPPED_INDEXES_TABLE)),
+        (table_name,),
+    )
+    return [
+        {"name": name, "constraint": constraint, "definition": definition}
+        for name, constraint, definition in cursor.fetchall()
+    ]
+
+
+def drop_indexes(cursor, table_name: str, definitions: List[Dict[str, Any]]) -> None:
+    """
+    Drop the constraints and indexes captured by index_definitions.
+
+    The definitions are recorded in DROPPED_INDEXES_TABLE in the same
+    transaction, so they survive a crash before rebuild_indexes.
+
+    Args:
+        cursor: Database cursor (autocommit connection)
+        table_name: Schema-qualified table name
+        definitions: Objects to drop
+    """
+    schema = table_name.split(".")[0]
+    cursor.execute("BEGIN")
+    try:
+        for index in definitions:
+            cursor.execute(
+                sql.SQL(
+                    "INSERT INTO {dropped} (table_name, name, is_constraint, "
+                    "definition) VALUES (%s, %s, %s, %s) "
+                    "ON CONFLICT (table_name, name) DO NOTHING"
+                ).format(dropped=table_identifier(DROPPED_INDEXES_TABLE)),
+                (table_name, index["name"], index["constraint"], index["definition"]),
+            )
+            if index["constraint"]:
+                statement = sql.SQL(
+                    "ALTER TABLE {table} DROP CONSTRAINT {name}"
+                ).format(
+                    table=table_identifier(table_name),
+                    name=sql.Identifier(index["name"]),
+                )
+            else:
+                statement = sql.SQL("DROP INDEX {name}").format(
+                    name=sql.Identifier(schema, index["name"])
+                )
+            cursor.execute(statement)
+        cursor.execute("COMMIT")
+    except Exception:
+        cursor.execute("ROLLBACK")
+        raise
+
+
+def rebuild_indexes(cursor, table_name: str, definitions: List[Dict[str, Any]]) -> None:
+    """
+    Recreate constraints and indexes, using parallel maintenance workers.
+
+    Their entries in DROPPED_INDEXES_TABLE are removed in the same
+    transaction, so a failed rebuild leaves them for the next run.
+
+    Args:
+        cursor: Database cursor (autocommit connection)
+        table_name: Schema-qualified table name
+        definitions: Objects captured by index_definitions
+    """
+    cursor.execute("BEGIN")
+    try:
+        cursor.execute(
+            "SET LOCAL max_parallel_maintenance_workers = %s",
+            (BULK_MAINTENANCE_WORKERS,),
+        )
+        cursor.execute(
+            "SET LOCAL maintenance_work_mem = %s", (BULK_MAINTENANCE_WORK_MEM,)
+        )
+        for index in definitions:
+            if index["constraint"]:
+                statement = sql.SQL(
+                    "ALTER TABLE {table} ADD CONSTRAINT {name} "
+                ).format(
+                    table=table_identifier(table_name),
+                    name=sql.Identifier(index["name"]),
+                ) + sql.SQL(index["definition"])
+            else:
+                statement = sql.SQL(index["definition"])
+            cursor.execute(statement)
+        cursor.execute(
+            sql.SQL("DELETE FROM {dropped} WHERE table_name = %s").format(
+                dropped=table_identifier(DROPPED_INDEXES_TABLE)
+            ),
+            (table_name,),
+        )
+        cursor.execute("COMMIT")
+    except Exception:
+        cursor.execute("ROLLBACK")
+        raise
+    for index in definitions:
+        logger.info("Rebuilt %s on %s", index["name"], table_name)
+
+
+def restore_dropped_indexes(cursor) -> None:
+    """
+    Rebuild the constraints and indexes left dropped by an interrupted bulk load.
+
+    Tables whose rebuild fails (for example because the partial load
+    left duplicate keys) keep their entries; their next bulk load
+    rebuilds them along with the indexes the table still has.
+
+    Args:
+        cursor: Database cursor (autocommit connection)
+    """
+    cursor.execute(
+        sql.SQL("SELECT DISTINCT table_name FROM {dropped} ORDER BY 1").format(
+            dropped=table_identifier(DROPPED_INDEXES_TABLE)
+        )
+    )
+    for (table_name,) in cursor.fetchall():
+        definitions = dropped_index_definitions(cursor, table_name)
+        logger.warning(
+            "Restoring %d indexes of %s dropped by an interrupted bulk load",
+            len(definitions),
+            table_name,
+        )
+        try:
+            rebuild_indexes(cursor, table_name, definitions)
+        except psycopg2.Error as e:
+            logger.error("Failed to restore the indexes of %s: %s", table_name, e)
+
+
+def bulk_load_tsv_file(
+    cursor,
+    file_path: Path,
+    table_name: str,
+    chunks: int = DEFAULT_CHUNKS,
+    stream: bool = False,
+    typed: bool = False,
+    validate: bool = False,
+    scan: Optional[Dict[str, Any]] = None,
+) -> Tuple[int, Dict[str, float]]:
+    """
+    Reload a table using the fastest bulk-load settings available.
+
+    The table is truncated and switched to UNLOGGED (instant while it is
+    empty) so COPY writes no WAL, and its primary key and indexes are
+    dropped so they are not maintained row by row. After the load they
+    are rebuilt in one pass with parallel maintenance workers and the
+    table is analyzed. Indexes are rebuilt even if the COPY fails; if that
+    rebuild fails too, its error is logged and the COPY error raised. The
+    dropped definitions are kept in DROPPED_INDEXES_TABLE until they are
+    rebuilt, so a crash in between is repaired by restore_dropped_indexes
+    or the table's next bulk load.
+
+    The table stays UNLOGGED afterwards: PostgreSQL empties it after a
+    crash, and the load manifest then reloads it on the next run.
+
+    Args:
+        cursor: Database cursor
+        file_path: Path to TSV file
+        table_name: Target database table
+        chunks: Number of parallel COPY streams for large files
+        stream: Send the file from the client instead of a server-side COPY
+        typed: Convert the table to TYPED_COLUMNS before loading
+        validate: Quarantine malformed lines instead of loading them
+        scan: Receives the file's content hash and line count from a
+            streamed COPY (see load_tsv_file)
+
+    Returns:
+        tuple: Rows loaded, and seconds spent in each phase ("truncate",
+            "drop_indexes", "copy", "rebuild_indexes", "analyze")
+    """
+    phases: Dict[str, float] = {}
+    table = table_identifier(table_name)
+
+    with timed_phase(phases, "truncate"):
+        clear_table(cursor, table_name)
+        cursor.execute(sql.SQL("ALTER TABLE {table} SET UNLOGGED").format(table=table))
+        if typed:
+            apply_typed_columns(cursor, table_name)
+
+    with timed_phase(phases, "drop_indexes"):
+        existing = index_definitions(cursor, table_name)
+        drop_indexes(cursor, table_name, existing)
+        # Includes any still missing after an interrupted bulk load
+        definitions = dropped_index_definitions(cursor, table_name)
+
+    try:
+        with timed_phase(phases, "copy"):
+            row_count = load_tsv_file(
+                cursor,
+                file_path,
+                table_name,
+                chunks=chunks,
+                stream=stream,
+                validate=validate,
+                scan=scan,
+            )
+    except Exception:
+        try:
+            rebuild_indexes(cursor, table_name, definitions)
+        except Exception as e:
+            logger.error("Failed to rebuild the indexes of %s: %s", table_name, e)
+        raise
+
+    with timed_phase(phases, "rebuild_indexes"):
+        rebuild_indexes(cursor, table_name, definitions)
+
+    with timed_phase(phases, "analyze"):
+        analyze_table(cursor, table_name)
+
+    logger.info(
+        "Bulk load phases for %s: %s",
+        table_name,
+        ", ".join(f"{name} {seconds:.1f}s" for name, seconds in phases.items()),
+    )
+    return row_count, phases
+
+
+def analyze_table(cursor, table_name: str) -> None:
+    """
+    Refresh planner statistics, including the row estimate, of a table.
+
+    Args:
+        cursor: Database cursor
+        table_name: Table to analyze
+    """
+    cursor.execute(
+        sql.SQL("ANALYZE {table}").format(table=table_identifier(table_name))
+    )
+
+
+def verify_data_load(
+    cursor,
+    table_name: str,
+    row_count: int,
+    expected_rows: Optional[int] = None,
+    strict: bool = False,
+) -> Dict[str, int]:
+    """
+    Verify a load without scanning the table again.
+
+    The row count reported by COPY is compared with the data lines of
+    the source file when they are known, and with the planner's row
+    estimate from pg_class, which the preceding ANALYZE refreshed from a
+    sample of the table. A large gap to the estimate is only logged
+    since it is approximate. With ``strict`` an exact COUNT(*) must also
+    match.
+
+    Args:
+        cursor: Database cursor
+        table_name: Table to verify
+        row_count: Rows COPY loaded into the table
+        expected_rows: Data lines in the source file, or None if already
+            checked while streaming
+        strict: Also count the table's rows exactly
+
+    Returns:
+        dict: "row_count" and "estimated_rows" of the table
+
+    Raises:
+        ValueError: If the table is empty or a row count does not match
+    """
+    if expected_rows is not None and row_count != expected_rows:
+        raise ValueError(
+            f"{table_name}: loaded {row_count} rows but the file has "
+            f"{expected_rows} data lines"
+        )
+    if row_count == 0:
+        raise ValueError(f"No data found in {table_name} after load")
+
+    cursor.execute(
+        "SELECT greatest(reltuples, 0)::bigint FROM pg_class WHERE oid = %s::regclass",
+        (table_name,),
+    )
+    estimated_rows = cursor.fetchone()[0]
+    if abs(estimated_rows - row_count) > VERIFY_ESTIMATE_TOLERANCE * row_count:
+        logger.warning(
+            "%s: planner estimates %d rows after loading %d",
+            table_name,
+            estimated_rows,
+            row_count,
+        )
+
+    if strict:
+        cursor.execute(
+            sql.SQL("SELECT COUNT(*) FROM {table}").format(
+                table=table_identifier(table_name)
+            )
+        )
+        counted = cursor.fetchone()[0]
+        if counted != row_count:
+            raise ValueError(
+                f"{table_name}: loaded {row_count} rows but the table has {counted}"
+            )
+
+    return {"row_count": row_count, "estimated_rows": estimated_rows}
+
+
+def empty_load_result() -> Dict[str, Any]:
+    """
+    Outcome of a file that has not been loaded (yet).
+
+    Returns:
+        dict: Load outcome with every key load_file reports
+    """
+    return {
+        "success": False,
+        "skipped": False,
+        "row_count": 0,
+        "bytes": 0,
+        "duration": 0.0,
+        "changed": None,
+        "phases": None,
+    }
+
+
+def load_file(
+    filename: str,
+    table_name: str,
+    chunks: int = DEFAULT_CHUNKS,
+    stream: bool = False,
+    incremental: bool = False,
+    force: bool = False,
+    bulk: bool = False,
+    typed: bool = False,
+    validate: bool = False,
+    strict: bool = False,
+    resume: bool = False,
+    data_dir: Path = DATA_DIR,
+) -> Dict[str, Any]:
+    """
+    Load a single TSV file on its own database connection.
+
+    Each call opens and closes a dedicated connection so that several
+    files can be loaded concurrently from a worker pool.
+
+    Files whose fingerprint matches the last successful load recorded in
+    MANIFEST_TABLE are skipped unless ``force`` is set. The content hash
+    for the manifest is computed from the bytes COPY reads when the file
+    is streamed, and otherwise on a second thread while the server loads
+    the file. If the load fails, that thread is abandoned rather than
+    awaited.
+
+    By default the table is truncated and reloaded. With ``incremental``
+    the file is loaded into an UNLOGGED staging table instead and only
+    the rows that differ are merged into the raw table (see
+    merge_staging_table), so the write volume follows the day's churn.
+    With ``bulk`` the reload uses bulk_load_tsv_file instead. With
+    ``typed`` the raw table is first converted to TYPED_COLUMNS (after
+    truncating, for a full reload) so COPY casts the values on the way in.
+    With ``validate`` malformed lines are quarantined rather than loaded
+    (see ingestion.validation). With ``resume`` the file is loaded in
+    checkpointed chunks, and a load that was interrupted part-way is
+    continued after its last committed chunk (see
+    load_tsv_file_checkpointed).
+
+    Loads are verified from COPY's row count, the file's line count and
+    catalog statistics (see verify_data_load); ``strict`` adds an exact
+    COUNT(*) of the table.
+
+    Args:
+        filename: TSV file name inside ``data_dir``
+        table_name: Target database table
+        chunks: Number of parallel COPY streams for large files
+        stream: Send the file from the client instead of a server-side COPY
+        incremental: Merge changes instead of truncating and reloading
+        force: Load the file even if the manifest says it is unchanged
+        bulk: Reload through an UNLOGGED table with deferred indexes
+        typed: Store numeric and boolean columns with compact types
+        validate: Quarantine malformed lines instead of loading them
+        strict: Verify the load with an exact COUNT(*) of the table
+        resume: Load in checkpointed chunks, continuing an interrupted load
+        data_dir: Directory holding the IMDb files
+
+    Returns:
+        dict: Load outcome with "success", "skipped", "row_count",
+            "bytes" (size of the file read), "duration" (wall-clock
+            seconds), "changed" (rows inserted,
+            updated or deleted by an incremental load, otherwise None) and
+            "phases" (bulk load phase timings, otherwise None) keys
+    """
+    file_path = resolve_source_file(filename, data_dir)
+    result = empty_load_result()
+    start = time.perf_counter()
+
+    logger.info("Processing %s -> %s", filename, table_name)
+
+    # Check if file exists
+    if not check_file_exists(file_path):
+        return result
+
+    conn = None
+    try:
+        conn = get_database_connection()
+        cursor = conn.cursor()
+
+        # Taken before loading so a file replaced mid-load is not trusted
+        fingerprint = file_fingerprint(file_path)
+
+        if not force and file_unchanged(cursor, file_path, table_name, fingerprint):
+            logger.info("%s is unchanged since its last load; skipping", filename)
+            if typed:
+                apply_typed_columns(cursor, table_name)
+            result["success"] = True
+            result["skipped"] = True
+            cursor.close()
+            return result
+
+        forget_manifest_entry(cursor, table_name)
+        if not resume:
+            forget_progress(cursor, table_name)
+
+        # A streamed COPY hashes the bytes it reads; otherwise the file
+        # is scanned on a second thread while the server loads it
+        scan: Dict[str, Any] = {}
+        stop = threading.Event()
+        hasher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hash")
+        try:
+            background = None
+            if resume or not streams_whole_file(file_path, chunks, stream, validate):
+                background = hasher.submit(scan_file, file_path, stop)
+
+            if incremental:
+                # Typed target first, so the staging table inherits its types
+                if typed:
+                    apply_typed_columns(cursor, table_name)
+
+                # Load into a staging table and merge only the differences
+                staging = create_staging_table(cursor, table_name)
+                try:
+                    row_count = load_tsv_file(
+                        cursor,
+                        file_path,
+                        staging,
+                        chunks=chunks,
+                        stream=stream,
+                        validate=validate,
+                        scan=scan,
+                    )
+                    changes = merge_staging_table(cursor, staging, table_name)
+                finally:
+                    drop_table(cursor, staging)
+                # The merge leaves the table with exactly the staged rows
+                analyze_table(cursor, table_name)
+                result["changed"] = sum(changes.values())
+            elif bulk:
+                row_count, result["phases"] = bulk_load_tsv_file(
+                    cursor,
+                    file_path,
+                    table_name,
+                    chunks=chunks,
+                    stream=stream,
+                    typed=typed,
+                    validate=validate,
+                    scan=scan,
+                )
+            elif resume:
+                row_count = load_tsv_file_checkpointed(
+                    cursor,
+                    file_path,
+                    table_name,
+                    fingerprint,
+                    chunks=chunks,
+                    typed=typed,
+                )
+                analyze_table(cursor, table_name)
+            else:
+                # Clear existing data
+                clear_table(cursor, table_name)
+                if typed:
+                    apply_typed_columns(cursor, table_name)
+
+                # Load new data
+                row_count = load_tsv_file(
+                    cursor,
+                    file_path,
+                    table_name,
+                    chunks=chunks,
+                    stream=stream,
+                    validate=validate,
+                    scan=scan,
+                )
+                analyze_table(cursor, table_name)
+
+            if background is not None:
+                scan = background.result()
+        finally:
+            # After a failed load, abandon the scan instead of waiting for it
+            stop.set()
+            hasher.shutdown(wait=False, cancel_futures=True)
+
+        # Verify load; validated loads are checked against the file
+        # while streaming, since rejected lines are not loaded
+        line_count = scan["line_count"]
+        stats = verify_data_load(
+            cursor,
+            table_name,
+            row_count,
+            expected_rows=(
+                None if validate or line_count is None else data_line_count(line_count)
+            ),
+            strict=strict,
+        )
+
+        logger.info("Successfully loaded %s: %d rows", filename, stats["row_count"])
+        result["success"] = True
+        result["row_count"] = stats["row_count"]
+        result["bytes"] = fingerprint["file_size"]
+        record_manifest_entry(
+            cursor,
+            table_name,
+            fingerprint,
+            scan["content_hash"],
+            stats["row_count"],
+            time.perf_counter() - start,
+        )
+        if resume:
+            forget_progress(cursor, table_name)
+
+        cursor.close()
+
+    except Exception as e:
+        logger.error("Failed to load %s: %s", filename, e)
+
+    finally:
+        if conn is not None:
+            conn.close()
+        result["duration"] = time.perf_counter() - start
+
+    return result
+
+
+def load_all_files(
+    workers: int = DEFAULT_WORKERS,
+    chunks: int = DEFAULT_CHUNKS,
+    stream: bool = False,
+    incremental: bool = False,
+    force: bool = False,
+    bulk: bool = False,
+    typed: bool = False,
+    validate: bool = False,
+    strict: bool = False,
+    resume: bool = False,
+    data_dir: Path = DATA_DIR,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Load all IMDb TSV files into the database.
+
+    Files are handed to a pool of ``workers`` threads, each loading one
+    file on its own connection. The largest files are submitted first
+    so the longest COPY starts immediately and total wall time tends
+    towards the time of the largest file. Large files can additionally
+    be split into ``chunks`` COPY streams, so up to workers * chunks
+    connections may be open at once.
+
+    Args:
+        workers: Number of files to load concurrently
+        chunks: Number of parallel COPY streams for large files
+        stream: Send files from the client instead of server-side COPY
+        incremental: Merge changes instead of truncating and reloading
+        force: Reload files even if the manifest says they are unchanged
+        bulk: Reload through UNLOGGED tables with deferred indexes
+        typed: Store numeric and boolean columns with compact types
+        validate: Quarantine malformed lines instead of loading them
+        strict: Verify each load with an exact COUNT(*) of the table
+        resume: Load in checkpointed chunks, continuing interrupted loads
+        data_dir: Directory holding the IMDb files
+
+    Returns:
+        dict: Load outcome of each file, keyed by file name (see load_file)
+    """
+    try:
+        with_connection(ensure_manifest_table)
+        with_connection(ensure_progress_table)
+        with_connection(ensure_dropped_indexes_table)
+        with_connection(restore_dropped_indexes)
+    except Exception as e:
+        logger.error("Database operation failed: %s", e)
+        return {filename: empty_load_result() for filename in FILE_TABLE_MAPPING}
+
+    ordered = sorted(
+        FILE_TABLE_MAPPING.items(),
+        key=lambda item: file_size(resolve_source_file(item[0], data_dir)),
+        reverse=True,
+    )
+
+    results = run_concurrently(
+        [
+            partial(
+                load_file,
+                filename,
+                table_name,
+                chunks=chunks,
+                stream=stream,
+                incremental=incremental,
+                force=force,
+                bulk=bulk,
+                typed=typed,
+                validate=validate,
+                strict=strict,
+                resume=resume,
+                data_dir=data_dir,
+            )
+            for filename, table_name in ordered
+        ],
+        workers=workers,
+        name="load",
+    )
+    by_file = {filename: result for (filename, _), result in zip(ordered, results)}
+    return {filename: by_file[filename] for filename in FILE_TABLE_MAPPING}
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    Parse command-line options for the loader.
+
+    Args:
+        argv: Argument list (defaults to sys.argv[1:])
+
+    Returns:
+        argparse.Namespace: Parsed options
+    """
+    parser = argparse.ArgumentParser(description="Load IMDb TSV files into PostgreSQL")
+    parser.add_argument(
+        "--workers",
+        type=positive_int,
+        default=DEFAULT_WORKERS,
+        help=(
+            "number of files to load in parallel, each on its own connection "
+            f"(default: {DEFAULT_WORKERS})"
+        ),
+    )
+    parser.add_argument(
+        "--chunks",
+        type=positive_int,
+        default=DEFAULT_CHUNKS,
+        help=(
+            "split files of at least "
+            f"{CHUNK_MIN_BYTES // (1024 * 1024)} MiB into this many "
+            f"concurrent COPY streams (default: {DEFAULT_CHUNKS})"
+        ),
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help=(
+            "send files from this machine with COPY FROM STDIN instead of a "
+            "server-side COPY, so the database needs no access to the files "
+            "(.tsv.gz files are always streamed)"
+        ),
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--incremental",
+        action="store_true",
+        help=(
+            "merge each file into its raw table by key, writing only inserted, "
+            "changed and deleted rows, instead of truncating and reloading"
+        ),
+    )
+    mode.add_argument(
+        "--bulk",
+        action="store_true",
+        help=(
+            "reload into UNLOGGED tables with primary keys and indexes dropped "
+            "during COPY and rebuilt in parallel afterwards, then ANALYZE"
+        ),
+    )
+    mode.add_argument(
+        "--resume",
+        action="store_true",
+        help=(
+            "load each file in checkpointed chunks of "
+            f"{CHECKPOINT_BYTES // (1024 * 1024)} MiB, committed with their "
+            f"byte range in {PROGRESS_TABLE}, and continue an interrupted load "
+            "after its last committed chunk (implies --stream)"
+        ),
+    )
+    parser.add_argument(
+        "--typed",
+        action="store_true",
+        help=(
+            "store integer, boolean and numeric raw columns with compact types "
+            "instead of text, letting COPY parse them during the load"
+        ),
+    )
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        help=(
+            "check column counts, IDs and numeric fields before loading and "
+            f"write malformed lines to {QUARANTINE_DIR} instead of failing "
+            "the COPY (implies --stream)"
+        ),
+    )
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help=(
+            "verify each load with an exact COUNT(*) of the table in addition "
+            "to COPY's row count and the catalog's row estimate"
+        ),
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help=(
+            "load every file even if it matches its last successful load in "
+            f"{MANIFEST_TABLE}"
+        ),
+    )
+    parser.add_argument(
+        "--data-dir",
+        type=Path,
+        default=DATA_DIR,
+        help=(
+            "directory holding the IMDb files; server-side COPY needs it "
+            f"inside {DATA_LAKE_DIR}/ (default: {DATA_DIR})"
+        ),
+    )
+    args = parser.parse_args(argv)
+    if args.resume and args.validate:
+        parser.error("--validate cannot be combined with --resume")
+    return args
+
+
+def main(argv=None):
+    """Main execution function."""
+    args = parse_args(argv)
+    logger.info("Starting IMDb data loading process...")
+
+    # Check if data directory exists
+    if not args.data_dir.exists():
+        logger.error("Data directory not found: %s", args.data_dir)
+        sys.exit(1)
+
+    # Load all files
+    start = time.perf_counter()
+    results = load_all_files(
+        workers=args.workers,
+        chunks=args.chunks,
+        stream=args.stream,
+        incremental=args.incremental,
+        force=args.force,
+        bulk=args.bulk,
+        typed=args.typed,
+        validate=args.validate,
+        strict=args.strict,
+        resume=args.resume,
+        data_dir=args.data_dir,
+    )
+    elapsed = time.perf_counter() - start
+    record_metrics(load_metrics(results))
+
+    # Print summary
+    logger.info("\n=== LOADING SUMMARY ===")
+    successful_loads = sum(result["success"] for result in results.values())
+    total_files = len(results)
+
+    for filename, result in results.items():
+        if result["skipped"]:
+            status = "SKIPPED"
+        else:
+            status = "SUCCESS" if result["success"] else "FAILED"
+        changed = result["changed"]
+        duration = result["duration"]
+        if result["success"] and not result["skipped"] and duration > 0:
+            rates = (
+                f" {result['row_count'] / duration:12,.0f} rows/s"
+                f" {result['bytes'] / duration / (1024 * 1024):8.1f} MiB/s"
+            )
+        else:
+            rates = ""
+        logger.info(
+            "%-25s %-8s %12d rows %9.1fs%s%s",
+            filename,
+            status,
+            result["row_count"],
+            duration,
+            rates,
+            "" if changed is None else f" {changed:12d} changed",
+        )
+
+    phased = {name: result for name, result in results.items() if result["phases"]}
+    if phased:
+        logger.info("\n=== BULK LOAD PHASES (seconds) ===")
+        for filename, result in phased.items():
+            logger.info(
+                "%-25s %s",
+                filename,
+                "  ".join(
+                    f"{name} {seconds:.1f}"
+                    for name, seconds in result["phases"].items()
+                ),
+            )
+
+    logger.info(
+        "Completed: %d/%d files loaded successfully", successful_loads, total_files
+    )
+    logger.info(
+        "Wall time: %.1fs with %d worker(s) (sum of file times: %.1fs)",
+        elapsed,
+        args.workers,
+        sum(result["duration"] for result in results.values()),
     )
 
     if successful_loads == total_files:
@@ -0,0 +1,595 @@
+"""
+Pipeline run metrics and reports.
+
+Every pipeline step records how long it took, and how many rows and
+bytes it processed, against the run named by the PIPELINE_RUN_ID
+environment variable. Records are appended as JSON lines to
+``<REPORTS_DIR>/<run id>/metrics.jsonl``, so the loader, each dbt
+invocation and the dashboard can add to the same run from separate
+processes. Nothing is recorded when no run is active.
+
+Steps are timed with the ``time`` command, which also picks up per-model
+and per-test timings from dbt's run_results.json. ``finish`` writes the
+run's records as report.json and report.csv and stores them in
+METRICS_TABLE, so stage times can be tracked across runs:
+
+    export PIPELINE_RUN_ID=$(date -u +%Y%m%dT%H%M%SZ)
+    python -m ingestion.metrics time load -- python ingestion/load_raw.py
+    python -m ingestion.metrics time staging \\
+        --dbt-results target/run_results.json -- dbt run --select staging
+    python -m ingestion.metrics finish
+"""
+
+import argparse
+import csv
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from psycopg2 import sql
+
+from ingestion.engine import table_identifier, with_connection
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler(sys.stdout)],
+)
+logger = logging.getLogger(__name__)
+
+RUN_ID_VAR = "PIPELINE_RUN_ID"
+
+REPORTS_DIR = Path(os.environ.get("PIPELINE_REPORTS_DIR", "data_lake/reports"))
+
+RECORDS_FILE = "metrics.jsonl"
+
+METRICS_TABLE = "raw._pipeline_metrics"
+
+# Columns of a metric record, in report and table order. kind is one of
+# "run" (one pipeline invocation, start to end), "stage" (a whole
+# pipeline step), "file" (a loaded file), a dbt resource type such as
+# "model" or "test", "query" or "render".
+FIELDS = (
+    "run_id",
+    "recorded_at",
+    "kind",
+    "stage",
+    "name",
+    "status",
+    "seconds",
+    "rows",
+    "bytes",
+)
+
+# Records listed individually in the summary, slowest first
+SUMMARY_TOP = 10
+
+_write_lock = threading.Lock()
+
+
+def new_run_id() -> str:
+    """Run ID for a run starting now, e.g. 20250101T120000Z."""
+    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def current_run_id() -> Optional[str]:
+    """ID of the active run from PIPELINE_RUN_ID, or None."""
+    return os.environ.get(RUN_ID_VAR) or None
+
+
+def run_dir(run_id: str) -> Path:
+    """Directory holding the records and reports of a run."""
+    return REPORTS_DIR / run_id
+
+
+def metric(
+    kind: str,
+    stage: str,
+    name: str,
+    seconds: float,
+    rows: Optional[int] = None,
+    bytes_: Optional[int] = None,
+    status: str = "success",
+) -> Dict[str, Any]:
+    """
+    Build one metric record.
+
+    Args:
+        kind: What was measured ("stage", "file", "model", "query", ...)
+        stage: Pipeline stage the record belongs to
+        name: File, model, query or stage name
+        seconds: Wall-clock duration
+        rows: Rows processed, if known
+        bytes_: Bytes processed, if known
+        status: Outcome, e.g. "success", "skipped" or "failed"
+
+    Returns:
+        dict: Record with every FIELDS key except run_id
+    """
+    return {
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
+        "kind": kind,
+        "stage": stage,
+        "name": name,
+        "status": status,
+        "seconds": seconds,
+        "rows": rows,
+        "bytes": bytes_,
+    }
+
+
+def record_metrics(
+    records: Iterable[Dict[str, Any]], run_id: Optional[str] = None
+) -> bool:
+    """
+    Append records to a run, by default the active one.
+
+    All records go out in a single append, so concurrent writers from
+    other threads or processes never interleave within a record.
+
+    Args:
+        records: Records built with metric()
+        run_id: Run to record against (default: PIPELINE_RUN_ID)
+
+    Returns:
+        bool: False if no run is active and nothing was recorded
+    """
+    run_id = run_id or current_run_id()
+    if run_id is None:
+        return False
+    lines = "".join(
+        json.dumps({"run_id": run_id, **record}) + "\n" for record in records
+    )
+    directory = run_dir(run_id)
+    with _write_lock:
+        directory.mkdir(parents=True, exist_ok=True)
+        with open(directory / RECORDS_FILE, "a", encoding="utf-8") as f:
+            f.write(lines)
+    return True
+
+
+def read_metrics(run_id: str) -> List[Dict[str, Any]]:
+    """
+    Read all records of a run.
+
+    Args:
+        run_id: Run ID
+
+    Returns:
+        list: Records in the order they were recorded
+    """
+    path = run_dir(run_id) / RECORDS_FILE
+    if not path.exists():
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def load_metrics(results: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Metric records of a loader run.
+
+    Args:
+        results: Outcome per file name, as returned by load_all_files
+
+    Returns:
+        list: One "file" record per file
+    """
+    records = []
+    for filename, result in results.items():
+        if result["skipped"]:
+            status = "skipped"
+        else:
+            status = "success" if result["success"] else "failed"
+        records.append(
+            metric(
+                "file",
+                "load",
+                filename,
+                result["duration"],
+                rows=result["row_count"],
+                bytes_=result.get("bytes"),
+                status=status,
+            )
+        )
+    return records
+
+
+def dbt_metrics(stage: str, run_results_path: Path) -> List[Dict[str, Any]]:
+    """
+    Metric records of the nodes in a dbt run_results.json.
+
+    Models report the rows their statement affected and tests the number
+    of failing rows.
+
+    Args:
+        stage: Pipeline stage the dbt invocation belongs to
+        run_results_path: Path to target/run_results.json
+
+    Returns:
+        list: One record per node, of kind "model", "test", "seed", ...
+    """
+    run_results = json.loads(run_results_path.read_text())
+    records = []
+    for result in run_results["results"]:
+        # resource_type.package.name, plus a hash suffix for tests
+        kind, _, name = result["unique_id"].split(".")[:3]
+        if kind == "test":
+            rows = result.get("failures")
+        else:
+            rows = (result.get("adapter_response") or {}).get("rows_affected")
+        records.append(
+            metric(
+                kind,
+                stage,
+                name,
+                result["execution_time"],
+                rows=rows,
+                status=result["status"],
+            )
+        )
+    return records
+
+
+def query_metrics(timings, stage: str = "dashboard") -> List[Dict[str, Any]]:
+    """
+    Metric records of query timings.
+
+    Args:
+        timings: (name, seconds, rows) tuples, e.g. QUERY_TIMINGS of the
+            dashboard
+        stage: Pipeline stage the queries belong to
+
+    Returns:
+        list: One "query" record per timing
+    """
+    return [
+        metric("query", stage, name, seconds, rows=rows)
+        for name, seconds, rows in timings
+    ]
+
+
+def with_rates(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Add rows_per_second and bytes_per_second to a record."""
+    seconds = record["seconds"]
+    rates = {}
+    for field in ("rows", "bytes"):
+        value = record.get(field)
+        rates[f"{field}_per_second"] = value / seconds if value and seconds else None
+    return {**record, **rates}
+
+
+def stage_totals(records: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Combine the stage records of a run per stage.
+
+    A stage is recorded once per attempt, so a run continued with
+    ``--resume`` can hold several records of the same stage.
+
+    Args:
+        records: Records of the run
+
+    Returns:
+        dict: Per stage, in order of first attempt: "seconds" summed
+            over all attempts, the number of "attempts" and the "status"
+            of the last attempt
+    """
+    totals: Dict[str, Dict[str, Any]] = {}
+    for record in records:
+        if record["kind"] != "stage":
+            continue
+        total = totals.setdefault(
+            record["stage"], {"seconds": 0.0, "attempts": 0, "status": None}
+        )
+        total["seconds"] += record["seconds"]
+        total["attempts"] += 1
+        total["status"] = record["status"]
+    return totals
+
+
+def wall_seconds(records: List[Dict[str, Any]]) -> float:
+    """
+    Wall time of a run.
+
+    Stages may run concurrently, so this is not the sum of their times.
+    It is the total of the "run" records, one per pipeline invocation
+    from its start to its end. Runs timed stage by stage with the
+    ``time`` command have no run record; their wall time is the time
+    covered by at least one stage, so gaps between invocations (e.g.
+    before a resumed stage) are not counted.
+
+    Args:
+        records: Records of the run
+
+    Returns:
+        float: Wall-clock seconds
+    """
+    runs = [record["seconds"] for record in records if record["kind"] == "run"]
+    if runs:
+        return sum(runs)
+
+    intervals = sorted(
+        (end - record["seconds"], end)
+        for record in records
+        if record["kind"] == "stage"
+        for end in [datetime.fromisoformat(record["recorded_at"]).timestamp()]
+    )
+    total = 0.0
+    covered_until = float("-inf")
+    for start, end in intervals:
+        start = max(start, covered_until)
+        if end > start:
+            total += end - start
+            covered_until = end
+    return total
+
+
+def write_report(run_id: str, records: List[Dict[str, Any]]) -> Dict[str, Path]:
+    """
+    Write a run's records as report.json and report.csv.
+
+    Args:
+        run_id: Run ID
+        records: Records of the run
+
+    Returns:
+        dict: Paths of the "json" and "csv" reports
+    """
+    directory = run_dir(run_id)
+    directory.mkdir(parents=True, exist_ok=True)
+    rows = [with_rates(record) for record in records]
+    stages = stage_totals(records)
+
+    json_path = directory / "report.json"
+    json_path.write_text(
+        json.dumps(
+            {
+                "run_id": run_id,
+                "stages": stages,
+                "total_seconds": wall_seconds(records),
+                "stage_seconds": sum(stage["seconds"] for stage in stages.values()),
+                "records": rows,
+            },
+            indent=2,
+        )
+        + "\n"
+    )
+
+    csv_path = directory / "report.csv"
+    columns = [*FIELDS, "rows_per_second", "bytes_per_second"]
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+    return {"json": json_path, "csv": csv_path}
+
+
+def ensure_metrics_table(cursor) -> None:
+    """
+    Create the metrics table if it does not exist yet.
+
+    Args:
+        cursor: Database cursor
+    """
+    cursor.execute(
+        sql.SQL(
+            "CREATE TABLE IF NOT EXISTS {metrics} ("
+            "run_id text NOT NULL, "
+            "recorded_at timestamptz NOT NULL, "
+            "kind text NOT NULL, "
+            "stage text NOT NULL, "
+            "name text NOT NULL, "
+            "status text NOT NULL, "
+            "seconds double precision NOT NULL, "
+            "rows bigint, "
+            "bytes bigint)"
+        ).format(metrics=table_identifier(METRICS_TABLE))
+    )
+    cursor.execute(
+        sql.SQL(
+            "CREATE INDEX IF NOT EXISTS {index} ON {metrics} (kind, stage, name)"
+        ).format(
+            index=sql.Identifier("_pipeline_metrics_kind_stage_name_idx"),
+            metrics=table_identifier(METRICS_TABLE),
+        )
+    )
+
+
+def save_metrics(cursor, run_id: str, records: List[Dict[str, Any]]) -> None:
+    """
+    Store a run's records in METRICS_TABLE, replacing any saved earlier.
+
+    Args:
+        cursor: Database cursor
+        run_id: Run ID
+        records: Records of the run
+    """
+    ensure_metrics_table(cursor)
+    metrics = table_identifier(METRICS_TABLE)
+    cursor.execute("BEGIN")
+    try:
+        cursor.execute(
+            sql.SQL("DELETE FROM {metrics} WHERE run_id = %s").format(metrics=metrics),
+            (run_id,),
+        )
+        cursor.executemany(
+            sql.SQL("INSERT INTO {metrics} ({columns}) VALUES ({values})").format(
+                metrics=metrics,
+                columns=sql.SQL(", ").join(map(sql.Identifier, FIELDS)),
+                values=sql.SQL(", ").join(sql.Placeholder() * len(FIELDS)),
+            ),
+            [tuple(record[field] for field in FIELDS) for record in records],
+        )
+        cursor.execute("COMMIT")
+    except Exception:
+        cursor.execute("ROLLBACK")
+        raise
+
+
+def log_summary(records: List[Dict[str, Any]]) -> None:
+    """Log stage times and the slowest files, models, tests and queries."""
+    total = wall_seconds(records)
+
+    # Shares are of the wall time; concurrent stages overlap, so they can
+    # add up to more than 100%
+    logger.info("\n=== PIPELINE STAGES ===")
+    for stage, totals in stage_totals(records).items():
+        share = totals["seconds"] / total if total else 0.0
+        logger.info(
+            "%-20s %-8s %9.1fs %5.1f%% of wall time%s",
+            stage,
+            totals["status"].upper(),
+            totals["seconds"],
+            100 * share,
+            f" ({totals['attempts']} attempts)" if totals["attempts"] > 1 else "",
+        )
+    logger.info("Wall time: %.1fs", total)
+
+    steps = sorted(
+        (record for record in records if record["kind"] not in ("run", "stage")),
+        key=lambda record: -record["seconds"],
+    )
+    if steps:
+        logger.info("\n=== SLOWEST STEPS ===")
+        for record in map(with_rates, steps[:SUMMARY_TOP]):
+            rate = record["rows_per_second"]
+            logger.info(
+                "%-10s %-8s %-40s %9.2fs%s",
+                record["stage"],
+                record["kind"],
+                record["name"],
+                record["seconds"],
+                "" if rate is None else f" {rate:12,.0f} rows/s",
+            )
+
+
+def time_command(
+    stage: str, command: List[str], dbt_results: Optional[Path] = None
+) -> int:
+    """
+    Run a command as a pipeline stage and record its wall time.
+
+    Args:
+        stage: Stage name
+        command: Command and arguments
+        dbt_results: run_results.json written by the command, if it runs
+            dbt; its per-node timings are recorded too
+
+    Returns:
+        int: Exit status of the command
+    """
+    started_at = time.time()
+    start = time.perf_counter()
+    returncode = subprocess.run(command).returncode
+    seconds = time.perf_counter() - start
+
+    records = [
+        metric(
+            "stage",
+            stage,
+            stage,
+            seconds,
+            status="success" if returncode == 0 else "failed",
+        )
+    ]
+    # Only results written by this command, not left over from another
+    if dbt_results is not None and dbt_results.exists():
+        if dbt_results.stat().st_mtime >= started_at:
+            records.extend(dbt_metrics(stage, dbt_results))
+    if not record_metrics(records):
+        logger.warning("%s is not set; %s was not recorded", RUN_ID_VAR, stage)
+    return returncode
+
+
+def finish_run(run_id: str, save: bool = True) -> Optional[Dict[str, Path]]:
+    """
+    Write the reports of a run and save its records to the database.
+
+    Args:
+        run_id: Run ID
+        save: Also store the records in METRICS_TABLE
+
+    Returns:
+        dict: Paths of the reports, or None if the run has no records
+    """
+    records = read_metrics(run_id)
+    if not records:
+        logger.warning("No metrics recorded for run %s", run_id)
+        return None
+
+    log_summary(records)
+    paths = write_report(run_id, records)
+    logger.info("Report written to %s and %s", paths["json"], paths["csv"])
+    if save:
+        with_connection(save_metrics, run_id, records)
+        logger.info("Saved %d metrics to %s", len(records), METRICS_TABLE)
+    return paths
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    Parse command-line options.
+
+    Args:
+        argv: Argument list (defaults to sys.argv[1:])
+
+    Returns:
+        argparse.Namespace: Parsed options
+    """
+    parser = argparse.ArgumentParser(description="Record and report pipeline metrics")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    timer = commands.add_parser("time", help="run a command as a timed stage")
+    timer.add_argument("stage", help="stage name, e.g. load or staging")
+    timer.add_argument(
+        "--dbt-results",
+        type=Path,
+        help="run_results.json the command writes, to record per-node timings",
+    )
+
+    finish = commands.add_parser("finish", help="write the run report")
+    finish.add_argument(
+        "--run-id",
+        default=current_run_id(),
+        help=f"run to report on (default: ${RUN_ID_VAR})",
+    )
+    finish.add_argument(
+        "--no-save",
+        action="store_true",
+        help=f"only write the report files, not {METRICS_TABLE}",
+    )
+
+    # The timed command follows "--" and keeps its own options
+    argv = list(sys.argv[1:] if argv is None else argv)
+    command = []
+    if "--" in argv:
+        split = argv.index("--")
+        argv, command = argv[:split], argv[split + 1 :]
+
+    args = parser.parse_args(argv)
+    args.args = command
+    if args.command == "time":
+        if not command:
+            parser.error("time: no command given after --")
+    elif args.run_id is None:
+        parser.error(f"finish: set {RUN_ID_VAR} or pass --run-id")
+    return args
+
+
+def main(argv=None):
+    """Main execution function."""
+    args = parse_args(argv)
+    if args.command == "time":
+        sys.exit(time_command(args.stage, args.args, args.dbt_results))
+    finish_run(args.run_id, save=not args.no_save)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,546 @@
+"""
+Movie Analytics Pipeline Orchestrator
+
+Runs the pipeline as a graph of stages, each started as soon as the
+stages it depends on have succeeded:
+
+    schema -> load ----------\\
+                               transform -> export, test, docs
+    deps   -> parse ---------/
+
+The raw files load concurrently while dbt installs its packages and
+parses the project. One ``dbt run`` then builds staging and marts
+together, so dbt's threads start each model as soon as its upstream
+models are built, and the Parquet export, the test suite and the
+documentation all run side by side once the models exist. Total time
+tends towards the critical path rather than the sum of the stages.
+
+dbt runs in-process and the project is parsed once; the parsed manifest
+is reused by every later invocation. dbt keeps global state while it
+runs, so in-process invocations are serialized and ``dbt docs
+generate``, which overlaps with the tests, runs in a subprocess.
+
+Every stage is timed into the run report (see ingestion/metrics.py).
+Completed stages are recorded in STATE_FILE: ``--resume`` picks up a
+failed run where it stopped, and ``--from STAGE`` reruns one stage and
+everything downstream of it.
+"""
+
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from dbt.cli.main import dbtRunner
+from psycopg2 import sql
+
+from analytics.export_parquet import EXPORT_TABLES, export_all_tables
+from ingestion import metrics as run_metrics
+from ingestion.engine import positive_int, table_identifier, with_connection
+from ingestion.load_raw import (
+    DATA_DIR,
+    DEFAULT_CHUNKS,
+    FILE_TABLE_MAPPING,
+    create_raw_schema,
+    load_all_files,
+)
+
+# Importing dbt installs a root handler of its own, so replace it
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler(sys.stdout)],
+    force=True,
+)
+logger = logging.getLogger(__name__)
+
+PROJECT_DIR = Path(__file__).resolve().parent
+DBT_DIR = PROJECT_DIR / "dbt" / "movie_analytics"
+
+# run_results.json of the test suite goes here, so it never races with
+# the documentation written to target/ at the same time
+TEST_TARGET_PATH = DBT_DIR / "target" / "test"
+
+# Run ID and completed stages of the latest run, for --resume
+STATE_FILE = run_metrics.REPORTS_DIR / "pipeline_state.json"
+
+# Each raw file loads on its own connection
+DEFAULT_LOAD_WORKERS = len(FILE_TABLE_MAPPING)
+
+# Marts whose row counts are shown at the end of a run
+SUMMARY_TABLES = {
+    "Movies/TV Shows": "staging_marts.dim_titles",
+    "People": "staging_marts.dim_people",
+    "Ratings": "staging_marts.fact_ratings",
+}
+
+
+class DbtSession:
+    """
+    In-process dbt for one project, parsed once.
+
+    The first invocation that needs the project parses it; every later
+    one reuses the parsed manifest instead of parsing again.
+    """
+
+    def __init__(self, project_dir: Path, target: Optional[str] = None):
+        self.project_dir = project_dir
+        self.target = target
+        self.manifest = None
+        self._lock = threading.Lock()
+
+    def arguments(self, command: List[str], target_path: Optional[Path] = None):
+        """Command-line arguments for a dbt command on this project."""
+        args = [
+            *command,
+            "--project-dir",
+            str(self.project_dir),
+            "--profiles-dir",
+            str(self.project_dir),
+        ]
+        if self.target is not None:
+            args += ["--target", self.target]
+        if target_path is not None:
+            args += ["--target-path", str(target_path)]
+        return args
+
+    def _invoke(self, command: List[str], target_path: Optional[Path] = None):
+        result = dbtRunner(manifest=self.manifest).invoke(
+            self.arguments(command, target_path)
+        )
+        if result.exception is not None:
+            raise RuntimeError(
+                f"dbt {' '.join(command)} failed: {result.exception}"
+            ) from result.exception
+        return result
+
+    def parse(self) -> None:
+        """Parse the project, unless it has been parsed already."""
+        with self._lock:
+            if self.manifest is None:
+                result = self._invoke(["parse"])
+                if not result.success:
+                    raise RuntimeError("dbt parse failed")
+                self.manifest = result.result
+
+    def deps(self) -> None:
+        """Install the packages listed in packages.yml."""
+        with self._lock:
+            if not self._invoke(["deps", "--quiet"]).success:
+                raise RuntimeError("dbt deps failed")
+
+    def invoke(
+        self, stage: str, command: List[str], target_path: Optional[Path] = None
+    ) -> None:
+        """
+        Run a dbt command that executes nodes and record their timings.
+
+        Args:
+            stage: Pipeline stage the per-node records belong to
+            command: dbt command and selection, e.g. ["run", "--select", "marts"]
+            target_path: Directory for run_results.json (default: target/)
+
+        Raises:
+            RuntimeError: If dbt errors or any node fails
+        """
+        self.parse()
+        run_results = (target_path or self.project_dir / "target") / "run_results.json"
+        with self._lock:
+            started_at = time.time()
+            result = self._invoke(command, target_path)
+        if run_results.exists() and run_results.stat().st_mtime >= started_at:
+            run_metrics.record_metrics(run_metrics.dbt_metrics(stage, run_results))
+        if not result.success:
+            raise RuntimeError(f"dbt {command[0]} reported failures")
+
+
+def stage_schema(options: argparse.Namespace, dbt: DbtSession) -> None:
+    """Create the raw tables if they do not exist yet."""
+    with_connection(create_raw_schema)
+
+
+def stage_load(options: argparse.Namespace, dbt: DbtSession) -> None:
+    """Load new or changed raw files, each on its own connection."""
+    results = load_all_files(
+        workers=options.workers,
+        chunks=options.chunks,
+        stream=options.stream,
+        incremental=options.incremental,
+        force=options.force_load,
+        bulk=options.bulk,
+        typed=options.typed,
+        validate=options.validate,
+        strict=options.strict,
+        resume=options.checkpoint,
+        data_dir=options.data_dir,
+    )
+    run_metrics.record_metrics(run_metrics.load_metrics(results))
+    failed = [name for name, result in results.items() if not result["success"]]
+    if failed:
+        raise RuntimeError(f"Raw load failed for {', '.join(failed)}")
+
+
+def stage_deps(options: argparse.Namespace, dbt: DbtSession) -> None:
+    """Install dbt packages."""
+    dbt.deps()
+
+
+def stage_parse(options: argparse.Namespace, dbt: DbtSession) -> None:
+    """Parse the dbt project once for every later dbt stage."""
+    dbt.parse()
+
+
+def stage_transform(options: argparse.Namespace, dbt: DbtSession) -> None:
+    """Build the staging and marts models in one dbt run."""
+    dbt.invoke("transform", ["run", "--select", "staging", "marts"])
+
+
+def stage_export(options: argparse.Namespace, dbt: DbtSession) -> None:
+    """Export changed marts to Parquet."""
+    results = export_all_tables(list(EXPORT_TABLES))
+    failed = [name for name, result in results.items() if not result["success"]]
+    if failed:
+        raise RuntimeError(f"Parquet export failed for {', '.join(failed)}")
+
+
+def stage_test(options: argparse.Namespace, dbt: DbtSession) -> None:
+    """Run the data quality tests of the staging and marts models."""
+    dbt.invoke("test", ["test"], target_path=TEST_TARGET_PATH)
+
+
+def stage_docs(options: argparse.Namespace, dbt: DbtSession) -> None:
+    """
+    Generate the documentation site.
+
+    Runs in a subprocess so it overlaps with the in-process test suite;
+    dbt's partial parsing lets it reuse the parse done by the parse stage.
+    The subprocess uses this interpreter, so it gets the same dbt
+    installation whether or not ``dbt`` is on PATH.
+    """
+    command = [
+        sys.executable,
+        "-m",
+        "dbt.cli.main",
+        *dbt.arguments(["docs", "generate", "--quiet"]),
+    ]
+    if subprocess.run(command, cwd=dbt.project_dir).returncode != 0:
+        raise RuntimeError("dbt docs generate failed")
+
+
+# Stage function and the stages it waits for; every stage is listed
+# after its dependencies
+STAGES: Dict[str, Tuple[Callable[[argparse.Namespace, DbtSession], None], Tuple]] = {
+    "schema": (stage_schema, ()),
+    "load": (stage_load, ("schema",)),
+    "deps": (stage_deps, ()),
+    "parse": (stage_parse, ("deps",)),
+    "transform": (stage_transform, ("load", "parse")),
+    "export": (stage_export, ("transform",)),
+    "test": (stage_test, ("transform",)),
+    "docs": (stage_docs, ("transform",)),
+}
+
+# Stages whose failure is reported without failing the run; failing data
+# quality tests do not stop the pipeline
+NON_FATAL_STAGES = {"test"}
+
+# Outcomes that let downstream stages start
+DONE = {"success", "reused"}
+
+
+def downstream_stages(stage: str) -> Set[str]:
+    """A stage and every stage that depends on it, directly or not."""
+    found = {stage}
+    for name, (_, dependencies) in STAGES.items():
+        if found.intersection(dependencies):
+            found.add(name)
+    return found
+
+
+def critical_path(seconds: Dict[str, float]) -> Tuple[float, List[str]]:
+    """
+    Longest chain of dependent stages by wall time.
+
+    Args:
+        seconds: Wall time of each stage that ran
+
+    Returns:
+        tuple: Total seconds of the chain and its stages, in order
+    """
+    longest: Dict[str, Tuple[float, List[str]]] = {}
+    for name, (_, dependencies) in STAGES.items():
+        before = max(
+            (longest[dependency] for dependency in dependencies),
+            default=(0.0, []),
+        )
+        if name in seconds:
+            longest[name] = (before[0] + seconds[name], [*before[1], name])
+        else:
+            longest[name] = before
+    return max(longest.values(), default=(0.0, []))
+
+
+def read_state() -> Optional[Dict]:
+    """Run ID and completed stages of the latest run, if any."""
+    if not STATE_FILE.exists():
+        return None
+    return json.loads(STATE_FILE.read_text())
+
+
+def write_state(run_id: str, completed: Set[str]) -> None:
+    """Record the stages of a run that have completed so far."""
+    STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    state = {"run_id": run_id, "completed": sorted(completed, key=list(STAGES).index)}
+    STATE_FILE.write_text(json.dumps(state, indent=2) + "\n")
+
+
+def run_stages(
+    options: argparse.Namespace, dbt: DbtSession, run_id: str, reused: Set[str]
+) -> Dict[str, Dict]:
+    """
+    Run the stage graph, each stage as soon as its dependencies are done.
+
+    Args:
+        options: Parsed command-line options
+        dbt: dbt session shared by the dbt stages
+        run_id: Run the stage timings are recorded against
+        reused: Stages completed earlier and not run again
+
+    Returns:
+        dict: "status" and "seconds" per stage; status is "success",
+            "failed", "skipped" (a dependency failed) or "reused"
+    """
+    outcomes: Dict[str, Dict] = {
+        name: {"status": "reused", "seconds": 0.0} for name in reused
+    }
+    completed = set(reused)
+    state_lock = threading.Lock()
+
+    def run(name: str) -> Dict:
+        logger.info("Starting stage %s", name)
+        start = time.perf_counter()
+        try:
+            STAGES[name][0](options, dbt)
+            status = "success"
+        except Exception as e:
+            logger.error("Stage %s failed: %s", name, e)
+            status = "failed"
+        seconds = time.perf_counter() - start
+        logger.info("Finished stage %s (%s) in %.1fs", name, status.upper(), seconds)
+        run_metrics.record_metrics(
+            [run_metrics.metric("stage", name, name, seconds, status=status)]
+        )
+        if status == "success":
+            with state_lock:
+                completed.add(name)
+                write_state(run_id, completed)
+        return {"status": status, "seconds": seconds}
+
+    write_state(run_id, completed)
+    pending = [name for name in STAGES if name not in reused]
+    running = {}
+    with ThreadPoolExecutor(
+        max_workers=len(STAGES), thread_name_prefix="stage"
+    ) as pool:
+        while pending or running:
+            for name in list(pending):
+                statuses = [
+                    outcomes.get(dependency, {}).get("status")
+                    for dependency in STAGES[name][1]
+                ]
+                if any(status in ("failed", "skipped") for status in statuses):
+                    logger.warning("Skipping stage %s: a dependency failed", name)
+                    outcomes[name] = {"status": "skipped", "seconds": 0.0}
+                    run_metrics.record_metrics(
+                        [run_metrics.metric("stage", name, name, 0.0, status="skipped")]
+                    )
+                    pending.remove(name)
+                elif all(status in DONE for status in statuses):
+                    running[pool.submit(run, name)] = name
+                    pending.remove(name)
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                outcomes[running.pop(future)] = future.result()
+
+    return {name: outcomes[name] for name in STAGES}
+
+
+def count_rows(cursor) -> Dict[str, int]:
+    """Row count of each SUMMARY_TABLES mart."""
+    counts = {}
+    for label, table_name in SUMMARY_TABLES.items():
+        cursor.execute(
+            sql.SQL("SELECT COUNT(*) FROM {table}").format(
+                table=table_identifier(table_name)
+            )
+        )
+        counts[label] = cursor.fetchone()[0]
+    return counts
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    Parse command-line options for the pipeline.
+
+    Args:
+        argv: Argument list (defaults to sys.argv[1:])
+
+    Returns:
+        argparse.Namespace: Parsed options
+    """
+    parser = argparse.ArgumentParser(
+        description="Run the movie analytics pipeline as a graph of stages"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="continue the latest run, skipping the stages it completed",
+    )
+    parser.add_argument(
+        "--from",
+        dest="from_stage",
+        choices=list(STAGES),
+        help="run only this stage and the stages downstream of it",
+    )
+    parser.add_argument(
+        "--target",
+        help="dbt target from profiles.yml (default: the profile's target)",
+    )
+    parser.add_argument(
+        "--data-dir",
+        type=Path,
+        default=DATA_DIR,
+        help=f"directory holding the IMDb files (default: {DATA_DIR})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=positive_int,
+        default=DEFAULT_LOAD_WORKERS,
+        help=f"files to load in parallel (default: {DEFAULT_LOAD_WORKERS})",
+    )
+    parser.add_argument(
+        "--chunks",
+        type=positive_int,
+        default=DEFAULT_CHUNKS,
+        help=f"loader --chunks (default: {DEFAULT_CHUNKS})",
+    )
+    parser.add_argument("--stream", action="store_true", help="loader --stream")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--incremental", action="store_true", help="loader --incremental")
+    mode.add_argument("--bulk", action="store_true", help="loader --bulk")
+    mode.add_argument(
+        "--checkpoint",
+        action="store_true",
+        help=(
+            "load in checkpointed chunks (loader --resume), so a rerun with "
+            "--resume continues an interrupted file after its last chunk"
+        ),
+    )
+    parser.add_argument("--typed", action="store_true", help="loader --typed")
+    parser.add_argument("--validate", action="store_true", help="loader --validate")
+    parser.add_argument("--strict", action="store_true", help="loader --strict")
+    parser.add_argument(
+        "--force-load",
+        action="store_true",
+        help="reload every raw file even if it is unchanged",
+    )
+    args = parser.parse_args(argv)
+    if args.checkpoint and args.validate:
+        parser.error("--validate cannot be combined with --checkpoint")
+    return args
+
+
+def main(argv=None):
+    """Main execution function."""
+    args = parse_args(argv)
+
+    state = read_state() if args.resume else None
+    if args.resume and state is None:
+        logger.warning("No earlier run to resume; running every stage")
+    reused = set(state["completed"]) if state else set()
+    if args.from_stage is not None:
+        reused = set(STAGES) - downstream_stages(args.from_stage)
+
+    run_id = state["run_id"] if state else run_metrics.current_run_id()
+    run_id = run_id or run_metrics.new_run_id()
+    os.environ[run_metrics.RUN_ID_VAR] = run_id
+    logger.info("Movie Analytics pipeline run %s starting...", run_id)
+    if reused:
+        logger.info("Reusing completed stages: %s", ", ".join(sorted(reused)))
+
+    start = time.perf_counter()
+    outcomes = run_stages(args, DbtSession(DBT_DIR, args.target), run_id, reused)
+    elapsed = time.perf_counter() - start
+
+    logger.info("\n=== PIPELINE SUMMARY ===")
+    for name, outcome in outcomes.items():
+        logger.info(
+            "%-12s %-8s %9.1fs", name, outcome["status"].upper(), outcome["seconds"]
+        )
+    path_seconds, path = critical_path(
+        {
+            name: outcome["seconds"]
+            for name, outcome in outcomes.items()
+            if outcome["status"] in ("success", "failed")
+        }
+    )
+    logger.info(
+        "Wall time: %.1fs (critical path %.1fs: %s; sum of stages %.1fs)",
+        elapsed,
+        path_seconds,
+        " -> ".join(path),
+        sum(outcome["seconds"] for outcome in outcomes.values()),
+    )
+
+    failed = [
+        name
+        for name, outcome in outcomes.items()
+        if outcome["status"] in ("failed", "skipped") and name not in NON_FATAL_STAGES
+    ]
+
+    # Stage and per-model timings, written to data_lake/reports/<run id>/
+    # and saved to raw._pipeline_metrics for trends across runs. The run
+    # record holds this invocation's wall time; a resumed run adds one
+    # per invocation.
+    run_metrics.record_metrics(
+        [
+            run_metrics.metric(
+                "run",
+                "pipeline",
+                run_id,
+                elapsed,
+                status="failed" if failed else "success",
+            )
+        ]
+    )
+    try:
+        run_metrics.finish_run(run_id)
+    except Exception as e:
+        logger.error("Failed to save the run report: %s", e)
+
+    if failed:
+        logger.error(
+            "Pipeline failed at: %s. Rerun with --resume to continue.",
+            ", ".join(failed),
+        )
+        sys.exit(1)
+    if outcomes["test"]["status"] == "failed":
+        logger.warning("Some data quality tests failed. Check logs above.")
+
+    logger.info("\nFinal Data Summary:")
+    for label, count in with_connection(count_rows).items():
+        logger.info("- %s: %d records", label, count)
+    logger.info("Movie Analytics pipeline completed successfully!")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,7 +10,6 @@ echo "=============================================="
 
 # Configuration
 PROJECT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
-DBT_DIR="$PROJECT_DIR/dbt/movie_analytics"
 VENV_DIR="$PROJECT_DIR/.venv"
 
 # Run everything from the repo root so docker compose, uv, and the
@@ -76,84 +75,18 @@ source "$VENV_DIR/bin/activate" 2>/dev/null || source "$VENV_DIR/Scripts/activat
 
 print_success "Python environment ready"
 
-# Step 3: Load Raw Data
-print_step 3 "Loading Raw Data"
+# Step 3: Run the pipeline stages
+print_step 3 "Running Pipeline Stages"
 
-echo "Checking if raw data needs to be loaded..."
-DATA_COUNT=$(docker compose exec -T postgres psql -U postgres -d analytics -t -c "SELECT COUNT(*) FROM raw.title_basics;" 2>/dev/null | tr -d ' ' || echo "0")
-
-if [ "$DATA_COUNT" == "0" ] || [ -z "$DATA_COUNT" ]; then
-    print_warning "Raw data not found. Loading IMDb datasets..."
-
-    # Create raw schema if it doesn't exist
-    docker compose exec -T postgres psql -U postgres -d analytics -f /sql/raw_schema.sql
-
-    # Load raw data
-    python ingestion/load_raw.py
-
-    print_success "Raw data loaded successfully"
-else
-    print_success "Raw data already loaded ($DATA_COUNT title records found)"
+# run_pipeline.py loads the raw files, builds and tests the dbt models,
+# exports the marts and generates the docs as a graph of concurrent
+# stages, timing each into a run report. Options are passed through,
+# e.g. --resume to continue a failed run or --from transform.
+if ! python run_pipeline.py "$@"; then
+    print_error "Pipeline failed. Check the stage summary above."
+    exit 1
 fi
 
-# Step 4: Install dbt Dependencies
-print_step 4 "Installing dbt Dependencies"
-
-cd "$DBT_DIR"
-dbt deps --quiet
-print_success "dbt dependencies installed"
-
-# Step 5: Run dbt Models
-print_step 5 "Running dbt Transformations"
-
-echo "Building staging models..."
-dbt run --select staging --quiet
-
-echo "Building marts models..."
-dbt run --select marts --quiet
-
-print_success "dbt models built successfully"
-
-# Step 6: Run Data Quality Tests
-print_step 6 "Running Data Quality Tests"
-
-echo "Running staging tests..."
-STAGING_RESULTS=$(dbt test --select staging 2>&1 | grep "Done\." || echo "Tests completed")
-echo "$STAGING_RESULTS"
-
-echo "Running marts tests..."
-MARTS_RESULTS=$(dbt test --select marts 2>&1 | grep "Done\." || echo "Tests completed")
-echo "$MARTS_RESULTS"
-
-echo "Running custom business logic tests..."
-CUSTOM_RESULTS=$(dbt test --select test_type:generic 2>&1 | grep "Done\." || echo "Tests completed")
-echo "$CUSTOM_RESULTS"
-
-print_success "Data quality tests completed"
-
-# Step 7: Generate Documentation
-print_step 7 "Generating Documentation"
-
-dbt docs generate --quiet
-print_success "Documentation generated (run 'uv run dbt docs serve' to view)"
-
-# Step 8: Pipeline Summary
-echo ""
-echo "Pipeline Execution Complete!"
-echo "================================"
-
-# Get final record counts
-echo "Final Data Summary:"
-echo "----------------------"
-
-TITLES_COUNT=$(docker compose exec -T postgres psql -U postgres -d analytics -t -c "SELECT COUNT(*) FROM staging_marts.dim_titles;" | tr -d ' ')
-PEOPLE_COUNT=$(docker compose exec -T postgres psql -U postgres -d analytics -t -c "SELECT COUNT(*) FROM staging_marts.dim_people;" | tr -d ' ')
-RATINGS_COUNT=$(docker compose exec -T postgres psql -U postgres -d analytics -t -c "SELECT COUNT(*) FROM staging_marts.fact_ratings;" | tr -d ' ')
-
-echo "- Movies/TV Shows: $TITLES_COUNT records"
-echo "- People: $PEOPLE_COUNT records"
-echo "- Ratings: $RATINGS_COUNT records"
-
 echo ""
 echo "Next Steps:"
 echo "- View documentation: cd dbt/movie_analytics && uv run dbt docs serve"
@@ -64,3 +64,50 @@ CREATE TABLE raw.name_basics (
     -- comma-separated
     knownForTitles text -- comma-separated tconsts
 );
+
+-- load manifest: fingerprint of the last successful load of each
+-- table, used by ingestion/load_raw.py to skip unchanged files
+DROP TABLE IF EXISTS raw._load_manifest;
+
+CREATE TABLE raw._load_manifest (
+    table_name text PRIMARY KEY,
+    file_name text NOT NULL,
+    file_size bigint NOT NULL,
+    file_mtime timestamptz NOT NULL,
+    content_hash text NOT NULL,
+    -- sha256 of the file contents
+    row_count bigint NOT NULL,
+    load_seconds double precision NOT NULL,
+    loaded_at timestamptz NOT NULL DEFAULT now()
+);
+
+-- load progress: byte ranges of a file committed so far by a
+-- checkpointed load (load_raw.py --resume), cleared once it completes
+DROP TABLE IF EXISTS raw._load_progress;
+
+CREATE TABLE raw._load_progress (
+    table_name text NOT NULL,
+    file_name text NOT NULL,
+    file_size bigint NOT NULL,
+    file_mtime timestamptz NOT NULL,
+    start_offset bigint NOT NULL,
+    -- byte offsets of the uncompressed data
+    end_offset bigint NOT NULL,
+    row_count bigint NOT NULL,
+    committed_at timestamptz NOT NULL DEFAULT now(),
+    PRIMARY KEY (table_name, start_offset)
+);
+
+-- dropped indexes: constraints and indexes a bulk load (load_raw.py
+-- --bulk) has dropped and not yet rebuilt, restored by the next run
+DROP TABLE IF EXISTS raw._dropped_indexes;
+
+CREATE TABLE raw._dropped_indexes (
+    table_name text NOT NULL,
+    name text NOT NULL,
+    is_constraint boolean NOT NULL,
+    definition text NOT NULL,
+    -- constraint definition or CREATE INDEX statement
+    dropped_at timestamptz NOT NULL DEFAULT now(),
+    PRIMARY KEY (table_name, name)
+);
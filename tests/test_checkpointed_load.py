@@ -0,0 +1,292 @@
+"""Tests for checkpointed raw loads, their resume after a crash, and merges."""
+
+import gzip
+import io
+from pathlib import Path
+
+import psycopg2
+import pytest
+from psycopg2 import sql
+
+from ingestion import load_raw
+from ingestion.engine import get_database_connection, table_identifier
+from ingestion.load_raw import (
+    chunk_ranges,
+    committed_ranges,
+    committed_row_count,
+    ensure_manifest_table,
+    ensure_progress_table,
+    file_fingerprint,
+    forget_manifest_entry,
+    forget_progress,
+    line_chunks,
+    load_file,
+    load_tsv_file_checkpointed,
+    open_tsv_stream,
+)
+
+TABLE = "public.test_checkpointed_load"
+
+ROWS = 200
+
+LF_LINES = [b"key\tvalue\n"] + [b"k%04d\tvalue %d\n" % (i, i) for i in range(ROWS)]
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"".join(LF_LINES),
+        b"".join(LF_LINES).rstrip(b"\n"),
+        b"".join(LF_LINES).replace(b"\n", b"\r\n"),
+        b"".join(LF_LINES).replace(b"\n", b"\r\n").rstrip(b"\r\n"),
+        b"key\tvalue\nk0000\t" + b"x" * 500 + b"\nk0001\tshort\n",
+        b"",
+    ],
+    ids=["lf", "lf-unterminated", "crlf", "crlf-unterminated", "long-line", "empty"],
+)
+@pytest.mark.parametrize("chunk_bytes", [1, 7, 64, 1 << 20])
+def test_line_chunks_reassemble_the_stream(data, chunk_bytes):
+    blocks = list(line_chunks(io.BytesIO(data), chunk_bytes))
+
+    assert b"".join(blocks) == data
+    assert all(block for block in blocks)
+    assert all(block.endswith(b"\n") for block in blocks[:-1])
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"".join(LF_LINES).rstrip(b"\n"),
+        b"".join(LF_LINES).replace(b"\n", b"\r\n"),
+        b"".join(LF_LINES).replace(b"\n", b"\r\n").rstrip(b"\r\n"),
+    ],
+    ids=["lf-unterminated", "crlf", "crlf-unterminated"],
+)
+@pytest.mark.parametrize("checkpoints", [1, 3, 16])
+def test_checkpoint_ranges_reassemble_the_file(tmp_path, data, checkpoints):
+    path = tmp_path / "title.ratings.tsv"
+    path.write_bytes(data)
+
+    ranges = chunk_ranges(path, checkpoints)
+
+    parts = []
+    for start, end in ranges:
+        assert start == 0 or data[start - 1 : start] == b"\n"
+        with open_tsv_stream(path, start, end) as reader:
+            parts.append(reader.read())
+    assert b"".join(parts) == data
+
+
+@pytest.fixture
+def cursor():
+    """Autocommit cursor with an empty TABLE, skipped without a database."""
+    try:
+        conn = get_database_connection()
+    except psycopg2.Error:
+        pytest.skip("PostgreSQL is not available")
+    try:
+        with conn.cursor() as cur:
+            cur.execute("CREATE SCHEMA IF NOT EXISTS raw")
+            ensure_progress_table(cur)
+            forget_progress(cur, TABLE)
+            cur.execute(
+                sql.SQL("DROP TABLE IF EXISTS {table}").format(
+                    table=table_identifier(TABLE)
+                )
+            )
+            cur.execute(
+                sql.SQL("CREATE TABLE {table} (key text, value text)").format(
+                    table=table_identifier(TABLE)
+                )
+            )
+            yield cur
+            forget_progress(cur, TABLE)
+            cur.execute(
+                sql.SQL("DROP TABLE {table}").format(table=table_identifier(TABLE))
+            )
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def small_checkpoints(monkeypatch):
+    """Make every checkpoint cover only a few lines."""
+    monkeypatch.setattr(load_raw, "CHECKPOINT_BYTES", 512)
+
+
+@pytest.fixture(params=["tsv", "tsv.gz"])
+def data_file(request, tmp_path) -> Path:
+    data = b"".join(LF_LINES).replace(b"\n", b"\r\n")
+    if request.param == "tsv":
+        path = tmp_path / "title.ratings.tsv"
+        path.write_bytes(data)
+    else:
+        path = tmp_path / "title.ratings.tsv.gz"
+        with gzip.open(path, "wb") as f:
+            f.write(data)
+    return path
+
+
+def crash_at(monkeypatch, failing_call: int):
+    """Make the given call of copy_checkpoint fail, as if the loader died."""
+    copy_checkpoint = load_raw.copy_checkpoint
+    calls = []
+
+    def crashing_copy(cursor, reader, file_path, table_name, fingerprint, start, end):
+        calls.append((start, end))
+        if len(calls) == failing_call:
+            reader.close()
+            raise RuntimeError("simulated crash")
+        return copy_checkpoint(
+            cursor, reader, file_path, table_name, fingerprint, start, end
+        )
+
+    monkeypatch.setattr(load_raw, "copy_checkpoint", crashing_copy)
+    return calls
+
+
+def record_copies(monkeypatch):
+    """Record the ranges copy_checkpoint is called for."""
+    copy_checkpoint = load_raw.copy_checkpoint
+    calls = []
+
+    def recording_copy(cursor, reader, file_path, table_name, fingerprint, start, end):
+        calls.append((start, end))
+        return copy_checkpoint(
+            cursor, reader, file_path, table_name, fingerprint, start, end
+        )
+
+    monkeypatch.setattr(load_raw, "copy_checkpoint", recording_copy)
+    return calls
+
+
+def table_keys(cursor):
+    cursor.execute(
+        sql.SQL("SELECT key FROM {table} ORDER BY key").format(
+            table=table_identifier(TABLE)
+        )
+    )
+    return [key for (key,) in cursor.fetchall()]
+
+
+@pytest.mark.usefixtures("small_checkpoints")
+def test_committed_ranges_after_a_crash(cursor, monkeypatch, data_file):
+    fingerprint = file_fingerprint(data_file)
+    calls = crash_at(monkeypatch, failing_call=3)
+
+    with pytest.raises(RuntimeError, match="simulated crash"):
+        load_tsv_file_checkpointed(cursor, data_file, TABLE, fingerprint, chunks=1)
+
+    # .tsv.gz files stop at the failed range; the ranges of a .tsv file
+    # are independent, so the others still finish
+    failed = calls[2]
+    committed = committed_ranges(cursor, TABLE, fingerprint)
+    assert committed == sorted(bounds for bounds in calls if bounds != failed)
+    assert committed[0][0] == 0 and committed[0][1] == committed[1][0]
+    # Only the committed ranges' rows are in the table
+    assert len(table_keys(cursor)) == committed_row_count(cursor, TABLE) > 0
+
+    # Entries of a different file are not resumable
+    changed = dict(fingerprint, file_size=fingerprint["file_size"] + 1)
+    assert committed_ranges(cursor, TABLE, changed) == []
+
+
+@pytest.mark.usefixtures("small_checkpoints")
+def test_resume_loads_the_rest_exactly_once(cursor, monkeypatch, data_file):
+    fingerprint = file_fingerprint(data_file)
+    crash_at(monkeypatch, failing_call=3)
+    with pytest.raises(RuntimeError):
+        load_tsv_file_checkpointed(cursor, data_file, TABLE, fingerprint, chunks=1)
+    monkeypatch.undo()
+    monkeypatch.setattr(load_raw, "CHECKPOINT_BYTES", 512)
+    committed = committed_ranges(cursor, TABLE, fingerprint)
+
+    calls = record_copies(monkeypatch)
+    row_count = load_tsv_file_checkpointed(
+        cursor, data_file, TABLE, fingerprint, chunks=2
+    )
+
+    # Every range is copied once: the committed ones before the crash,
+    # the rest on resume
+    ranges = sorted(committed + calls)
+    assert len(set(ranges)) == len(ranges)
+    assert ranges[0][0] == 0
+    assert all(end == start for (_, end), (start, _) in zip(ranges, ranges[1:]))
+    assert row_count == ROWS
+    assert table_keys(cursor) == ["k%04d" % i for i in range(ROWS)]
+
+
+@pytest.fixture
+def manifest(cursor, monkeypatch):
+    """Let load_file merge into TABLE, and forget its manifest entry after."""
+    monkeypatch.setitem(load_raw.TABLE_KEYS, TABLE, ("key",))
+    ensure_manifest_table(cursor)
+    yield
+    forget_manifest_entry(cursor, TABLE)
+
+
+def record_merges(monkeypatch):
+    """Record the changes merge_staging_table reports."""
+    merge_staging_table = load_raw.merge_staging_table
+    merges = []
+
+    def recording_merge(cursor, staging, table_name):
+        merges.append(merge_staging_table(cursor, staging, table_name))
+        return merges[-1]
+
+    monkeypatch.setattr(load_raw, "merge_staging_table", recording_merge)
+    return merges
+
+
+def table_rows(cursor):
+    cursor.execute(
+        sql.SQL("SELECT key, value FROM {table} ORDER BY key").format(
+            table=table_identifier(TABLE)
+        )
+    )
+    return cursor.fetchall()
+
+
+def write_rows(path: Path, rows) -> None:
+    path.write_bytes(
+        b"key\tvalue\n"
+        + b"".join(f"{key}\t{value}\n".encode() for key, value in sorted(rows.items()))
+    )
+
+
+@pytest.mark.usefixtures("manifest")
+def test_incremental_load_merges_only_the_changes(cursor, monkeypatch, tmp_path):
+    path = tmp_path / "title.ratings.tsv"
+    rows = {"k%04d" % i: "value %d" % i for i in range(ROWS)}
+    write_rows(path, rows)
+    loaded = load_file(path.name, TABLE, stream=True, data_dir=tmp_path)
+    assert loaded["success"] and loaded["row_count"] == ROWS
+
+    for key in ["k0001", "k0050", "k0199"]:
+        rows[key] = "changed"
+    for key in ["k0002", "k0100"]:
+        del rows[key]
+    for i in range(ROWS, ROWS + 4):
+        rows["k%04d" % i] = "new %d" % i
+    write_rows(path, rows)
+    merges = record_merges(monkeypatch)
+
+    result = load_file(
+        path.name, TABLE, stream=True, incremental=True, data_dir=tmp_path
+    )
+
+    assert merges == [{"deleted": 2, "updated": 3, "inserted": 4}]
+    assert result["success"] and result["changed"] == 9
+    assert result["row_count"] == len(rows) == ROWS + 2
+    assert table_rows(cursor) == sorted(rows.items())
+    # The staging table is dropped after the merge
+    cursor.execute("SELECT to_regclass('public._stage_test_checkpointed_load')")
+    assert cursor.fetchone()[0] is None
+
+    # Merging the same file again changes nothing
+    merges.clear()
+    load_file(
+        path.name, TABLE, stream=True, incremental=True, force=True, data_dir=tmp_path
+    )
+    assert merges == [{"deleted": 0, "updated": 0, "inserted": 0}]
+    assert table_rows(cursor) == sorted(rows.items())
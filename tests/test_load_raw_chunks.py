@@ -0,0 +1,116 @@
+"""Tests for splitting raw files into parallel COPY ranges."""
+
+from pathlib import Path
+
+import pytest
+
+from ingestion.load_raw import (
+    check_row_count,
+    chunk_ranges,
+    data_line_count,
+    open_tsv_stream,
+)
+
+HEADER = b"tconst\tprimaryTitle\n"
+
+
+def write_file(tmp_path: Path, data: bytes) -> Path:
+    path = tmp_path / "title.basics.tsv"
+    path.write_bytes(data)
+    return path
+
+
+def read_ranges(path: Path, ranges):
+    """Stream each range as the loader does; return its bytes and line count."""
+    for start, end in ranges:
+        with open_tsv_stream(path, start, end) as reader:
+            yield reader.read(), reader.line_count
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        HEADER + b"".join(b"tt%07d\tTitle %d\n" % (i, i) for i in range(1000)),
+        HEADER + b"tt0000001\tFirst\ntt0000002\tNo newline at the end",
+        HEADER + b"tt0000001\t" + b"x" * 100_000 + b"\n",
+        HEADER + b"tt0000001\tOnly\ntt0000002\tTwo\n",
+        b"",
+    ],
+    ids=["many-lines", "no-trailing-newline", "one-huge-line", "few-lines", "empty"],
+)
+@pytest.mark.parametrize("chunks", [1, 2, 7, 64])
+def test_ranges_reassemble_the_file(tmp_path, data, chunks):
+    path = write_file(tmp_path, data)
+
+    ranges = chunk_ranges(path, chunks)
+
+    assert 1 <= len(ranges) <= chunks
+    assert ranges[0][0] == 0
+    assert ranges[-1][1] == len(data)
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start
+    for start, _ in ranges[1:]:
+        assert data[start - 1 : start] == b"\n"
+
+    parts = list(read_ranges(path, ranges))
+    assert b"".join(part for part, _ in parts) == data
+    lines = data.count(b"\n") + (not data.endswith(b"\n") and bool(data))
+    assert sum(count for _, count in parts) == lines
+
+
+def test_one_huge_line_is_a_single_range(tmp_path):
+    data = b"tt0000001\t" + b"x" * 100_000 + b"\n"
+    path = write_file(tmp_path, data)
+
+    assert chunk_ranges(path, 8) == [(0, len(data))]
+
+
+def test_more_chunks_than_lines_gives_one_range_per_line(tmp_path):
+    data = b"a\nb\nc\n"
+    path = write_file(tmp_path, data)
+
+    assert chunk_ranges(path, 10) == [(0, 2), (2, 4), (4, 6)]
+
+
+def test_empty_file_is_one_empty_range(tmp_path):
+    path = write_file(tmp_path, b"")
+
+    ranges = chunk_ranges(path, 4)
+
+    assert ranges == [(0, 0)]
+    assert list(read_ranges(path, ranges)) == [(b"", 0)]
+
+
+def test_unterminated_last_line_is_counted(tmp_path):
+    data = b"a\nb\nc"
+    path = write_file(tmp_path, data)
+
+    ranges = chunk_ranges(path, 2)
+
+    assert ranges[-1][1] == len(data)
+    assert [count for _, count in read_ranges(path, ranges)] == [2, 1]
+
+
+def test_check_row_count_accepts_matching_counts(tmp_path):
+    check_row_count(tmp_path / "title.basics.tsv", 3, 3)
+
+
+@pytest.mark.parametrize("row_count", [0, 2, 4])
+def test_check_row_count_rejects_a_mismatch(tmp_path, row_count):
+    with pytest.raises(ValueError, match="title.basics.tsv: loaded"):
+        check_row_count(tmp_path / "title.basics.tsv", row_count, 3)
+
+
+@pytest.mark.parametrize(
+    "data, data_lines",
+    [(b"", 0), (HEADER, 0), (HEADER + b"tt0000001\tOnly\n", 1)],
+    ids=["empty", "header-only", "one-row"],
+)
+def test_check_row_count_of_a_streamed_file(tmp_path, data, data_lines):
+    path = write_file(tmp_path, data)
+    with open_tsv_stream(path) as reader:
+        reader.read()
+
+    # An empty file has no header either, so it expects no rows, not -1
+    assert data_line_count(reader.line_count) == data_lines
+    check_row_count(path, data_lines, data_line_count(reader.line_count))
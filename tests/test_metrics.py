@@ -0,0 +1,63 @@
+"""Tests for the run report totals."""
+
+from datetime import datetime, timedelta, timezone
+
+from ingestion.metrics import metric, stage_totals, wall_seconds
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def stage(name: str, start: float, seconds: float, status: str = "success"):
+    """A stage record that started ``start`` seconds into the run."""
+    record = metric("stage", name, name, seconds, status=status)
+    end = START + timedelta(seconds=start + seconds)
+    record["recorded_at"] = end.isoformat()
+    return record
+
+
+def test_wall_time_counts_concurrent_stages_once():
+    records = [
+        stage("load", 0, 10),
+        stage("parse", 0, 4),
+        stage("transform", 10, 5),
+        stage("export", 15, 3),
+        stage("test", 15, 6),
+    ]
+
+    assert wall_seconds(records) == 21
+
+
+def test_wall_time_skips_gaps_between_invocations():
+    records = [
+        stage("load", 0, 10, status="failed"),
+        stage("load", 3600, 12),
+    ]
+
+    assert wall_seconds(records) == 22
+
+
+def test_run_records_give_the_wall_time():
+    records = [
+        metric("run", "pipeline", "run", 11.5, status="failed"),
+        stage("load", 0, 10, status="failed"),
+        metric("run", "pipeline", "run", 13.0),
+        stage("load", 3600, 12),
+    ]
+
+    assert wall_seconds(records) == 24.5
+
+
+def test_repeated_stage_records_are_combined():
+    records = [
+        stage("schema", 0, 1),
+        stage("load", 1, 10, status="failed"),
+        stage("transform", 11, 0, status="skipped"),
+        stage("load", 3600, 12),
+        stage("transform", 3612, 5),
+    ]
+
+    assert stage_totals(records) == {
+        "schema": {"seconds": 1, "attempts": 1, "status": "success"},
+        "load": {"seconds": 22, "attempts": 2, "status": "success"},
+        "transform": {"seconds": 5, "attempts": 2, "status": "success"},
+    }
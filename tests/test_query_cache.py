@@ -0,0 +1,125 @@
+"""Tests for the on-disk query result cache."""
+
+import os
+
+import pandas as pd
+import pytest
+
+from analytics.query_cache import (
+    MANIFEST_VERSION_SQL,
+    TABLE_VERSIONS_SQL,
+    VERSION_FILE,
+    QueryCache,
+    warehouse_version,
+)
+
+QUERY = "SELECT decade, title_count FROM marts.agg_titles_by_decade"
+
+
+class CatalogCursor:
+    """Answer warehouse_version's catalog queries from fixed rows."""
+
+    def __init__(self, tables, manifest=None):
+        self.tables = tables
+        self.manifest = manifest
+        self._rows = []
+
+    def execute(self, query, params=None):
+        if query == TABLE_VERSIONS_SQL:
+            self._rows = list(self.tables)
+        elif query == MANIFEST_VERSION_SQL:
+            self._rows = [self.manifest]
+        else:
+            # to_regclass('raw._load_manifest') IS NOT NULL
+            self._rows = [(self.manifest is not None,)]
+
+    def fetchall(self):
+        return self._rows
+
+    def fetchone(self):
+        return self._rows[0]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = QueryCache(tmp_path / "cache")
+    cache.validate("v1")
+    return cache
+
+
+def frame(value: int = 0) -> pd.DataFrame:
+    return pd.DataFrame({"decade": [1990, 2000], "title_count": [value, value + 1]})
+
+
+def test_miss_then_hit(cache):
+    assert cache.get(QUERY) is None
+
+    cache.put(QUERY, frame(7))
+
+    pd.testing.assert_frame_equal(cache.get(QUERY), frame(7))
+    # Formatting differences map to the same entry
+    reformatted = "  " + QUERY.replace(" ", "\n    ") + " ;"
+    pd.testing.assert_frame_equal(cache.get(reformatted), frame(7))
+    assert cache.get(QUERY + " WHERE decade = 1990") is None
+
+
+def test_same_version_keeps_entries(cache):
+    cache.put(QUERY, frame())
+
+    cache.validate("v1")
+
+    assert cache.get(QUERY) is not None
+
+
+def test_new_version_drops_entries(cache):
+    cache.put(QUERY, frame())
+
+    cache.validate("v2")
+
+    assert cache.get(QUERY) is None
+    assert list(cache.directory.glob("*.parquet")) == []
+    assert (cache.directory / VERSION_FILE).read_text() == "v2"
+
+
+def test_version_follows_the_warehouse():
+    tables = [("dim_titles", 16384, 100), ("fct_ratings", 16390, 50)]
+    manifest = (5, "2026-10-01 00:00:00+00")
+    version = warehouse_version(CatalogCursor(tables, manifest), "marts")
+
+    assert warehouse_version(CatalogCursor(tables, manifest), "marts") == version
+    # A rebuilt table, rows written in place, or a new load all change it
+    rebuilt = [("dim_titles", 16500, 100), tables[1]]
+    written = [tables[0], ("fct_ratings", 16390, 51)]
+    loaded = (5, "2026-10-02 00:00:00+00")
+    others = [
+        warehouse_version(CatalogCursor(rebuilt, manifest), "marts"),
+        warehouse_version(CatalogCursor(written, manifest), "marts"),
+        warehouse_version(CatalogCursor(tables, loaded), "marts"),
+        warehouse_version(CatalogCursor(tables), "marts"),
+    ]
+    assert len({version, *others}) == 5
+
+
+def test_evicts_least_recently_used_past_the_byte_budget(cache):
+    queries = [f"{QUERY} -- {name}" for name in "abcd"]
+    for query in queries[:3]:
+        cache.put(query, frame())
+    paths = {query: cache._path(query) for query in queries}
+    entry_bytes = paths[queries[0]].stat().st_size
+    for age, query in enumerate(queries[:3]):
+        os.utime(paths[query], (1000 + age, 1000 + age))
+
+    # Reading "a" makes "b" the least recently used entry
+    assert cache.get(queries[0]) is not None
+    cache.max_bytes = 3 * entry_bytes
+    cache.put(queries[3], frame())
+
+    assert [cache.get(query) is not None for query in queries] == [
+        True,
+        False,
+        True,
+        True,
+    ]
+    assert sum(path.stat().st_size for path in cache.directory.glob("*.parquet")) <= (
+        cache.max_bytes
+    )
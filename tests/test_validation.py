@@ -0,0 +1,202 @@
+"""Tests for the vectorized TSV validation and the quarantine."""
+
+import io
+import random
+
+import numpy as np
+import pytest
+
+from ingestion.validation import (
+    COLUMN_RULES,
+    KIND_PATTERNS,
+    QuarantineWriter,
+    ValidatingReader,
+    invalid_line_mask,
+)
+
+# Field values around the edges of every kind's rule
+SAMPLE_FIELDS = [
+    b"",
+    b"\\N",
+    b"\\",
+    b"N",
+    b"0",
+    b"1",
+    b"2",
+    b"10",
+    b"123",
+    b"2024",
+    b"12345",
+    b"123456789",
+    b"1234567890",
+    b"1.",
+    b".5",
+    b"7.5",
+    b"10.0",
+    b"100.0",
+    b"7.55",
+    b"7,5",
+    b"-1",
+    b" 1",
+    b"tt",
+    b"tt1",
+    b"tt0000001",
+    b"tt1234567890",
+    b"tt12345678901",
+    b"tx0000001",
+    b"nm0000001",
+    b"nm",
+    b"TT0000001",
+    b"Some title",
+]
+
+# A valid value of every kind, so most generated lines pass
+VALID_FIELDS = {
+    "tconst": b"tt0000001",
+    "nconst": b"nm0000001",
+    "flag": b"0",
+    "year": b"1994",
+    "ordering": b"1",
+    "integer": b"120",
+    "rating": b"7.5",
+    "text": b"Some title",
+}
+
+
+def regex_invalid(line: bytes, rules) -> bool:
+    """Reference check of one line with the per-kind regular expressions."""
+    fields = line.split(b"\t")
+    if len(fields) != len(rules):
+        return True
+    return not all(
+        KIND_PATTERNS[kind].fullmatch(field) for field, kind in zip(fields, rules)
+    )
+
+
+def random_line(rng: random.Random, rules) -> bytes:
+    kinds = list(rules)
+    shape = rng.random()
+    if shape < 0.05:
+        kinds.append("text")
+    elif shape < 0.1:
+        kinds.pop()
+    return b"\t".join(
+        VALID_FIELDS[kind] if rng.random() < 0.9 else rng.choice(SAMPLE_FIELDS)
+        for kind in kinds
+    )
+
+
+@pytest.mark.parametrize("file_name", sorted(COLUMN_RULES))
+def test_mask_matches_regexes(file_name):
+    rules = COLUMN_RULES[file_name]
+    rng = random.Random(file_name)
+    lines = [random_line(rng, rules) for _ in range(5000)]
+
+    mask = invalid_line_mask(b"\n".join(lines) + b"\n", rules)
+
+    expected = np.array([regex_invalid(line, rules) for line in lines])
+    mismatches = [lines[i] for i in np.flatnonzero(mask != expected)]
+    assert mismatches == []
+    assert expected.any() and not expected.all()
+
+
+def test_mask_checks_each_field_kind():
+    rules = ("tconst", "flag", "year", "rating", "integer", "text")
+    lines = [
+        b"tt0000001\t0\t1994\t8.7\t1000\tAny text",
+        b"tt0000001\t\\N\t\\N\t\\N\t\\N\t\\N",
+        b"nm0000001\t0\t1994\t8.7\t1000\tWrong ID prefix",
+        b"tt0000001\t2\t1994\t8.7\t1000\tBad flag",
+        b"tt0000001\t0\t19945\t8.7\t1000\tYear too long",
+        b"tt0000001\t0\t1994\t8.75\t1000\tToo many decimals",
+        b"tt0000001\t0\t1994\t8.7\t1e3\tNot an integer",
+        b"tt0000001\t0\t1994\t8.7\t1000",
+    ]
+
+    mask = invalid_line_mask(b"\n".join(lines) + b"\n", rules)
+
+    assert mask.tolist() == [False, False, True, True, True, True, True, True]
+
+
+class PieceReader:
+    """Return at most ``piece`` bytes per read, like a slow stream."""
+
+    def __init__(self, data: bytes, piece: int):
+        self._data = io.BytesIO(data)
+        self._piece = piece
+
+    def read(self, size: int = -1) -> bytes:
+        return self._data.read(self._piece)
+
+    def close(self) -> None:
+        pass
+
+
+def read_quarantine(path):
+    lines = path.read_bytes().splitlines()
+    assert lines[0] == b"line\tbyte_offset\treason\trow"
+    return [line.split(b"\t", 3) for line in lines[1:]]
+
+
+RATINGS = (
+    b"tconst\taverageRating\tnumVotes\n"
+    b"tt0000001\t5.7\t1976\n"
+    b"tt0000002\tbad\t267\n"
+    b"tt0000003\t7.5\t1000\n"
+    b"tt0000004\t6.1\n"
+    b"tt0000005\t6.1\t12\n"
+    b"tt0000006\t6.1\t12x"
+)
+
+
+@pytest.mark.parametrize("piece", [1, 3, 7, 16, 1 << 20])
+def test_quarantine_positions_across_blocks(tmp_path, piece):
+    quarantine = QuarantineWriter(tmp_path / "title.ratings.tsv.rejects.tsv")
+    reader = ValidatingReader(
+        PieceReader(RATINGS, piece),
+        COLUMN_RULES["title.ratings.tsv"],
+        quarantine,
+        header=True,
+    )
+
+    output = b"".join(iter(lambda: reader.read(piece), b""))
+    quarantine.close()
+
+    assert output == (
+        b"tconst\taverageRating\tnumVotes\n"
+        b"tt0000001\t5.7\t1976\n"
+        b"tt0000003\t7.5\t1000\n"
+        b"tt0000005\t6.1\t12\n"
+    )
+    assert reader.rejected == quarantine.count == 3
+    records = read_quarantine(quarantine.path)
+    assert [(number, row) for number, _, _, row in records] == [
+        (b"3", b"tt0000002\tbad\t267"),
+        (b"5", b"tt0000004\t6.1"),
+        (b"7", b"tt0000006\t6.1\t12x"),
+    ]
+    for _, offset, _, row in records:
+        assert RATINGS[int(offset) :].startswith(row)
+
+
+def test_quarantine_offsets_of_a_chunk(tmp_path):
+    # A later chunk of a split file: no header, no line numbers, and
+    # offsets relative to the start of the whole file
+    chunk = b"tt0000001\t5.7\t1976\ntt0000002\t5.7\tx\n"
+    quarantine = QuarantineWriter(tmp_path / "title.ratings.tsv.rejects.tsv")
+    reader = ValidatingReader(
+        PieceReader(chunk, 5),
+        COLUMN_RULES["title.ratings.tsv"],
+        quarantine,
+        header=False,
+        start_offset=1000,
+        first_line=None,
+    )
+
+    output = b"".join(iter(lambda: reader.read(5), b""))
+    quarantine.close()
+
+    assert output == b"tt0000001\t5.7\t1976\n"
+    assert [record[:2] for record in read_quarantine(quarantine.path)] == [
+        [b"", b"1019"]
+    ]